@@ -0,0 +1,116 @@
+"""Latency benchmark of the click classification of AbstractButton. Mouse
+event sequences for a click, a double click and a press-hold are replayed
+through QTest on an offscreen button. For each sequence, it reports the
+time spent handling each synthetic event and the delay from the last event
+to the classified signal. Run with the src folder on the python path:
+
+  QT_QPA_PLATFORM=offscreen python benchmarks/clickbench.py --rounds 20"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import NoReturn, Callable
+
+from PySide6.QtCore import Qt, QPoint, QEventLoop, QTimer
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication
+
+
+def _wait(ms: int) -> NoReturn:
+  """Runs the event loop for the given time"""
+  loop = QEventLoop()
+  QTimer.singleShot(ms, loop.quit)
+  loop.exec()
+
+
+def replay(button: object, signal: object, events: Callable,
+           rounds: int, settle: int,
+           finish: Callable = None) -> tuple[list, list]:
+  """Replays the events the given number of times and returns the times
+  spent handling the events and the delays to the signal. The finishing
+  events, if given, are sent after the signal."""
+  received = []
+  signal.connect(lambda: received.append(time.perf_counter()))
+  handling, delays = [], []
+  for _ in range(rounds):
+    del received[:]
+    start = time.perf_counter()
+    count = events(button)
+    last = time.perf_counter()
+    handling.append((last - start) / count)
+    loop = QEventLoop()
+    QTimer.singleShot(settle, loop.quit)
+    signal.connect(loop.quit)
+    loop.exec()
+    signal.disconnect(loop.quit)
+    if received:
+      delays.append(max(received[0] - last, 0.))
+    if finish is not None:
+      finish(button)
+    _wait(settle)
+  return handling, delays
+
+
+def main() -> None:
+  """Runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--rounds', type=int, default=20)
+  args = parser.parse_args()
+  app = QApplication([])
+  import workside.styles
+  from workside.settings import Settings
+  from workside.widgets import AbstractButton
+
+  class BenchButton(AbstractButton):
+    """Concrete button painting nothing"""
+
+    def paintEvent(self, event: object) -> NoReturn:
+      """Paints nothing"""
+
+  button = BenchButton()
+  button.resize(64, 64)
+  button.show()
+  left, center = Qt.MouseButton.LeftButton, QPoint(32, 32)
+  noMod = Qt.KeyboardModifier.NoModifier
+
+  def click(widget: object) -> int:
+    """Press and release"""
+    QTest.mousePress(widget, left, noMod, center)
+    QTest.mouseRelease(widget, left, noMod, center)
+    return 2
+
+  def doubleClick(widget: object) -> int:
+    """Click followed by a double click"""
+    QTest.mousePress(widget, left, noMod, center)
+    QTest.mouseRelease(widget, left, noMod, center)
+    QTest.mouseDClick(widget, left, noMod, center)
+    return 3
+
+  def pressHold(widget: object) -> int:
+    """Press only"""
+    QTest.mousePress(widget, left, noMod, center)
+    return 1
+
+  def release(widget: object) -> NoReturn:
+    """Release after the press-hold"""
+    QTest.mouseRelease(widget, left, noMod, center)
+
+  settle = Settings.pressHoldTime + Settings.singleClickLockoutTime
+  scenarios = [('click', button.leftClick, click, None),
+               ('double', button.leftDoubleClick, doubleClick, None),
+               ('hold', button.leftPressHold, pressHold, release)]
+  for (name, signal, events, finish) in scenarios:
+    handling, delays = replay(button, signal, events, args.rounds, settle,
+                              finish)
+    median = statistics.median(delays) * 1000 if delays else float('nan')
+    print('%-7s %8.1f us/event  signal after %7.1f ms  (%d/%d)' % (
+      name, statistics.median(handling) * 1e6, median, len(delays),
+      args.rounds))
+  app.quit()
+
+
+if __name__ == '__main__':
+  main()
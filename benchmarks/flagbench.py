@@ -0,0 +1,66 @@
+"""Benchmark of the flags of AbstractButton. It measures the construction
+of buttons together with the update requests made while constructed,
+the time taken to set and read a flag and the time of testing a mask of
+flags. Run with the src folder on the python path:
+
+  python benchmarks/flagbench.py --buttons 2000"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import time
+from typing import NoReturn
+
+from PySide6.QtWidgets import QApplication
+
+
+def main() -> None:
+  """Runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--buttons', type=int, default=2000)
+  parser.add_argument('--calls', type=int, default=200000)
+  args = parser.parse_args()
+  app = QApplication([])
+  import workside.styles
+  from workside.widgets import AbstractButton
+
+  class BenchButton(AbstractButton):
+    """Concrete button counting the update requests it receives"""
+
+    updates = 0
+
+    def update(self, *args) -> NoReturn:
+      """Counts update requests"""
+      BenchButton.updates += 1
+      AbstractButton.update(self, *args)
+
+    def paintEvent(self, event: object) -> NoReturn:
+      """Paints nothing"""
+
+  start = time.perf_counter()
+  buttons = [BenchButton() for _ in range(args.buttons)]
+  elapsed = time.perf_counter() - start
+  print('construction %8.1f us/button  %5.1f updates/button' % (
+    elapsed / args.buttons * 1e6, BenchButton.updates / args.buttons))
+  button = buttons[0]
+  start = time.perf_counter()
+  for i in range(args.calls):
+    button.hover = i & 1
+    button.hover
+  elapsed = time.perf_counter() - start
+  print('set and get  %8.3f us/call' % (elapsed / args.calls * 1e6))
+  hasAnyFlags = getattr(button, 'hasAnyFlags', None)
+  if hasAnyFlags is not None:
+    mask = AbstractButton.flagMasks['hover'] | AbstractButton.flagMasks[
+      'moving']
+    start = time.perf_counter()
+    for _ in range(args.calls):
+      hasAnyFlags(mask)
+    elapsed = time.perf_counter() - start
+    print('any of mask  %8.3f us/call' % (elapsed / args.calls * 1e6))
+  app.quit()
+
+
+if __name__ == '__main__':
+  main()
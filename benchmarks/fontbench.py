@@ -0,0 +1,55 @@
+"""Microbenchmark of measuring label text, comparing a new QFontMetrics per
+call as the Label did before against the memoized measurements of the
+shared FontCache. The texts are drawn from a small vocabulary such that
+most measurements repeat, as they do when a label is repainted. Run with
+the src folder on the python path:
+
+  python benchmarks/fontbench.py --calls 100000"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from PySide6.QtGui import QGuiApplication, QFontMetrics
+
+
+def benchMeasure(texts: list[str], cached: bool) -> None:
+  """Measures every text"""
+  from workside.styles import labelStyle, fontCache
+  fontCache.clear()
+  fontCache.resetStats()
+  start = time.perf_counter()
+  if cached:
+    for text in texts:
+      labelStyle.getBoundingRect(text)
+  else:
+    for text in texts:
+      QFontMetrics(labelStyle.getFont()).boundingRect(text)
+  elapsed = time.perf_counter() - start
+  stats = fontCache.getStats()
+  print('%-8s %8.2f us/call  text hits %8d  misses %6d' % (
+    'cached' if cached else 'rebuild', elapsed / len(texts) * 1e6,
+    stats['textHits'], stats['textMisses']))
+
+
+def main() -> None:
+  """Runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--calls', type=int, default=100000)
+  parser.add_argument('--vocabulary', type=int, default=500)
+  args = parser.parse_args()
+  app = QGuiApplication([])
+  import workside.styles
+  words = ['%s %d' % (random.choice(['Left', 'Right', 'Move']), i)
+           for i in range(args.vocabulary)]
+  texts = [random.choice(words) for _ in range(args.calls)]
+  for cached in (False, True):
+    benchMeasure(texts, cached)
+  app.quit()
+
+
+if __name__ == '__main__':
+  main()
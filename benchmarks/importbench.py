@@ -0,0 +1,103 @@
+"""Benchmark of the startup of MineWindow. Each round runs a fresh
+interpreter with 'python -X importtime' importing the window module and
+reports the total import time along with the slowest modules. A second
+fresh interpreter measures the time from the start of the script until
+the first paint of the window. The medians are printed, or written as
+JSON with --json for tracking in CI. Run with the src folder on the
+python path:
+
+  QT_QPA_PLATFORM=offscreen python benchmarks/importbench.py --rounds 5"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_firstWindow = """
+import time
+start = time.perf_counter()
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+from minelive.minewindow import MineWindow
+imported = time.perf_counter()
+window = MineWindow()
+window.show()
+app.processEvents()
+window.repaint()
+print(imported - start, time.perf_counter() - start)
+window.close()
+"""
+
+
+def _run(args: list[str]) -> subprocess.CompletedProcess:
+  """Runs the interpreter with the given arguments"""
+  env = dict(os.environ)
+  env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+  env.pop('MINELIVE_SERVER_DIR', None)
+  return subprocess.run([sys.executable, *args], capture_output=True,
+                        text=True, check=True, env=env)
+
+
+def importTimes(module: str) -> dict[str, float]:
+  """Returns the cumulative import time in milliseconds of each module
+  imported by a fresh interpreter importing the given module"""
+  output = _run(['-X', 'importtime', '-c', 'import %s' % module])
+  times = {}
+  for line in output.stderr.splitlines():
+    if not line.startswith('import time:') or 'cumulative' in line:
+      continue
+    _, cumulative, name = line[len('import time:'):].split('|')
+    times[name.strip()] = int(cumulative) / 1000
+  return times
+
+
+def main() -> None:
+  """Runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--rounds', type=int, default=5)
+  parser.add_argument('--module', default='minelive.minewindow')
+  parser.add_argument('--top', type=int, default=10)
+  parser.add_argument('--json', action='store_true')
+  args = parser.parse_args()
+  totals, modules, imports, windows = [], {}, [], []
+  for _ in range(args.rounds):
+    times = importTimes(args.module)
+    totals.append(times[args.module])
+    for (name, value) in times.items():
+      modules.setdefault(name, []).append(value)
+    imported, shown = map(float, _run(['-c', _firstWindow]).stdout.split())
+    imports.append(imported * 1000)
+    windows.append(shown * 1000)
+  medians = {name: statistics.median(values)
+             for (name, values) in modules.items()}
+  slowest = sorted((name for name in medians if name.startswith((
+    'workside', 'minelive', 'moreworktoy'))), key=medians.get,
+                   reverse=True)[:args.top]
+  result = dict(
+    module=args.module,
+    importTime=statistics.median(totals),
+    importWall=statistics.median(imports),
+    firstWindow=statistics.median(windows),
+    qtMultimedia='PySide6.QtMultimedia' in medians,
+    icecream='icecream' in medians,
+    slowest={name: medians[name] for name in slowest},
+  )
+  if args.json:
+    return print(json.dumps(result, indent=2))
+  print('import %s  %8.1f ms (importtime)  %8.1f ms (wall)' % (
+    args.module, result['importTime'], result['importWall']))
+  print('first window           %8.1f ms' % result['firstWindow'])
+  print('QtMultimedia loaded: %s  icecream loaded: %s' % (
+    result['qtMultimedia'], result['icecream']))
+  for name in slowest:
+    print('  %-40s %8.1f ms' % (name, medians[name]))
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,76 @@
+"""Benchmark of the LogIndex measuring the indexing rate and the latency of
+queries confined to the rows held by a LogModel of default capacity. Run
+with the src folder on the python path:
+
+  python benchmarks/indexbench.py --lines 10000000"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import time
+
+from workside.logstore import LogIndex, parseQuery
+from workside.settings import Settings
+
+from parserbench import syntheticLines
+
+_frame = 16.
+
+_queries = [
+  'Steve',
+  'joined the game',
+  'lost connection',
+  'saving chunks overworld',
+  'Ste',
+  'preparing spawn 8',
+]
+
+
+def benchIndexing(lines: list[str], total: int,
+                  batchSize: int) -> LogIndex:
+  """Indexes the lines repeatedly until the total is reached"""
+  index = LogIndex()
+  start = time.perf_counter()
+  while len(index) < total:
+    for i in range(0, len(lines), batchSize):
+      index.extend(lines[i:i + batchSize])
+      if len(index) >= total:
+        break
+  elapsed = time.perf_counter() - start
+  print('indexed %d lines, %d words: %10.0f lines/s' % (
+    len(index), index.getVocabularySize(), len(index) / elapsed))
+  return index
+
+
+def benchQueries(index: LogIndex, window: int, rounds: int) -> None:
+  """Runs each query confined to the newest lines of the window"""
+  since = max(len(index) - window, 0)
+  for query in _queries:
+    words, prefix = parseQuery(query)
+    best = None
+    for _ in range(rounds):
+      start = time.perf_counter()
+      found = index.search(words, prefix, since)
+      elapsed = (time.perf_counter() - start) * 1000
+      best = elapsed if best is None else min(best, elapsed)
+    print('%-26s %8d hits %8.2f ms  %s' % (
+      repr(query), len(found), best,
+      'ok' if best < _frame else 'above one frame'))
+
+
+def main() -> None:
+  """Runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--lines', type=int, default=10000000)
+  parser.add_argument('--window', type=int, default=Settings.logCapacity)
+  parser.add_argument('--batch', type=int, default=1000)
+  parser.add_argument('--rounds', type=int, default=5)
+  args = parser.parse_args()
+  lines = syntheticLines(min(args.lines, 1000000))
+  index = benchIndexing(lines, args.lines, args.batch)
+  benchQueries(index, args.window, args.rounds)
+
+
+if __name__ == '__main__':
+  main()
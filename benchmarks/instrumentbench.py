@@ -0,0 +1,71 @@
+"""Benchmark of the overhead of the Instrumentation of CoreWidget. A label
+is repainted and a button receives mouse moves with the instrumentation
+disabled and enabled, and the time per event is reported for each. The
+report of the instrumentation is printed at the end. Run with the src
+folder on the python path:
+
+  QT_QPA_PLATFORM=offscreen python benchmarks/instrumentbench.py
+
+Setting WORKSIDE_INSTRUMENT=1 instead instruments any benchmark from the
+start and writes the report to stderr at exit."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import time
+from typing import NoReturn
+
+from PySide6.QtCore import Qt, QPointF, QEvent
+from PySide6.QtGui import QMouseEvent
+from PySide6.QtWidgets import QApplication
+
+
+def main() -> None:
+  """Runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--events', type=int, default=5000)
+  args = parser.parse_args()
+  app = QApplication([])
+  import workside.styles
+  from workside.widgets import Label, AbstractButton, Instrumentation
+
+  class BenchButton(AbstractButton):
+    """Concrete button painting nothing"""
+
+    def paintEvent(self, event: object) -> NoReturn:
+      """Paints nothing"""
+
+  label = Label()
+  label.setText('Instrumented label')
+  label.resize(240, 40)
+  label.show()
+  button = BenchButton()
+  button.resize(64, 64)
+  button.show()
+  app.processEvents()
+  move = QMouseEvent(QEvent.Type.MouseMove, QPointF(32, 32),
+                     QPointF(32, 32), Qt.MouseButton.NoButton,
+                     Qt.MouseButton.NoButton, Qt.KeyboardModifier.NoModifier)
+  instrumentation = Instrumentation.instance()
+  for enabled in (False, True, False):
+    if enabled:
+      instrumentation.enable()
+    else:
+      instrumentation.disable()
+    start = time.perf_counter()
+    for _ in range(args.events):
+      label.repaint()
+    paint = (time.perf_counter() - start) / args.events
+    start = time.perf_counter()
+    for _ in range(args.events):
+      app.sendEvent(button, move)
+    mouse = (time.perf_counter() - start) / args.events
+    print('%-8s paint %8.2f us/event  mouse %8.2f us/event' % (
+      'enabled' if enabled else 'disabled', paint * 1e6, mouse * 1e6))
+  print(instrumentation.formatReport())
+  app.quit()
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,65 @@
+"""Benchmark of repainting many Labels into an offscreen image. The labels
+are repainted with their static text kept between frames, and again with
+the static text laid out anew on every paint as the text was measured on
+every paint before. Text measurements made through the FontCache during
+the frames are counted. Run with the src folder on the python path:
+
+  python benchmarks/labelbench.py --labels 500 --frames 20"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import time
+
+from PySide6.QtCore import QPoint
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QApplication
+
+
+def benchRepaint(labels: list, frames: int, relayout: bool) -> None:
+  """Renders every label the given number of times"""
+  from workside.styles import fontCache
+  image = QImage(256, 64, QImage.Format.Format_ARGB32_Premultiplied)
+  painter = QPainter(image)
+  for label in labels:
+    label.render(painter, QPoint())
+  fontCache.resetStats()
+  start = time.perf_counter()
+  for _ in range(frames):
+    for label in labels:
+      if relayout:
+        label._layoutKey = None
+      label.render(painter, QPoint())
+  elapsed = time.perf_counter() - start
+  painter.end()
+  stats = fontCache.getStats()
+  measured = stats['textHits'] + stats['textMisses']
+  print('%-8s %8.2f ms/frame  %8.1f us/label  %6d measurements' % (
+    'relayout' if relayout else 'static', elapsed / frames * 1000,
+    elapsed / frames / len(labels) * 1e6, measured))
+
+
+def main() -> None:
+  """Runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--labels', type=int, default=500)
+  parser.add_argument('--frames', type=int, default=20)
+  args = parser.parse_args()
+  app = QApplication([])
+  from workside.styles import labelStyle
+  from workside.widgets import Label
+  labels = []
+  for i in range(args.labels):
+    label = Label()
+    labelStyle @ label
+    label.setText('Label number %d of the benchmark' % i)
+    label.resize(label.minimumSize())
+    labels.append(label)
+  for relayout in (True, False):
+    benchRepaint(labels, args.frames, relayout)
+  app.quit()
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,201 @@
+"""Benchmark of refreshing the players of a world from its playerdata
+files. Synthetic gzip compressed playerdata files resembling those of the
+game are written to a temporary folder. Each refresh reads the position,
+health, dimension and inventory size of every player. The refresh is
+timed with a naive recursive parser decoding every tag, with the lazy
+reader of the nbt package and with the NbtFileCache while no file has
+changed. Run with the src folder on the python path:
+
+  python benchmarks/nbtbench.py --players 500 --rounds 5"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import gzip
+import io
+import os
+import random
+import statistics
+import struct
+import tempfile
+import time
+import uuid
+
+from minelive.nbt import NbtFileCache, loadNbt
+
+END, BYTE, SHORT, INT, LONG, FLOAT, DOUBLE = range(7)
+BYTE_ARRAY, STRING, LIST, COMPOUND, INT_ARRAY, LONG_ARRAY = range(7, 13)
+_formats = {BYTE: '>b', SHORT: '>h', INT: '>i', LONG: '>q', FLOAT: '>f',
+            DOUBLE: '>d'}
+
+
+def encodePayload(tagType: int, value: object) -> bytes:
+  """Encodes the payload of the tag. Compounds are dictionaries of names
+  to pairs of tag type and value, and lists are pairs of the item type
+  and the values."""
+  if tagType in _formats:
+    return struct.pack(_formats[tagType], value)
+  if tagType == STRING:
+    data = value.encode('utf-8')
+    return struct.pack('>H', len(data)) + data
+  if tagType in (BYTE_ARRAY, INT_ARRAY, LONG_ARRAY):
+    code = {BYTE_ARRAY: 'b', INT_ARRAY: 'i', LONG_ARRAY: 'q'}[tagType]
+    return struct.pack('>i%d%s' % (len(value), code), len(value), *value)
+  if tagType == LIST:
+    itemType, items = value
+    return struct.pack('>bi', itemType, len(items)) + b''.join(
+      encodePayload(itemType, item) for item in items)
+  return b''.join(struct.pack('>bH', t, len(n.encode())) + n.encode()
+                  + encodePayload(t, v)
+                  for (n, (t, v)) in value.items()) + b'\0'
+
+
+def encodeRoot(compound: dict) -> bytes:
+  """Encodes the root compound with an empty name"""
+  return b'\x0a\0\0' + encodePayload(COMPOUND, compound)
+
+
+def createItem(slot: int) -> dict:
+  """Creates an inventory item"""
+  item = {
+    'Slot': (BYTE, slot),
+    'id': (STRING, 'minecraft:item_%d' % random.randrange(1000)),
+    'count': (INT, random.randrange(1, 65)),
+  }
+  if random.random() < .3:
+    item['components'] = (COMPOUND, {
+      'minecraft:enchantments': (COMPOUND, {
+        'levels': (COMPOUND, {'minecraft:sharpness': (INT, 5),
+                              'minecraft:unbreaking': (INT, 3)}),
+      }),
+      'minecraft:damage': (INT, random.randrange(500)),
+      'minecraft:custom_name': (STRING, '{"text":"Item %d"}' % slot),
+    })
+  return item
+
+
+def createPlayer() -> dict:
+  """Creates the playerdata of a player"""
+  recipes = ['minecraft:recipe_%d' % i for i in range(800)]
+  return {
+    'DataVersion': (INT, 3953),
+    'UUID': (INT_ARRAY, [random.randrange(-2 ** 31, 2 ** 31)
+                         for _ in range(4)]),
+    'Pos': (LIST, (DOUBLE, [random.uniform(-1e4, 1e4) for _ in range(3)])),
+    'Motion': (LIST, (DOUBLE, [0., -.0784, 0.])),
+    'Rotation': (LIST, (FLOAT, [random.uniform(-180, 180), 0.])),
+    'Health': (FLOAT, random.uniform(0, 20)),
+    'foodLevel': (INT, 20),
+    'XpLevel': (INT, random.randrange(100)),
+    'Dimension': (STRING, random.choice(['minecraft:overworld',
+                                         'minecraft:the_nether'])),
+    'Inventory': (LIST, (COMPOUND, [createItem(i)
+                                    for i in range(random.randrange(36))])),
+    'EnderItems': (LIST, (COMPOUND, [createItem(i) for i in range(27)])),
+    'attributes': (LIST, (COMPOUND, [
+      {'id': (STRING, 'minecraft:attribute_%d' % i), 'base': (DOUBLE, 1.)}
+      for i in range(12)])),
+    'abilities': (COMPOUND, {
+      'flying': (BYTE, 0), 'walkSpeed': (FLOAT, .1),
+      'flySpeed': (FLOAT, .05), 'mayfly': (BYTE, 0)}),
+    'recipeBook': (COMPOUND, {
+      'recipes': (LIST, (STRING, recipes)),
+      'toBeDisplayed': (LIST, (STRING, recipes[:100])),
+    }),
+  }
+
+
+def naiveParse(stream: io.BytesIO, tagType: int) -> object:
+  """Parses the payload of the tag recursively, decoding every tag"""
+  if tagType in _formats:
+    fmt = _formats[tagType]
+    return struct.unpack(fmt, stream.read(struct.calcsize(fmt)))[0]
+  if tagType == STRING:
+    length, = struct.unpack('>H', stream.read(2))
+    return stream.read(length).decode('utf-8')
+  if tagType in (BYTE_ARRAY, INT_ARRAY, LONG_ARRAY):
+    length, = struct.unpack('>i', stream.read(4))
+    itemType = {BYTE_ARRAY: BYTE, INT_ARRAY: INT, LONG_ARRAY: LONG}[tagType]
+    return [naiveParse(stream, itemType) for _ in range(length)]
+  if tagType == LIST:
+    itemType, length = struct.unpack('>bi', stream.read(5))
+    return [naiveParse(stream, itemType) for _ in range(length)]
+  compound = {}
+  while True:
+    itemType = stream.read(1)[0]
+    if itemType == END:
+      return compound
+    length, = struct.unpack('>H', stream.read(2))
+    name = stream.read(length).decode('utf-8')
+    compound[name] = naiveParse(stream, itemType)
+
+
+def naiveLoad(path: str) -> dict:
+  """Reads the file with the gzip module and parses it naively"""
+  with gzip.open(path, 'rb') as file:
+    stream = io.BytesIO(file.read())
+  stream.read(3)
+  return naiveParse(stream, COMPOUND)
+
+
+def refreshNaive(paths: list[str]) -> list[tuple]:
+  """Reads the players with the naive parser"""
+  players = []
+  for path in paths:
+    data = naiveLoad(path)
+    players.append((data['Pos'], data['Health'], data['Dimension'],
+                    len(data['Inventory'])))
+  return players
+
+
+def refreshLazy(paths: list[str], load: callable = loadNbt) -> list[tuple]:
+  """Reads the players with the lazy reader"""
+  players = []
+  for path in paths:
+    root = load(path)
+    players.append((root['Pos'].toArray(), root['Health'],
+                    root['Dimension'], len(root['Inventory'])))
+  return players
+
+
+def main() -> None:
+  """Runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--players', type=int, default=500)
+  parser.add_argument('--rounds', type=int, default=5)
+  args = parser.parse_args()
+  random.seed(0)
+  with tempfile.TemporaryDirectory() as directory:
+    paths, size = [], 0
+    for _ in range(args.players):
+      path = os.path.join(directory, '%s.dat' % uuid.uuid4())
+      data = gzip.compress(encodeRoot(createPlayer()))
+      size += len(data)
+      with open(path, 'wb') as file:
+        file.write(data)
+      paths.append(path)
+    print('%d playerdata files, %.1f kB each' % (
+      len(paths), size / len(paths) / 1024))
+    cache = NbtFileCache()
+    refreshLazy(paths, cache.load)
+    expected = [(list(p[0]), *p[1:]) for p in refreshNaive(paths)]
+    lazy = [(list(p[0]), *p[1:]) for p in refreshLazy(paths)]
+    assert lazy == expected
+    cases = [
+      ('naive recursive', lambda: refreshNaive(paths)),
+      ('lazy reader', lambda: refreshLazy(paths)),
+      ('lazy reader, cached', lambda: refreshLazy(paths, cache.load)),
+    ]
+    for (name, case) in cases:
+      times = []
+      for _ in range(args.rounds):
+        start = time.perf_counter()
+        case()
+        times.append((time.perf_counter() - start) * 1000)
+      print('%-22s %10.1f ms per refresh' % (name, statistics.median(times)))
+    print('  %s' % cache.getStats())
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,125 @@
+"""Benchmark of decoding the block states of chunk sections. Sections
+resembling those of the game are packed in both the non-spanning layout
+used since 1.16 and the spanning layout used before. Each is decoded
+with a naive loop over the bits of every entry and with the vectorized
+decoder of the region package, and the results are compared. The rates
+are given in sections per second on one core. Run with the src folder
+on the python path:
+
+  python benchmarks/palettebench.py --sections 2000"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy
+
+from minelive.nbt import readNbt
+from minelive.region import decodeBlockStates, decodeHeightmap
+from minelive.region import SPANNING_VERSION, unpackIndices
+from nbtbench import encodeRoot, LIST, COMPOUND, INT, LONG_ARRAY
+from regionbench import createSection, packIndices
+
+
+def packSpanning(indices: numpy.ndarray, bits: int) -> numpy.ndarray:
+  """Packs the indices into one continuous stream of bits, as the game did
+  before 1.16"""
+  value = 0
+  for (i, index) in enumerate(indices.tolist()):
+    value |= index << (i * bits)
+  count = -(-len(indices) * bits // 64)
+  longs = [(value >> (64 * i)) & (2 ** 64 - 1) for i in range(count)]
+  return numpy.array(longs, numpy.uint64).view(numpy.int64)
+
+
+def naiveDecode(data: list[int], bits: int, count: int,
+                spanning: bool) -> list[int]:
+  """Decodes the entries one bit at a time"""
+  perLong = 64 // bits
+  values = []
+  for i in range(count):
+    if spanning:
+      start = i * bits
+    else:
+      start = (i // perLong) * 64 + (i % perLong) * bits
+    value = 0
+    for bit in range(bits):
+      position = start + bit
+      if data[position >> 6] >> (position & 63) & 1:
+        value |= 1 << bit
+    values.append(value)
+  return values
+
+
+def naiveSection(section: object, spanning: bool) -> list[str]:
+  """Decodes the blocks of the section with the naive loop"""
+  states = section['block_states']
+  palette = [entry['Name'] for entry in states['palette']]
+  bits = max(4, (len(palette) - 1).bit_length())
+  data = [int(value) & (2 ** 64 - 1) for value in states['data']]
+  indices = naiveDecode(data, bits, 4096, spanning)
+  return [palette[index] for index in indices]
+
+
+def createSections(count: int, spanning: bool) -> list[object]:
+  """Creates the sections as lazy NBT views"""
+  rng = numpy.random.default_rng(0)
+  roots = []
+  for _ in range(count):
+    section = createSection(0, rng)
+    if spanning:
+      states = section['block_states'][1]
+      bits = max(4, (len(states['palette'][1][1]) - 1).bit_length())
+      indices = unpackIndices(states['data'][1], bits, 4096)
+      states['data'] = (LONG_ARRAY, packSpanning(indices, bits).tolist())
+    data = encodeRoot({'sections': (LIST, (COMPOUND, [section]))})
+    roots.append(readNbt(data)['sections'][0])
+  return roots
+
+
+def main() -> None:
+  """Runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--sections', type=int, default=2000)
+  parser.add_argument('--naive', type=int, default=20)
+  args = parser.parse_args()
+  version = {False: SPANNING_VERSION, True: SPANNING_VERSION - 1}
+  for spanning in (False, True):
+    sections = createSections(args.sections, spanning)
+    registry = {}
+    for section in sections[:args.naive]:
+      expected = naiveSection(section, spanning)
+      blocks = decodeBlockStates(section, dataVersion=version[spanning])
+      assert blocks.reshape(-1).tolist() == expected
+    layout = 'spanning' if spanning else 'non-spanning'
+    start = time.perf_counter()
+    for section in sections[:args.naive]:
+      naiveSection(section, spanning)
+    naive = args.naive / (time.perf_counter() - start)
+    print('%-13s naive         %10.0f sections/s' % (layout, naive))
+    for (label, kwargs) in (('names', {}), ('registry', {
+      'registry': registry})):
+      start = time.perf_counter()
+      for section in sections:
+        decodeBlockStates(section, dataVersion=version[spanning], **kwargs)
+      rate = len(sections) / (time.perf_counter() - start)
+      print('%-13s %-13s %10.0f sections/s %8.0fx' % (
+        layout, label, rate, rate / naive))
+  rng = numpy.random.default_rng(1)
+  heights = rng.integers(0, 384, 256)
+  data = readNbt(encodeRoot({
+    'DataVersion': (INT, 3953),
+    'WORLD_SURFACE': (LONG_ARRAY, packIndices(heights, 9).tolist()),
+  }))['WORLD_SURFACE']
+  assert decodeHeightmap(data).reshape(-1).tolist() == heights.tolist()
+  start = time.perf_counter()
+  for _ in range(args.sections):
+    decodeHeightmap(data)
+  rate = args.sections / (time.perf_counter() - start)
+  print('heightmap                   %10.0f heightmaps/s' % rate)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,78 @@
+"""Throughput benchmark of the LogParser classifying a synthetic server
+log in which one line in five carries an event. The lines are frozen
+out of the garbage collector once created, as an application would
+freeze its objects once at startup, such that collections triggered by
+the events allocated do not scan them. Run with the src folder on the
+python path:
+
+  python benchmarks/parserbench.py --lines 1000000"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import time
+
+from minelive.logs import LogParser
+
+from tailerbench import syntheticBlock
+
+_target = 1000000
+
+_noise = [
+  '[12:00:%02d] [Server thread/INFO]: Saving chunks for level '
+  '\'ServerLevel[world]\'/minecraft:overworld',
+  '[12:00:%02d] [Worker-Main-3/INFO]: Preparing spawn area: 84%%',
+  '[12:00:%02d] [Server thread/INFO] [net.minecraftforge.common.ForgeMod/]:'
+  ' Loaded config for mod foo',
+  '[12:00:%02d] [Netty Epoll Server IO #2/INFO]: com.mojang.authlib.'
+  'GameProfile@1a2b3c[id=<null>,name=Steve] lost connection: Disconnected',
+  '[12:00:%02d] [Server thread/INFO]: [Rcon: Saved the game]',
+]
+
+
+def syntheticLines(lineCount: int) -> list[str]:
+  """Returns synthetic log lines of which one in five is an event"""
+  eventCount = lineCount // 5
+  events = syntheticBlock(eventCount).decode('utf-8').split('\n')[:-1]
+  noise = [random.choice(_noise) % random.randint(0, 59)
+           for _ in range(lineCount - eventCount)]
+  lines = events + noise
+  random.shuffle(lines)
+  return lines
+
+
+def benchParser(lines: list[str], batchSize: int, rounds: int) -> None:
+  """Classifies the lines in batches of the given size"""
+  batches = [lines[i:i + batchSize]
+             for i in range(0, len(lines), batchSize)]
+  best = None
+  for _ in range(rounds):
+    parser = LogParser()
+    start = time.perf_counter()
+    count = 0
+    for batch in batches:
+      count += len(parser.parseLines(batch))
+    elapsed = time.perf_counter() - start
+    best = elapsed if best is None else min(best, elapsed)
+  rate = len(lines) / best
+  print('batch %6d: %8d events  %10.0f lines/s  %s' % (
+    batchSize, count, rate, 'ok' if rate > _target else 'below target'))
+
+
+def main() -> None:
+  """Runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--lines', type=int, default=1000000)
+  parser.add_argument('--rounds', type=int, default=3)
+  args = parser.parse_args()
+  lines = syntheticLines(args.lines)
+  gc.freeze()
+  for batchSize in (1000, 10000, 100000):
+    benchParser(lines, batchSize, args.rounds)
+
+
+if __name__ == '__main__':
+  main()
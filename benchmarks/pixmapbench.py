@@ -0,0 +1,64 @@
+"""Benchmark of repainting a grid of DebugButtons while the hover flag
+toggles, comparing the cached state renderings against painting the
+rectangle and text on every paint as before. Run with the src folder on
+the python path:
+
+  python benchmarks/pixmapbench.py --buttons 200 --frames 50"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import time
+from typing import NoReturn
+
+from PySide6.QtCore import QPoint
+from PySide6.QtGui import QImage, QPainter, QPaintEvent
+from PySide6.QtWidgets import QApplication
+
+
+def benchRepaint(buttons: list, frames: int, label: str) -> None:
+  """Renders every button the given number of times toggling hover"""
+  image = QImage(128, 64, QImage.Format.Format_ARGB32_Premultiplied)
+  painter = QPainter(image)
+  start = time.perf_counter()
+  for frame in range(frames):
+    for button in buttons:
+      button.hover = frame % 2
+      button.render(painter, QPoint())
+  elapsed = time.perf_counter() - start
+  painter.end()
+  print('%-8s %8.2f ms/frame  %8.1f us/button' % (
+    label, elapsed / frames * 1000, elapsed / frames / len(buttons) * 1e6))
+
+
+def main() -> None:
+  """Runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--buttons', type=int, default=200)
+  parser.add_argument('--frames', type=int, default=50)
+  args = parser.parse_args()
+  app = QApplication([])
+  import workside.styles
+  from workside.widgets import DebugButton
+
+  class DirectButton(DebugButton):
+    """Paints every state from scratch"""
+
+    def paintEvent(self, event: QPaintEvent) -> NoReturn:
+      """Paints the state directly on the widget"""
+      painter = QPainter()
+      painter.begin(self)
+      self.paintState(painter, self.rect())
+      painter.end()
+
+  for cls, label in ((DirectButton, 'direct'), (DebugButton, 'cached')):
+    buttons = [cls() for _ in range(args.buttons)]
+    for button in buttons:
+      button.resize(128, 64)
+    benchRepaint(buttons, args.frames, label)
+  app.quit()
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,74 @@
+"""Benchmark of the time the ProfileToolkit takes from the calling thread.
+A workload of recursive and nested calls is profiled, and the time spent
+stopping the profiler and taking allocation snapshots on the calling
+thread is compared with the time the worker thread takes writing the
+output. Run with the src folder on the python path:
+
+  QT_QPA_PLATFORM=offscreen python benchmarks/profilebench.py"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from typing import NoReturn
+
+from PySide6.QtCore import QCoreApplication
+
+
+def _fib(n: int) -> int:
+  """Recursive workload"""
+  return n if n < 2 else _fib(n - 1) + _fib(n - 2)
+
+
+def _work(size: int) -> list:
+  """Nested workload allocating memory"""
+  return [sorted(str(i * j) for j in range(size)) for i in range(size)]
+
+
+def main() -> None:
+  """Runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--fib', type=int, default=22)
+  parser.add_argument('--size', type=int, default=200)
+  args = parser.parse_args()
+  app = QCoreApplication([])
+  import workside.styles
+  from workside.profiling import ProfileToolkit
+  toolkit = ProfileToolkit(tempfile.mkdtemp())
+  reports = []
+  toolkit.reportReady.connect(
+    lambda title, text: reports.append((title, time.perf_counter())))
+
+  def waitFor(count: int) -> float:
+    """Processes events until the given number of reports arrived"""
+    while len(reports) < count:
+      app.processEvents()
+      time.sleep(0.001)
+    return reports[count - 1][1]
+
+  toolkit.toggleProfiler()
+  _fib(args.fib)
+  _work(args.size)
+  start = time.perf_counter()
+  toolkit.toggleProfiler()
+  blocked = time.perf_counter() - start
+  done = waitFor(1)
+  print('cProfile     calling thread %8.2f ms  worker %8.1f ms' % (
+    blocked * 1000, (done - start) * 1000))
+  toolkit.snapshotAllocations()
+  waitFor(2)
+  keep = _work(args.size)
+  start = time.perf_counter()
+  toolkit.snapshotAllocations()
+  blocked = time.perf_counter() - start
+  done = waitFor(3)
+  print('tracemalloc  calling thread %8.2f ms  worker %8.1f ms' % (
+    blocked * 1000, (done - start) * 1000))
+  toolkit.shutdown(wait=True)
+  del keep
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,85 @@
+"""Benchmark of the polls per second of the ServerPoller against local
+FakeMinecraftServer instances. The fake servers run in a child process,
+such that the CPU time reported is that of the poller alone, given as the
+fraction of one core used over the run. Every other endpoint uses the
+query protocol rather than the server list ping. With the default
+interval the benchmark checks the load of polling many servers once per
+second, while an interval of 0 polls as fast as possible. Run with the
+src folder on the python path:
+
+  python benchmarks/querybench.py --servers 200 --interval 1000"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+
+from minelive.query import FakeMinecraftServer, ServerPoller
+
+
+async def serve(count: int) -> None:
+  """Runs the fake servers until the standard input is closed"""
+  servers = []
+  for i in range(count):
+    players = ['player%d' % j for j in range(i % 8)]
+    servers.append(FakeMinecraftServer('Server %d' % i, players=players))
+  ports = [await server.start() for server in servers]
+  print(' '.join(map(str, ports)), flush=True)
+  await asyncio.get_running_loop().run_in_executor(None, sys.stdin.read)
+  for server in servers:
+    await server.stop()
+
+
+async def poll(ports: list[int], args: argparse.Namespace) -> None:
+  """Polls the servers for the duration and prints the rates"""
+  poller = ServerPoller()
+  for (i, port) in enumerate(ports):
+    poller.addServer('server%d' % i, '127.0.0.1', port, query=bool(i % 2),
+                     slp=not i % 2, minInterval=args.interval,
+                     maxInterval=max(args.interval, args.maxInterval))
+  task = asyncio.create_task(poller.run())
+  await asyncio.sleep(args.warmup)
+  polls, fails = poller.getPollCount(), poller.getFailCount()
+  wall, cpu = time.perf_counter(), time.process_time()
+  await asyncio.sleep(args.duration)
+  wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+  polls, fails = poller.getPollCount() - polls, poller.getFailCount() - fails
+  poller.stop()
+  await task
+  table = poller.getTable()
+  online = sum(s.online for s in table.getSnapshots().values())
+  print('%d endpoints, %d online, table version %d' % (
+    len(ports), online, table.getVersion()))
+  print('%10.0f polls/s %8d failed %8.1f %% of one core' % (
+    polls / wall, fails, 100 * cpu / wall))
+
+
+def main() -> None:
+  """Parses the arguments and runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--servers', type=int, default=200)
+  parser.add_argument('--interval', type=int, default=1000)
+  parser.add_argument('--maxInterval', type=int, default=1000)
+  parser.add_argument('--duration', type=float, default=5.)
+  parser.add_argument('--warmup', type=float, default=1.)
+  parser.add_argument('--serve', type=int, default=0)
+  args = parser.parse_args()
+  if args.serve:
+    return asyncio.run(serve(args.serve))
+  child = subprocess.Popen([sys.executable, __file__, '--serve',
+                            str(args.servers)], stdin=subprocess.PIPE,
+                           stdout=subprocess.PIPE, text=True)
+  try:
+    ports = [int(port) for port in child.stdout.readline().split()]
+    asyncio.run(poll(ports, args))
+  finally:
+    child.stdin.close()
+    child.wait()
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,91 @@
+"""Benchmark of the commands per second executed by the rcon package
+against local FakeRconServer instances. Three ways of executing the
+commands are compared: a fresh connection for each command, one pooled
+connection per server waiting for each response before sending the next
+command, and the pools of every server pipelining the commands. The
+delay simulates the time the server takes for each command. Run with the
+src folder on the python path:
+
+  python benchmarks/rconbench.py --servers 4 --commands 500 --delay 0"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from minelive.rcon import FakeRconServer, RconConnection, RconPool
+
+_password = 'bench'
+
+
+async def fresh(ports: list[int], commands: list[str]) -> None:
+  """Opens a new connection for each command"""
+  for port in ports:
+    for command in commands:
+      connection = RconConnection('127.0.0.1', port, _password)
+      await connection.open()
+      await connection.execute(command)
+      await connection.close()
+
+
+async def sequential(pools: list[RconPool], commands: list[str]) -> None:
+  """Executes the commands one at a time on each pool"""
+  for pool in pools:
+    for command in commands:
+      await pool.execute(command)
+
+
+async def pipelined(pools: list[RconPool], commands: list[str]) -> None:
+  """Executes the commands of every pool at once"""
+  await asyncio.gather(*(pool.executeAll(commands) for pool in pools))
+
+
+async def run(args: argparse.Namespace) -> None:
+  """Runs the benchmark"""
+  servers = [FakeRconServer(_password, delay=args.delay)
+             for _ in range(args.servers)]
+  ports = [await server.start() for server in servers]
+  commands = ['list', 'tick query', 'forge tps'] * (args.commands // 3)
+  total = len(commands) * len(ports)
+  pools = [RconPool('127.0.0.1', port, _password, size=args.size)
+           for port in ports]
+  await pipelined(pools, commands[:1])
+  freshCommands = commands[:max(1, len(commands) // args.freshDivisor)]
+  cases = [
+    ('fresh connection', lambda: fresh(ports, freshCommands),
+     len(freshCommands) * len(ports)),
+    ('pooled sequential', lambda: sequential(pools, commands), total),
+    ('pooled pipelined', lambda: pipelined(pools, commands), total),
+  ]
+  for (name, case, count) in cases:
+    best = None
+    for _ in range(args.rounds):
+      start = time.perf_counter()
+      await case()
+      elapsed = time.perf_counter() - start
+      best = elapsed if best is None else min(best, elapsed)
+    print('%-20s %6d commands %10.0f commands/s' % (name, count,
+                                                    count / best))
+  for pool in pools:
+    print('  %s' % pool.getStats())
+    await pool.close()
+  for server in servers:
+    await server.stop()
+
+
+def main() -> None:
+  """Parses the arguments and runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--servers', type=int, default=4)
+  parser.add_argument('--commands', type=int, default=500)
+  parser.add_argument('--size', type=int, default=2)
+  parser.add_argument('--delay', type=float, default=0.)
+  parser.add_argument('--rounds', type=int, default=3)
+  parser.add_argument('--freshDivisor', type=int, default=5)
+  asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+  main()
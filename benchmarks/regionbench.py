@@ -0,0 +1,155 @@
+"""Benchmark of reading a world through the region package. A synthetic
+world of full region files is written to a temporary folder, with chunks
+resembling those of the game and one chunk per region stored in an
+external .mcc file. The benchmark times enumerating every chunk, which
+reads only the region headers, and reading random chunks of a working set
+twice, first starting from an empty ChunkCache and then from the chunks
+it kept. Run with the src folder on the python path:
+
+  python benchmarks/regionbench.py --regions 8 --reads 2000 --working 512"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import struct
+import tempfile
+import time
+import zlib
+
+import numpy
+
+from minelive.region import RegionFolder, ChunkCache
+from nbtbench import encodeRoot, BYTE, INT, LONG, STRING, LIST, COMPOUND
+from nbtbench import LONG_ARRAY
+
+_blocks = ['minecraft:%s' % name for name in (
+  'air', 'stone', 'deepslate', 'dirt', 'grass_block', 'water', 'granite',
+  'diorite', 'andesite', 'gravel', 'coal_ore', 'iron_ore', 'copper_ore',
+  'tuff', 'bedrock', 'sand', 'oak_log', 'oak_leaves', 'lava', 'clay')]
+
+
+def packIndices(indices: numpy.ndarray, bits: int) -> numpy.ndarray:
+  """Packs the indices into longs without spanning, as the game has done
+  since 1.16"""
+  perLong = 64 // bits
+  count = -(-len(indices) // perLong)
+  padded = numpy.zeros(count * perLong, numpy.uint64)
+  padded[:len(indices)] = indices
+  shifts = numpy.arange(perLong, dtype=numpy.uint64) * numpy.uint64(bits)
+  packed = numpy.bitwise_or.reduce(padded.reshape(count, perLong) << shifts,
+                                   axis=1)
+  return packed.view(numpy.int64)
+
+
+def createSection(y: int, rng: numpy.random.Generator) -> dict:
+  """Creates a chunk section of layered blocks with scattered ores"""
+  palette = rng.choice(len(_blocks), rng.integers(2, len(_blocks)),
+                       replace=False)
+  bits = max(4, int(len(palette) - 1).bit_length())
+  layers = rng.integers(0, len(palette), 16)
+  indices = numpy.repeat(layers, 256)
+  ores = rng.random(4096) < .05
+  indices[ores] = rng.integers(0, len(palette), int(ores.sum()))
+  return {
+    'Y': (BYTE, y),
+    'block_states': (COMPOUND, {
+      'palette': (LIST, (COMPOUND, [{'Name': (STRING, _blocks[i])}
+                                    for i in palette])),
+      'data': (LONG_ARRAY, packIndices(indices, bits).tolist()),
+    }),
+    'biomes': (COMPOUND, {
+      'palette': (LIST, (STRING, ['minecraft:plains'])),
+    }),
+  }
+
+
+def createChunk(x: int, z: int, rng: numpy.random.Generator) -> dict:
+  """Creates the root compound of a chunk"""
+  return {
+    'DataVersion': (INT, 3953),
+    'xPos': (INT, x),
+    'zPos': (INT, z),
+    'yPos': (INT, -4),
+    'Status': (STRING, 'minecraft:full'),
+    'LastUpdate': (LONG, 123456),
+    'InhabitedTime': (LONG, 0),
+    'sections': (LIST, (COMPOUND, [createSection(y, rng)
+                                   for y in range(-4, 20)])),
+    'Heightmaps': (COMPOUND, {
+      'WORLD_SURFACE': (LONG_ARRAY, packIndices(
+        rng.integers(60, 90, 256), 9).tolist()),
+    }),
+  }
+
+
+def writeRegion(path: str, payloads: list[bytes], external: int) -> None:
+  """Writes a full region of the payloads, storing the chunk of the given
+  index in an external file"""
+  locations, body = [], bytearray()
+  regionX, regionZ = map(int, os.path.basename(path).split('.')[1:3])
+  for index in range(1024):
+    payload = payloads[index % len(payloads)]
+    if index == external:
+      name = 'c.%d.%d.mcc' % (regionX * 32 + (index & 31),
+                              regionZ * 32 + (index >> 5))
+      with open(os.path.join(os.path.dirname(path), name), 'wb') as file:
+        file.write(payload)
+      data = struct.pack('>IB', 1, 0x82)
+    else:
+      data = struct.pack('>IB', len(payload) + 1, 2) + payload
+    sectors = -(-len(data) // 4096)
+    locations.append((2 + len(body) // 4096) << 8 | sectors)
+    body += data.ljust(sectors * 4096, b'\0')
+  timestamps = [1700000000] * 1024
+  with open(path, 'wb') as file:
+    file.write(struct.pack('>1024I1024I', *locations, *timestamps))
+    file.write(body)
+
+
+def main() -> None:
+  """Runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--regions', type=int, default=8)
+  parser.add_argument('--reads', type=int, default=2000)
+  parser.add_argument('--working', type=int, default=512)
+  parser.add_argument('--variants', type=int, default=32)
+  args = parser.parse_args()
+  rng = numpy.random.default_rng(0)
+  payloads = [zlib.compress(encodeRoot(createChunk(0, 0, rng)))
+              for _ in range(args.variants)]
+  side = max(1, int(args.regions ** .5))
+  with tempfile.TemporaryDirectory() as directory:
+    for i in range(args.regions):
+      path = os.path.join(directory, 'r.%d.%d.mca' % (i % side - 1,
+                                                      i // side - 1))
+      writeRegion(path, payloads, random.randrange(1024))
+    size = sum(e.stat().st_size for e in os.scandir(directory))
+    print('%d regions, %.1f MB, %.1f kB per chunk compressed' % (
+      args.regions, size / 1e6, size / args.regions / 1024 / 1024))
+    start = time.perf_counter()
+    with RegionFolder(directory) as folder:
+      coords = folder.getChunkCoords()
+      elapsed = time.perf_counter() - start
+      print('enumerate %8d chunks %8.1f ms %12.0f chunks/s, %d read' % (
+        len(coords), elapsed * 1000, len(coords) / elapsed,
+        folder.getReadCount()))
+    working = coords[rng.choice(len(coords), min(args.working, len(coords)),
+                                replace=False)]
+    picks = working[rng.integers(0, len(working), args.reads)].tolist()
+    cache = ChunkCache()
+    with RegionFolder(directory, cache) as folder:
+      for label in ('first', 'repeat'):
+        start = time.perf_counter()
+        for (x, z) in picks:
+          folder.readChunk(x, z)['sections'][0]['block_states']['data']
+        elapsed = time.perf_counter() - start
+        print('read %-6s %8d chunks %8.1f ms %12.0f chunks/s' % (
+          label, len(picks), elapsed * 1000, len(picks) / elapsed))
+    print('  %s' % cache.getStats())
+
+
+if __name__ == '__main__':
+  main()
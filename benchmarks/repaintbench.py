@@ -0,0 +1,116 @@
+"""Benchmark of a burst of update requests on a window of Labels, as when
+log lines or metrics arrive faster than the screen refreshes. Each label
+requests several updates per frame for a number of frames. The paint
+events received and the time taken are compared with the requests passed
+straight to QWidget.update and coalesced by the RepaintScheduler. The
+time reported is processor time, as the benchmark waits for each frame.
+The bursts of a frame are made in one pass of the event loop unless
+spread over several passes, as when messages arrive one by one. Each
+mode runs in its own process. Run with the src folder on the python
+path:
+
+  QT_QPA_PLATFORM=offscreen python benchmarks/repaintbench.py --spread 10"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from typing import NoReturn
+
+from PySide6.QtCore import QEventLoop, QTimer
+from PySide6.QtWidgets import QApplication, QWidget, QGridLayout
+
+
+def runMode(scheduled: bool, count: int, bursts: int, frames: int,
+            spread: int) -> dict:
+  """Runs the benchmark in this process"""
+  app = QApplication([])
+  import workside.styles
+  from workside.functional import frameInterval
+  from workside.settings import Settings
+  Settings.repaintScheduler = scheduled
+  from workside.widgets import Label, RepaintScheduler
+
+  class CountingLabel(Label):
+    """Label counting its paint events"""
+
+    paints = 0
+
+    def paintEvent(self, event: object) -> NoReturn:
+      """Counts the paint event"""
+      CountingLabel.paints += 1
+      Label.paintEvent(self, event)
+
+  window = QWidget()
+  layout = QGridLayout(window)
+  labels = []
+  for i in range(count):
+    label = CountingLabel()
+    label.setText('Metric %d' % i)
+    layout.addWidget(label, i // 10, i % 10)
+    labels.append(label)
+  window.show()
+  loop = QEventLoop()
+  QTimer.singleShot(200, loop.quit)
+  loop.exec()
+  CountingLabel.paints = 0
+  scheduler = RepaintScheduler.instance()
+  areas, paintTimes = [], []
+  scheduler.frameFinished.connect(
+    lambda frame: (areas.append(frame['area']),
+                   paintTimes.append(frame['paintTime'])))
+  interval = frameInterval(window)
+  start = time.process_time()
+  for _ in range(frames):
+    for burst in range(bursts):
+      for label in labels:
+        label.update()
+      if spread > 1 and burst % -(-bursts // spread) == 0:
+        app.processEvents()
+    loop = QEventLoop()
+    QTimer.singleShot(interval, loop.quit)
+    loop.exec()
+  app.processEvents()
+  elapsed = time.process_time() - start
+  return dict(
+    mode='scheduled' if scheduled else 'direct',
+    requests=count * bursts * frames,
+    paints=CountingLabel.paints,
+    elapsed=elapsed * 1000,
+    frames=len(paintTimes),
+    area=sum(areas) / max(len(areas), 1),
+    paintTime=sum(paintTimes) / max(len(paintTimes), 1),
+  )
+
+
+def main() -> None:
+  """Runs each mode in a subprocess and prints the results"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--labels', type=int, default=200)
+  parser.add_argument('--bursts', type=int, default=10)
+  parser.add_argument('--frames', type=int, default=30)
+  parser.add_argument('--spread', type=int, default=1)
+  parser.add_argument('--mode', choices=['scheduled', 'direct'])
+  args = parser.parse_args()
+  if args.mode is not None:
+    result = runMode(args.mode == 'scheduled', args.labels, args.bursts,
+                     args.frames, args.spread)
+    return print(json.dumps(result))
+  for mode in ('direct', 'scheduled'):
+    output = subprocess.run(
+      [sys.executable, __file__, '--labels', str(args.labels), '--bursts',
+       str(args.bursts), '--frames', str(args.frames), '--spread',
+       str(args.spread), '--mode', mode],
+      capture_output=True, text=True, check=True)
+    result = json.loads(output.stdout.strip().split('\n')[-1])
+    print('%(mode)-9s %(requests)7d requests  %(paints)6d paints  '
+          '%(elapsed)8.1f ms cpu  %(frames)4d frames  area %(area)9.0f px  '
+          'paint %(paintTime)6.2f ms/frame' % result)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,78 @@
+"""Benchmark of the SegmentStore measuring the append rate, the time taken
+to reopen the store and the latency of reading the rows of a page at
+random positions in the history. Run with the src folder on the python
+path:
+
+  python benchmarks/spillbench.py --lines 5000000"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+
+from workside.logstore import SegmentStore
+from workside.settings import Settings
+
+from parserbench import syntheticLines
+
+
+def benchAppend(directory: str, lines: list[str], total: int,
+                batchSize: int) -> None:
+  """Appends the lines repeatedly until the total is reached"""
+  store = SegmentStore('bench', directory)
+  start = time.perf_counter()
+  while len(store) < total:
+    for i in range(0, len(lines), batchSize):
+      store.extend(lines[i:i + batchSize])
+      if len(store) >= total:
+        break
+  store.close()
+  elapsed = time.perf_counter() - start
+  print('appended %d lines in %d segments: %10.0f lines/s' % (
+    len(store), store.getSegmentCount(), len(store) / elapsed))
+
+
+def benchReopen(directory: str, rounds: int, page: int) -> None:
+  """Reopens the store and reads pages at random positions"""
+  best = None
+  for _ in range(rounds):
+    start = time.perf_counter()
+    store = SegmentStore('bench', directory)
+    elapsed = (time.perf_counter() - start) * 1000
+    best = elapsed if best is None else min(best, elapsed)
+    store.close()
+  print('reopened %d lines: %8.2f ms' % (len(store), best))
+  store = SegmentStore('bench', directory)
+  worst = 0.
+  for _ in range(rounds * 20):
+    first = random.randrange(max(len(store) - page, 1))
+    start = time.perf_counter()
+    for seq in range(first, min(first + page, len(store))):
+      store.get(seq)
+    worst = max(worst, (time.perf_counter() - start) * 1000)
+  store.close()
+  print('read page of %d rows: %8.2f ms at worst' % (page, worst))
+
+
+def main() -> None:
+  """Runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--lines', type=int, default=5000000)
+  parser.add_argument('--batch', type=int, default=1000)
+  parser.add_argument('--rounds', type=int, default=5)
+  args = parser.parse_args()
+  lines = syntheticLines(min(args.lines, 1000000))
+  directory = tempfile.mkdtemp()
+  try:
+    benchAppend(directory, lines, args.lines, args.batch)
+    benchReopen(directory, args.rounds, Settings.logSpillPage)
+  finally:
+    shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,51 @@
+"""Benchmark of the cost of sampling the StatusMonitor. The paint time
+ring buffer of the RepaintScheduler is filled and a number of log buffers
+receive lines between the samples, as when the status bar is updated
+during a burst of logging. Run with the src folder on the python path:
+
+  QT_QPA_PLATFORM=offscreen python benchmarks/statusbench.py"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import time
+
+from PySide6.QtWidgets import QApplication
+
+
+def main() -> None:
+  """Runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--buffers', type=int, default=8)
+  parser.add_argument('--samples', type=int, default=2000)
+  args = parser.parse_args()
+  app = QApplication([])
+  import workside.styles
+  from workside.widgets import LogBuffer, StatusMonitor, RepaintScheduler
+  scheduler = RepaintScheduler.instance()
+  for i in range(len(scheduler._paintTimes)):
+    scheduler._paintTimes[i] = i % 17 / 10
+  monitor = StatusMonitor()
+  buffers = [LogBuffer() for _ in range(args.buffers)]
+  for buffer in buffers:
+    monitor.addLogBuffer(buffer)
+  lines = ['line %d' % i for i in range(100)]
+  elapsed = 0.
+  for _ in range(args.samples):
+    for buffer in buffers:
+      buffer.putAll(lines)
+    scheduler._frames += len(scheduler._paintTimes)
+    start = time.perf_counter()
+    sample = monitor.sample()
+    StatusMonitor.formatSample(sample)
+    elapsed += time.perf_counter() - start
+    for buffer in buffers:
+      buffer.drain()
+  print('sample %8.1f us  (%d buffers, %d paint times)' % (
+    elapsed / args.samples * 1e6, args.buffers, len(scheduler._paintTimes)))
+  app.quit()
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,53 @@
+"""Microbenchmark of applying a BaseStyle to a painter on an offscreen
+QImage, comparing the cached pen, brush and font against rebuilding them
+on every call as before. Python allocations made during the loop are
+counted with tracemalloc. Run with the src folder on the python path:
+
+  python benchmarks/stylebench.py --calls 100000"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+from PySide6.QtGui import QGuiApplication, QImage, QPainter
+
+
+def benchStyle(painter: QPainter, calls: int, rebuild: bool) -> None:
+  """Applies the style to the painter the given number of times"""
+  from workside.styles import labelStyle
+  labelStyle @ painter
+  tracemalloc.start()
+  before = tracemalloc.take_snapshot()
+  start = time.perf_counter()
+  for _ in range(calls):
+    if rebuild:
+      labelStyle._invalidate()
+    labelStyle @ painter
+  elapsed = time.perf_counter() - start
+  after = tracemalloc.take_snapshot()
+  tracemalloc.stop()
+  stats = after.compare_to(before, 'filename')
+  blocks = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+  print('%-8s %10.2f us/call  %6d allocated blocks retained' % (
+    'rebuild' if rebuild else 'cached', elapsed / calls * 1e6, blocks))
+
+
+def main() -> None:
+  """Runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--calls', type=int, default=100000)
+  args = parser.parse_args()
+  app = QGuiApplication([])
+  image = QImage(256, 256, QImage.Format.Format_ARGB32_Premultiplied)
+  painter = QPainter(image)
+  for rebuild in (True, False):
+    benchStyle(painter, args.calls, rebuild)
+  painter.end()
+  app.quit()
+
+
+if __name__ == '__main__':
+  main()
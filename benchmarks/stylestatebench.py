@@ -0,0 +1,53 @@
+"""Microbenchmark of resolving the style of a DebugButton from its flags.
+The table lookup of AbstractButtonStyle is compared against the previous
+per-paint loop, which called every flag getter and multiplied primes into
+a key for a dictionary of styles. Run with the src folder on the python
+path:
+
+  python benchmarks/stylestatebench.py --calls 1000000"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import time
+
+from PySide6.QtWidgets import QApplication
+
+_primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47]
+
+
+def primeKey(instance: object) -> int:
+  """Returns the prime key of the flags as computed previously"""
+  flags = [getFlag(instance) for getFlag in instance.__class__.flagGetters]
+  key = 1
+  for (p, f) in zip(_primes, flags):
+    key *= p if f else 1
+  return key
+
+
+def main() -> None:
+  """Runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--calls', type=int, default=1000000)
+  args = parser.parse_args()
+  app = QApplication([])
+  from workside.styles import baseButtonStyle, hoverButtonStyle
+  from workside.widgets import DebugButton
+  button = DebugButton()
+  styles = {primeKey(button): baseButtonStyle}
+  start = time.perf_counter()
+  for _ in range(args.calls):
+    styles.get(primeKey(button), hoverButtonStyle)
+  loop = time.perf_counter() - start
+  start = time.perf_counter()
+  for _ in range(args.calls):
+    button.buttonStyle
+  table = time.perf_counter() - start
+  print('prime loop   %8.3f us/lookup' % (loop / args.calls * 1e6))
+  print('table lookup %8.3f us/lookup' % (table / args.calls * 1e6))
+  app.quit()
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,112 @@
+"""Throughput benchmark of the LogTailer replaying a synthetic server log.
+Run with the src folder on the python path:
+
+  python benchmarks/tailerbench.py --size 512"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from minelive.logs import LogTailer, Settings
+
+_templates = [
+  '[%s] [Server thread/INFO]: <Player%d> hello there, how is the base?',
+  '[%s] [Server thread/INFO]: Player%d joined the game',
+  '[%s] [Server thread/INFO]: Player%d left the game',
+  '[%s] [Server thread/WARN]: Can\'t keep up! Is the server overloaded? '
+  'Running 2%03dms or 41 ticks behind',
+  '[%s] [Server thread/INFO]: Player%d has made the advancement '
+  '[Stone Age]',
+  '[%s] [Server thread/INFO]: Player%d was slain by Zombie',
+]
+
+
+def syntheticBlock(lineCount: int) -> bytes:
+  """Returns a block of synthetic log lines"""
+  lines = []
+  for i in range(lineCount):
+    stamp = '%02d:%02d:%02d' % (i // 3600 % 24, i // 60 % 60, i % 60)
+    template = random.choice(_templates)
+    lines.append(template % (stamp, random.randint(0, 999)))
+  return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def writeLog(path: str, sizeMB: int) -> int:
+  """Writes a synthetic log of the given size. Returns the number of
+  bytes written."""
+  block = syntheticBlock(20000)
+  target = sizeMB << 20
+  written = 0
+  with open(path, 'wb') as f:
+    while written < target:
+      f.write(block)
+      written += len(block)
+  return written
+
+
+def benchReplay(logDir: str, size: int) -> None:
+  """Reads the entire log from the start"""
+  tailer = LogTailer(logDir)
+  start = time.perf_counter()
+  count = 0
+  for lines in tailer.iterChunks():
+    count += len(lines)
+  elapsed = time.perf_counter() - start
+  tailer.close()
+  print('replay:   %8d lines  %7.1f MB/s  %10.0f lines/s' % (
+    count, size / elapsed / 2 ** 20, count / elapsed))
+
+
+def benchReadline(path: str, size: int) -> None:
+  """Baseline reading the same log line by line"""
+  start = time.perf_counter()
+  count = 0
+  with open(path, 'r', encoding='utf-8') as f:
+    while f.readline():
+      count += 1
+  elapsed = time.perf_counter() - start
+  print('readline: %8d lines  %7.1f MB/s  %10.0f lines/s' % (
+    count, size / elapsed / 2 ** 20, count / elapsed))
+
+
+def benchFollow(logDir: str, path: str, rounds: int) -> None:
+  """Appends bursts to the log and polls after each"""
+  tailer = LogTailer(logDir, fromStart=False)
+  tailer.poll()
+  block = syntheticBlock(5000)
+  elapsed, count = 0, 0
+  with open(path, 'ab') as f:
+    for _ in range(rounds):
+      f.write(block)
+      f.flush()
+      start = time.perf_counter()
+      count += len(tailer.poll())
+      elapsed += time.perf_counter() - start
+  tailer.close()
+  print('follow:   %8d lines  %7.3f ms/poll  %10.0f lines/s' % (
+    count, elapsed / rounds * 1000, count / elapsed))
+
+
+def main() -> None:
+  """Runs the benchmark"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--size', type=int, default=256, help='MB of log')
+  parser.add_argument('--rounds', type=int, default=200)
+  args = parser.parse_args()
+  with tempfile.TemporaryDirectory() as serverDir:
+    logDir = Settings.getLogDir(serverDir)
+    os.makedirs(logDir)
+    path = os.path.join(logDir, Settings.latestLogName)
+    size = writeLog(path, args.size)
+    benchReplay(logDir, size)
+    benchReadline(path, size)
+    benchFollow(logDir, path, args.rounds)
+
+
+if __name__ == '__main__':
+  main()
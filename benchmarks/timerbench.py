@@ -0,0 +1,120 @@
+"""Benchmark comparing the timers created by the 'timer' decorator as
+native QTimers against WheelTimers on the shared TimerWheel. Each mode
+builds AbstractButtons, creates the timers of every button and its click
+machine, then starts them and counts the wakeups of the event loop until
+every timer has fired. Each mode runs in its own process such that the
+memory used can be compared. Run with the src folder on the python path:
+
+  python benchmarks/timerbench.py --buttons 1000"""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import NoReturn
+
+
+
+def _rss() -> int:
+  """Returns the resident memory of the process in kilobytes"""
+  with open('/proc/self/statm') as file:
+    pages = int(file.read().split()[1])
+  return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+
+
+def _getTimers(button: object) -> list:
+  """Returns every timer of the button creating them if required"""
+  out = [getattr(button, '_getMovingDelayTimer')()]
+  clickMachine = getattr(button, '_getClickMachine')()
+  return out + clickMachine.getTimers()
+
+
+def runMode(wheel: bool, count: int) -> dict:
+  """Runs the benchmark in this process"""
+  from PySide6.QtCore import QAbstractEventDispatcher, QEventLoop, \
+    QTimer, QObject, QEvent
+  from PySide6.QtWidgets import QApplication
+  app = QApplication.instance() or QApplication([])
+  import workside.styles
+  from workside.settings import Settings
+  Settings.timerWheel = wheel
+  from workside.widgets import AbstractButton
+
+  class BenchButton(AbstractButton):
+    """Concrete button painting nothing"""
+
+    def paintEvent(self, event: object) -> NoReturn:
+      """Paints nothing"""
+
+  class TimerEventCounter(QObject):
+    """Counts the timer events delivered to any object"""
+
+    def __init__(self, ) -> None:
+      QObject.__init__(self)
+      self.count = 0
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+      """Counts timer events"""
+      if event.type() == QEvent.Type.Timer:
+        self.count += 1
+      return False
+
+  before = _rss()
+  start = time.perf_counter()
+  buttons = [BenchButton() for _ in range(count)]
+  construction = time.perf_counter() - start
+  start = time.perf_counter()
+  timers = [t for button in buttons for t in _getTimers(button)]
+  creation = time.perf_counter() - start
+  memory = _rss() - before
+  app.processEvents()
+  wakeups = [0]
+  dispatcher = QAbstractEventDispatcher.instance()
+  dispatcher.awake.connect(lambda: wakeups.__setitem__(0, wakeups[0] + 1))
+  counter = TimerEventCounter()
+  app.installEventFilter(counter)
+  longest = max(t.interval() for t in timers)
+  start = time.perf_counter()
+  for t in timers:
+    t.start()
+  loop = QEventLoop()
+  QTimer.singleShot(longest + 100, loop.quit)
+  loop.exec()
+  return dict(
+    mode='wheel' if wheel else 'qtimer',
+    timers=len(timers),
+    construction=construction * 1000,
+    creation=creation * 1000,
+    memory=memory,
+    wakeups=wakeups[0],
+    timerEvents=counter.count,
+    active=sum(1 for t in timers if t.isActive()),
+  )
+
+
+def main() -> None:
+  """Runs each mode in a subprocess and prints the results"""
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--buttons', type=int, default=1000)
+  parser.add_argument('--mode', choices=['wheel', 'qtimer'], default=None)
+  args = parser.parse_args()
+  if args.mode is not None:
+    result = runMode(args.mode == 'wheel', args.buttons)
+    return print(json.dumps(result))
+  for mode in ('qtimer', 'wheel'):
+    output = subprocess.run(
+      [sys.executable, __file__, '--buttons', str(args.buttons),
+       '--mode', mode], capture_output=True, text=True, check=True)
+    result = json.loads(output.stdout.strip().split('\n')[-1])
+    print('%(mode)-7s %(timers)6d timers  buttons %(construction)9.1f ms'
+          '  timers %(creation)8.1f ms  memory %(memory)7d kB  wakeups'
+          ' %(wakeups)5d  timer events %(timerEvents)6d' % result)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,25 @@
+"""The logs package follows the log files written by a running instance
+of minecraft."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from moreworktoy import lazyExports
+
+if TYPE_CHECKING:
+  from ._settings import Settings
+  from ._logevent import EventKind, LogEvent
+  from ._logparser import LogParser
+  from ._logtailer import LogTailer
+  from ._logfollower import LogFollower
+
+__getattr__, __dir__ = lazyExports(__name__, {
+  'Settings': '._settings',
+  'EventKind': '._logevent',
+  'LogEvent': '._logevent',
+  'LogParser': '._logparser',
+  'LogTailer': '._logtailer',
+  'LogFollower': '._logfollower',
+})
@@ -0,0 +1,43 @@
+"""LogEvent is the compact record emitted by the LogParser for each line
+recognized as an event."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+from enum import IntEnum
+from typing import NamedTuple
+
+
+class EventKind(IntEnum):
+  """Enum specifying the kinds of events recognized in the server log"""
+  JOIN = 1
+  LEAVE = 2
+  CHAT = 3
+  DEATH = 4
+  ADVANCEMENT = 5
+  LAG = 6
+  CRASH = 7
+
+  def __repr__(self) -> str:
+    """Code representation"""
+    return 'EventKind.%s' % self.name
+
+  def __str__(self) -> str:
+    """String representation"""
+    return self.name.lower()
+
+
+class LogEvent(NamedTuple):
+  """LogEvent is the compact record emitted by the LogParser for each line
+  recognized as an event. For player events, the subject is the player
+  name and the detail is the rest of the message, the chat text or the
+  advancement title. For lag warnings, the subject and detail are the
+  milliseconds and ticks behind. For crashes, the detail is the report
+  path or the crash message.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  kind: EventKind
+  time: str
+  subject: str
+  detail: str
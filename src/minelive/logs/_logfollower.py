@@ -0,0 +1,104 @@
+"""LogFollower polls a LogTailer from a worker thread and emits the lines
+read to the GUI thread."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import NoReturn
+
+from PySide6.QtCore import QObject, QThread, QTimer, Signal, Slot
+
+from minelive.logs import Settings, LogTailer, LogParser
+
+
+class LogFollower(QObject):
+  """LogFollower polls a LogTailer from a worker thread and emits the lines
+  read to the GUI thread along with the events found in them by the
+  LogParser. Lines are emitted one list per chunk such that a burst of
+  log lines crosses the thread boundary as a few signals rather than one
+  signal per line.
+
+  The follower may be stopped and started again. Stopping moves it back
+  to the thread that started it from within the worker thread before the
+  worker quits, and the tailer reopens the log when next polled, resuming
+  where it stopped.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  receivedLines = Signal(list)
+  receivedEvents = Signal(list)
+  _stopping = Signal()
+
+  def __init__(self, logDir: str = None, **kwargs) -> None:
+    QObject.__init__(self)
+    if logDir is None:
+      logDir = Settings.getLogDir()
+    self._tailer = LogTailer(logDir, **kwargs)
+    self._parser = LogParser()
+    self._thread = None
+    self._home = None
+    self._timer = None
+    self._stopping.connect(self._finish)
+
+  def getTailer(self) -> LogTailer:
+    """Getter-function for the underlying tailer"""
+    return self._tailer
+
+  def getParser(self) -> LogParser:
+    """Getter-function for the parser classifying the lines read"""
+    return self._parser
+
+  def start(self) -> NoReturn:
+    """Starts following the log on a worker thread"""
+    if self._thread is not None:
+      return
+    self._home = QThread.currentThread()
+    self._thread = QThread()
+    self.moveToThread(self._thread)
+    self._thread.started.connect(self._startTimer)
+    self._thread.start()
+
+  def stop(self) -> NoReturn:
+    """Stops following the log and waits for the worker thread"""
+    if self._thread is None:
+      return
+    self._stopping.emit()
+    self._thread.wait()
+    self._thread = None
+
+  @Slot()
+  def _startTimer(self) -> NoReturn:
+    """Creates the poll timer in the worker thread"""
+    self._timer = QTimer()
+    self._timer.setInterval(Settings.pollInterval)
+    self._timer.timeout.connect(self.poll)
+    self._timer.start()
+    self.poll()
+
+  @Slot()
+  def _finish(self) -> NoReturn:
+    """Stops the poll timer, closes the log and moves back to the thread
+    that started the follower before quitting the worker thread. This
+    runs in the worker thread, as only the thread of an object may move
+    it."""
+    if self._timer is not None:
+      self._timer.stop()
+      self._timer = None
+    self._tailer.close()
+    self.moveToThread(self._home)
+    self._thread.quit()
+
+  @Slot()
+  def poll(self) -> NoReturn:
+    """Reads the lines appended since the previous poll"""
+    for lines in self._tailer.iterChunks():
+      self.receivedLines.emit(lines)
+      events = self._parser.parseLines(lines)
+      if events:
+        self.receivedEvents.emit(events)
+
+  def connectLogWidget(self, logWidget: object) -> NoReturn:
+    """Streams the lines received into the 'tellMe' method on the given
+    log widget. The connection is made to a slot on the widget such that
+    the lines are delivered in the GUI thread."""
+    self.receivedLines.connect(getattr(logWidget, 'tellMeAll'))
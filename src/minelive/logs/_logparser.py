@@ -0,0 +1,119 @@
+"""LogParser classifies lines from the server log into typed events using
+a single pattern compiled once."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import re
+
+from minelive.logs import EventKind, LogEvent
+
+_deathMessages = [
+  'was slain by', 'was shot by', 'was killed by', 'was blown up by',
+  'was fireballed by', 'was squashed by', 'was impaled by',
+  'was pummeled by', 'was stung to death', 'was poked to death',
+  'was pricked to death', 'was struck by lightning', 'was squished',
+  'was frozen to death', 'was obliterated by', 'was skewered by',
+  'was roasted in dragon', 'was doomed to fall', 'was impaled on',
+  'drowned', 'fell from', 'fell off', 'fell out of the world',
+  'fell while', 'fell too far', 'hit the ground too hard',
+  'burned to death', 'blew up', 'went up in flames', 'went off with',
+  'walked into', 'tried to swim in lava', 'starved to death',
+  'suffocated in a wall', 'experienced kinetic energy', 'froze to death',
+  'withered away', 'discovered the floor was lava', 'died',
+  'didn\'t want to live', 'left the confines of this world',
+]
+
+#  Only headers from these threads and levels can carry events. Lines
+#  with any other header fail on the first few characters after the time
+#  stamp.
+_header = r"""
+\n\[(?P<time>\d\d:\d\d:\d\d)\]\ \[
+(?:Server\ thread/(?:INFO|WARN|ERROR)|Server\ Watchdog/(?:FATAL|ERROR))
+\](?:\ \[[^\]\n]*\])?:\ """
+
+_body = r"""
+(?:
+  (?:\[Not\ Secure\]\ )?
+  (?P<chat><(?P<chatSubject>[^>\n]*)>\ (?P<chatDetail>.*))
+| (?P<lag>Can't\ keep\ up!\ Is\ the\ server\ overloaded\?\ Running
+    \ (?P<lagSubject>\d+)ms\ or\ (?P<lagDetail>\d+)\ ticks\ behind)
+| (?P<crash>(?P<crashSubject>)
+    (?:This\ crash\ report\ has\ been\ saved\ to:\ )?
+    (?P<crashDetail>(?<=to:\ ).*|Encountered\ an\ unexpected\ exception.*
+    |A\ single\ server\ tick\ took\ .*|Preparing\ crash\ report.*))
+| (?P<subject>[\w.]+)\ (?:
+    (?P<join>joined\ the\ game)
+  | (?P<leave>left\ the\ game)
+  | (?P<advancement>has\ (?:made\ the\ advancement|completed\ the\ challenge
+      |reached\ the\ goal)\ \[(?P<advancementDetail>[^\]\n]*)\])
+  | (?P<death>(?:%s).*)
+  )
+)$"""
+
+_pattern = re.compile(
+  _header + _body % '|'.join(re.escape(d) for d in _deathMessages),
+  re.MULTILINE | re.VERBOSE)
+
+
+def _createDispatch() -> dict[str, tuple]:
+  """Creates the table mapping the name of the last group closed in a
+  match to the kind of event and the indices of its subject and detail
+  groups."""
+  groups = _pattern.groupindex
+  dispatch = {}
+  for kind in EventKind:
+    name = kind.name.lower()
+    subject = groups.get('%sSubject' % name, groups['subject'])
+    detail = groups.get('%sDetail' % name, groups[name])
+    dispatch[name] = (kind, subject, detail)
+  return dispatch
+
+
+class LogParser:
+  """LogParser classifies lines from the server log into typed events.
+  All patterns are compiled once into a single pattern with named groups
+  in which each alternative closes with a group named after the kind of
+  event. A batch of lines is classified by scanning the joined text once,
+  such that lines carrying no event cost only a failed match on their
+  header.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  _dispatch = _createDispatch()
+
+  def __init__(self, ) -> None:
+    self._lineCount = 0
+    self._eventCount = 0
+
+  def parseText(self, text: str) -> list[LogEvent]:
+    """Returns the events found in the given text of newline separated
+    lines."""
+    dispatch = self._dispatch
+    new = tuple.__new__
+    events = []
+    append = events.append
+    for match in _pattern.finditer('\n%s' % text):
+      kind, subject, detail = dispatch[match.lastgroup]
+      append(new(LogEvent, (kind, *match.group(1, subject, detail))))
+    self._eventCount += len(events)
+    return events
+
+  def parseLines(self, lines: list[str]) -> list[LogEvent]:
+    """Returns the events found in the given lines"""
+    self._lineCount += len(lines)
+    return self.parseText('\n'.join(lines))
+
+  def parseLine(self, line: str) -> LogEvent | None:
+    """Returns the event on the given line or None if the line carries no
+    event."""
+    events = self.parseLines([line])
+    return events[0] if events else None
+
+  def getLineCount(self) -> int:
+    """Getter-function for the number of lines parsed"""
+    return self._lineCount
+
+  def getEventCount(self) -> int:
+    """Getter-function for the number of events found"""
+    return self._eventCount
@@ -0,0 +1,193 @@
+"""LogTailer follows the latest.log file of a running minecraft server
+reading only the bytes appended since the previous poll."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import gzip
+import os
+import re
+from typing import Iterator, BinaryIO
+
+from worktoy.core import maybe
+
+from minelive.logs import Settings
+
+_archivePattern = re.compile(r'^(\d{4}-\d{2}-\d{2})-(\d+)\.log\.gz$')
+
+
+class LogTailer:
+  """LogTailer follows the latest.log file of a running minecraft server
+  reading only the bytes appended since the previous poll. The file is
+  read in chunks of Settings.chunkSize bytes and split into lines in a
+  single pass per chunk. A partial line at the end of a chunk is held back
+  until the line is completed.
+
+  When the server rolls the log over to a gzipped archive named
+  YYYY-MM-DD-n.log.gz, any lines not yet read from the previous log are
+  recovered from the archive before following the new latest.log.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  @staticmethod
+  def _archiveKey(fileName: str) -> tuple[str, int]:
+    """Returns the sort key of the given archive name"""
+    match = _archivePattern.match(fileName)
+    return match.group(1), int(match.group(2))
+
+  def __init__(self, logDir: str, **kwargs) -> None:
+    self._logDir = logDir
+    chunkSize = kwargs.get('chunkSize', None)
+    self._chunkSize = maybe(chunkSize, Settings.chunkSize)
+    self._fromStart = kwargs.get('fromStart', True)
+    self._file = None
+    self._identity = None
+    self._offset = 0
+    self._remainder = b''
+    self._lineCount = 0
+    self._byteCount = 0
+    self._rollOverCount = 0
+
+  def _getLatestPath(self) -> str:
+    """Getter-function for the path to the latest log"""
+    return os.path.join(self._logDir, Settings.latestLogName)
+
+  def _getArchivePath(self) -> str | None:
+    """Getter-function for the path to the most recent archive. Returns
+    None if no archive exists."""
+    try:
+      names = [n for n in os.listdir(self._logDir)
+               if _archivePattern.match(n)]
+    except FileNotFoundError:
+      return None
+    if not names:
+      return None
+    return os.path.join(self._logDir, max(names, key=self._archiveKey))
+
+  def _open(self, ) -> bool:
+    """Opens the latest log. Returns False if the file does not exist
+    yet. If it is the log read before the tailer was closed and has not
+    been truncated, reading resumes where it stopped."""
+    try:
+      self._file = open(self._getLatestPath(), 'rb', buffering=0)
+    except FileNotFoundError:
+      return False
+    stat = os.fstat(self._file.fileno())
+    identity = (stat.st_dev, stat.st_ino)
+    if identity != self._identity or stat.st_size < self._offset:
+      self._identity = identity
+      self._offset = 0 if self._fromStart else stat.st_size
+      self._remainder = b''
+    self._fromStart = True
+    self._file.seek(self._offset)
+    return True
+
+  def _hasRolledOver(self) -> bool:
+    """Checks if the latest log has been replaced or truncated since it
+    was opened."""
+    try:
+      stat = os.stat(self._getLatestPath())
+    except FileNotFoundError:
+      return False
+    if (stat.st_dev, stat.st_ino) != self._identity:
+      return True
+    return True if stat.st_size < self._offset else False
+
+  def _readFrom(self, file: BinaryIO) -> Iterator[list[str]]:
+    """Reads the given file from its current position to the end,
+    yielding a list of complete lines for each chunk read."""
+    chunkSize = self._chunkSize
+    while True:
+      chunk = file.read(chunkSize)
+      if not chunk:
+        return
+      self._offset += len(chunk)
+      self._byteCount += len(chunk)
+      lines = self._splitChunk(chunk)
+      if lines:
+        yield lines
+
+  def _splitChunk(self, chunk: bytes) -> list[str]:
+    """Splits the chunk into complete lines holding back any incomplete
+    line at the end."""
+    if self._remainder:
+      chunk = self._remainder + chunk
+    cut = chunk.rfind(b'\n')
+    if cut < 0:
+      self._remainder = chunk
+      return []
+    self._remainder = chunk[cut + 1:]
+    text = chunk[:cut].decode(Settings.encoding, 'replace')
+    if '\r' in text:
+      text = text.replace('\r\n', '\n')
+    lines = text.split('\n')
+    self._lineCount += len(lines)
+    return lines
+
+  def _drainPrevious(self) -> Iterator[list[str]]:
+    """Yields the lines written to the previous log after the most recent
+    poll. If the still open file handle has been truncated, the lines are
+    recovered from the most recent archive."""
+    size = os.fstat(self._file.fileno()).st_size
+    if size >= self._offset:
+      yield from self._readFrom(self._file)
+    else:
+      archivePath = self._getArchivePath()
+      if archivePath is not None:
+        with gzip.open(archivePath, 'rb') as archive:
+          archive.seek(self._offset)
+          yield from self._readFrom(archive)
+    if self._remainder:
+      self._lineCount += 1
+      yield [self._remainder.decode(Settings.encoding, 'replace')]
+    self.close()
+    self._rollOverCount += 1
+
+  def iterChunks(self, ) -> Iterator[list[str]]:
+    """Yields lists of the lines appended to the log since the previous
+    call. Each list contains the complete lines of one chunk."""
+    if self._file is None and not self._open():
+      return
+    if self._hasRolledOver():
+      yield from self._drainPrevious()
+      if not self._open():
+        return
+    yield from self._readFrom(self._file)
+
+  def poll(self, ) -> list[str]:
+    """Returns every line appended to the log since the previous call"""
+    out = []
+    for lines in self.iterChunks():
+      out.extend(lines)
+    return out
+
+  def close(self, ) -> None:
+    """Closes the log file. The position read is kept, such that polling
+    again reopens the log and resumes from there."""
+    if self._file is not None:
+      self._file.close()
+    self._file = None
+
+  def getOffset(self) -> int:
+    """Getter-function for the byte offset in the current log"""
+    return self._offset
+
+  def getLineCount(self) -> int:
+    """Getter-function for the number of lines read in total"""
+    return self._lineCount
+
+  def getByteCount(self) -> int:
+    """Getter-function for the number of bytes read in total"""
+    return self._byteCount
+
+  def getRollOverCount(self) -> int:
+    """Getter-function for the number of roll overs followed"""
+    return self._rollOverCount
+
+  def __enter__(self) -> LogTailer:
+    """Implementation of context manager"""
+    return self
+
+  def __exit__(self, *_) -> None:
+    """Closes the log file on exit"""
+    self.close()
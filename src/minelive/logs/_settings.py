@@ -0,0 +1,38 @@
+"""The Settings class provides the settings used by the logs package."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import os
+
+
+class Settings:
+  """The Settings class provides the settings used by the logs package.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  serverDirEnv = 'MINELIVE_SERVER_DIR'
+  logFolderName = 'logs'
+  latestLogName = 'latest.log'
+  archiveSuffix = '.log.gz'
+
+  chunkSize = 1 << 20
+  pollInterval = 250
+  encoding = 'utf-8'
+
+  @classmethod
+  def getServerDir(cls) -> str:
+    """Getter-function for the server directory given by the environment
+    variable."""
+    fromEnv = os.getenv(cls.serverDirEnv)
+    if fromEnv:
+      return fromEnv
+    e = """Environment variable %s not recognized!""" % cls.serverDirEnv
+    raise KeyError(e)
+
+  @classmethod
+  def getLogDir(cls, serverDir: str = None) -> str:
+    """Getter-function for the directory containing the log files"""
+    if serverDir is None:
+      serverDir = cls.getServerDir()
+    return os.path.join(serverDir, cls.logFolderName)
@@ -3,6 +3,10 @@
 #  Copyright (c) 2023 Asger Jon Vistisen
 from __future__ import annotations
 
+from PySide6.QtGui import QCloseEvent
+
+from minelive.logs import LogFollower, Settings
+from workside.widgets import LogWidget
 from workside.windows import MainWindow
 
 
@@ -11,3 +15,51 @@ class MineWindow(MainWindow):
 
   def __init__(self) -> None:
     super().__init__()
+    self._logWidget = None
+    self._logFollower = None
+
+  def _createLogWidget(self) -> None:
+    """Creator-function for the log widget showing the server log"""
+    self._logWidget = LogWidget()
+    self._logWidget.setupWidgets()
+    self._logWidget.setupActions()
+
+  def _getLogWidget(self) -> LogWidget:
+    """Getter-function for the log widget showing the server log"""
+    if self._logWidget is None:
+      self._createLogWidget()
+      return self._getLogWidget()
+    if isinstance(self._logWidget, LogWidget):
+      return self._logWidget
+    raise TypeError
+
+  def _createLogFollower(self) -> None:
+    """Creator-function for the log follower. If the server directory is
+    not set in the environment, no log is followed."""
+    try:
+      logDir = Settings.getLogDir()
+    except KeyError:
+      return
+    self._logFollower = LogFollower(logDir)
+    self._logFollower.connectLogWidget(self._getLogWidget())
+    self.getStatusMonitor().addLogBuffer(
+      self._getLogWidget().getLogBuffer())
+
+  def setupWidgets(self) -> None:
+    """Adds the log widget before setting up the remaining widgets"""
+    self._getBaseLayout().addWidget(self._getLogWidget(), 2, 0, 1, 2)
+    MainWindow.setupWidgets(self)
+
+  def show(self) -> None:
+    """Starts following the server log after showing the window"""
+    MainWindow.show(self)
+    if self._logFollower is None:
+      self._createLogFollower()
+    if self._logFollower is not None:
+      self._logFollower.start()
+
+  def closeEvent(self, event: QCloseEvent) -> None:
+    """Stops following the server log before closing"""
+    if self._logFollower is not None:
+      self._logFollower.stop()
+    MainWindow.closeEvent(self, event)
@@ -0,0 +1,35 @@
+"""The nbt package reads the NBT files of minecraft, such as level.dat and
+the playerdata files, decoding only the tags requested."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from moreworktoy import lazyExports
+
+if TYPE_CHECKING:
+  from ._settings import Settings
+  from ._nbterror import NbtError
+  from ._tagtype import TagType
+  from ._nbtreader import decodeString, numericArray, skipPayload
+  from ._nbtreader import readPayload, parsePath, readNbt
+  from ._nbtreader import NbtCompound, NbtList
+  from ._nbtfile import decompressNbt, loadNbt, NbtFileCache
+
+__getattr__, __dir__ = lazyExports(__name__, {
+  'Settings': '._settings',
+  'NbtError': '._nbterror',
+  'TagType': '._tagtype',
+  'decodeString': '._nbtreader',
+  'numericArray': '._nbtreader',
+  'skipPayload': '._nbtreader',
+  'readPayload': '._nbtreader',
+  'parsePath': '._nbtreader',
+  'readNbt': '._nbtreader',
+  'NbtCompound': '._nbtreader',
+  'NbtList': '._nbtreader',
+  'decompressNbt': '._nbtfile',
+  'loadNbt': '._nbtfile',
+  'NbtFileCache': '._nbtfile',
+})
@@ -0,0 +1,11 @@
+"""NbtError is raised when data is not valid NBT."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+
+class NbtError(ValueError):
+  """NbtError is raised when data is not valid NBT, such as when a tag
+  type is unknown, a length is negative or the data ends early.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
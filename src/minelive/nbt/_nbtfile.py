@@ -0,0 +1,79 @@
+"""The NBT file functions read NBT files such as level.dat and the
+playerdata files."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import os
+import zlib
+from collections import OrderedDict
+from typing import NoReturn
+
+from minelive.nbt import Settings, NbtError, NbtCompound, readNbt
+
+
+def decompressNbt(raw: bytes) -> bytes:
+  """Returns the NBT data decompressed. Files written by the game are
+  gzip compressed, chunks are usually zlib compressed and some tools
+  write uncompressed files, which are recognized by their headers. The
+  gzip data is decompressed by zlib directly, which avoids the file-like
+  overhead of the gzip module."""
+  try:
+    if raw[:2] == b'\x1f\x8b':
+      return zlib.decompress(raw, 31)
+    if raw[:1] == b'\x78':
+      return zlib.decompress(raw)
+  except zlib.error as exception:
+    raise NbtError("""Unable to decompress NBT data!""") from exception
+  return raw
+
+
+def loadNbt(path: str) -> NbtCompound:
+  """Reads the NBT file and returns a lazy view of its root compound"""
+  with open(path, 'rb') as file:
+    return readNbt(decompressNbt(file.read()))
+
+
+class NbtFileCache:
+  """NbtFileCache keeps the root compounds of recently read NBT files,
+  such that refreshing many playerdata files only reads and decompresses
+  those changed since the last refresh. A file is taken to be unchanged
+  while its modification time and size are. Since the compounds are lazy
+  views, the values decoded from a cached file are also kept. The cache
+  holds at most Settings.fileCacheSize files, evicting the least recently
+  used.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  def __init__(self, size: int = None) -> None:
+    self._size = Settings.fileCacheSize if size is None else size
+    self._files = OrderedDict()
+    self._hits = 0
+    self._misses = 0
+
+  def load(self, path: str) -> NbtCompound:
+    """Returns the root compound of the file, reading it again only if it
+    has changed"""
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    entry = self._files.get(path)
+    if entry is not None and entry[0] == key:
+      self._hits += 1
+      self._files.move_to_end(path)
+      return entry[1]
+    self._misses += 1
+    root = loadNbt(path)
+    self._files[path] = (key, root)
+    self._files.move_to_end(path)
+    while len(self._files) > self._size:
+      self._files.popitem(last=False)
+    return root
+
+  def getStats(self) -> dict[str, int]:
+    """Getter-function for the counters of the cache"""
+    return dict(files=len(self._files), hits=self._hits,
+                misses=self._misses)
+
+  def clear(self) -> NoReturn:
+    """Forgets every file"""
+    self._files.clear()
@@ -0,0 +1,424 @@
+"""The NBT reader decodes tags lazily from the decompressed buffer."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import re
+import struct
+import sys
+from array import array
+from functools import lru_cache
+from typing import Any, Iterator
+
+from minelive.nbt import Settings, NbtError, TagType
+
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+END, BYTE, SHORT, INT, LONG, FLOAT, DOUBLE = range(7)
+BYTE_ARRAY, STRING, LIST, COMPOUND, INT_ARRAY, LONG_ARRAY = range(7, 13)
+
+_ushort = struct.Struct('>H')
+_int = struct.Struct('>i')
+_scalars = {
+  BYTE: struct.Struct('>b'),
+  SHORT: struct.Struct('>h'),
+  INT: _int,
+  LONG: struct.Struct('>q'),
+  FLOAT: struct.Struct('>f'),
+  DOUBLE: struct.Struct('>d'),
+}
+_sizes = {tagType: s.size for (tagType, s) in _scalars.items()}
+_arrayItems = {BYTE_ARRAY: BYTE, INT_ARRAY: INT, LONG_ARRAY: LONG}
+_dtypes = {BYTE: '>i1', SHORT: '>i2', INT: '>i4', LONG: '>i8',
+           FLOAT: '>f4', DOUBLE: '>f8'}
+_typecodes = {BYTE: 'b', SHORT: 'h', INT: 'i', LONG: 'q', FLOAT: 'f',
+              DOUBLE: 'd'}
+_pathPart = re.compile(r'(?:^|\.)([^.\[\]]+)|\[(-?\d+)]')
+_missing = object()
+
+
+def decodeString(data: bytes, offset: int, length: int) -> str:
+  """Decodes the string of the given length at the offset. NBT strings
+  are modified UTF-8, which differs from UTF-8 only in the encoding of
+  null characters and characters outside the basic multilingual plane.
+  Those are rare, so strict UTF-8 is tried first."""
+  raw = data[offset:offset + length]
+  try:
+    return raw.decode(Settings.encoding)
+  except UnicodeDecodeError:
+    raw = raw.replace(b'\xc0\x80', b'\0')
+  try:
+    text = raw.decode('utf-8', 'surrogatepass')
+  except UnicodeDecodeError as exception:
+    msg = """Invalid modified UTF-8 string at offset %d!"""
+    raise NbtError(msg % offset) from exception
+  return text.encode('utf-16', 'surrogatepass').decode('utf-16', 'replace')
+
+
+def numericArray(data: bytes, offset: int, count: int,
+                 itemType: int) -> Any:
+  """Returns the count big endian numbers of the item type at the offset.
+  If numpy is available, the result is a read-only view of the buffer
+  without copying. Otherwise, the numbers are copied to an array in the
+  native byte order."""
+  if count < 0:
+    raise NbtError("""Negative array length %d!""" % count)
+  end = offset + count * _sizes[itemType]
+  if end > len(data):
+    raise NbtError("""Array exceeds the end of the data!""")
+  if numpy is not None:
+    return numpy.frombuffer(data, _dtypes[itemType], count, offset)
+  values = array(_typecodes[itemType], data[offset:end])
+  if sys.byteorder == 'little':
+    values.byteswap()
+  return values
+
+
+def _checkEnd(data: bytes, end: int) -> int:
+  """Returns the end offset after checking that it is within the data"""
+  if end > len(data):
+    raise NbtError("""Tag exceeds the end of the data!""")
+  return end
+
+
+def _checkCount(count: int) -> int:
+  """Returns the length of an array or list after checking that it is not
+  negative"""
+  if count < 0:
+    raise NbtError("""Negative length %d!""" % count)
+  return count
+
+
+def skipPayload(data: bytes, offset: int, tagType: int,
+                depth: int = 0) -> int:
+  """Returns the offset following the payload of the tag type at the
+  offset, without decoding it. Raises NbtError if a length is negative or
+  the payload exceeds the end of the data, such that the offset returned
+  is always further ahead and within the data."""
+  size = _sizes.get(tagType)
+  if size is not None:
+    return _checkEnd(data, offset + size)
+  if tagType == STRING:
+    return _checkEnd(data, offset + 2 + _ushort.unpack_from(data, offset)[0])
+  itemType = _arrayItems.get(tagType)
+  if itemType is not None:
+    count = _checkCount(_int.unpack_from(data, offset)[0])
+    return _checkEnd(data, offset + 4 + count * _sizes[itemType])
+  if depth > Settings.maxDepth:
+    raise NbtError("""Tags nested deeper than %d!""" % Settings.maxDepth)
+  if tagType == LIST:
+    itemType = data[offset]
+    count = _checkCount(_int.unpack_from(data, offset + 1)[0])
+    offset += 5
+    size = _sizes.get(itemType)
+    if size is not None:
+      return _checkEnd(data, offset + count * size)
+    for _ in range(count):
+      offset = skipPayload(data, offset, itemType, depth + 1)
+    return offset
+  if tagType == COMPOUND:
+    while True:
+      tagType = data[offset]
+      if tagType == END:
+        return offset + 1
+      offset += 3 + _ushort.unpack_from(data, offset + 1)[0]
+      offset = skipPayload(data, _checkEnd(data, offset), tagType, depth + 1)
+  raise NbtError("""Unknown tag type %d!""" % tagType)
+
+
+def readPayload(data: bytes, offset: int, tagType: int) -> Any:
+  """Decodes the payload of the tag type at the offset. Compounds and
+  lists are returned as lazy views decoding their items when accessed."""
+  scalar = _scalars.get(tagType)
+  if scalar is not None:
+    return scalar.unpack_from(data, offset)[0]
+  if tagType == STRING:
+    length = _ushort.unpack_from(data, offset)[0]
+    _checkEnd(data, offset + 2 + length)
+    return decodeString(data, offset + 2, length)
+  if tagType == COMPOUND:
+    return NbtCompound(data, offset)
+  if tagType == LIST:
+    return NbtList(data, offset)
+  itemType = _arrayItems.get(tagType)
+  if itemType is not None:
+    count = _int.unpack_from(data, offset)[0]
+    return numericArray(data, offset + 4, count, itemType)
+  raise NbtError("""Unknown tag type %d!""" % tagType)
+
+
+@lru_cache(maxsize=256)
+def parsePath(path: str) -> tuple[str | int, ...]:
+  """Parses the path into the names and indices it consists of. Names are
+  separated by dots and indices are given in brackets, for example
+  'Inventory[0].id'."""
+  parts, position = [], 0
+  for match in _pathPart.finditer(path):
+    if match.start() != position:
+      break
+    name, index = match.groups()
+    parts.append(name if index is None else int(index))
+    position = match.end()
+  if not parts or position != len(path):
+    raise KeyError("""Invalid path: '%s'!""" % path)
+  return tuple(parts)
+
+
+class _NbtView:
+  """Shared path query of the lazy views"""
+
+  __slots__ = ()
+
+  def query(self, path: str, default: Any = _missing) -> Any:
+    """Returns the value at the path, such as 'Data.Player.Pos' or
+    'Inventory[0].id', decoding only the tags on the path. Only
+    compounds, lists and arrays are stepped into, such that indexing a
+    string or number is a missing path. Raises KeyError if the path does
+    not exist, unless a default is given."""
+    value = self
+    try:
+      for part in parsePath(path):
+        if not isinstance(value, _containers):
+          raise KeyError(part)
+        value = value[part]
+    except (KeyError, IndexError, TypeError):
+      if default is _missing:
+        raise KeyError(path) from None
+      return default
+    return value
+
+
+_containers = (_NbtView, array)
+if numpy is not None:
+  _containers += (numpy.ndarray,)
+
+
+class NbtCompound(_NbtView):
+  """NbtCompound is a lazy read-only view of a compound tag. Entries are
+  located by scanning the buffer only as far as needed to find the name
+  requested, skipping the payloads of the other entries without decoding
+  them. The names seen are indexed, such that each part of the compound
+  is scanned at most once. Nested compounds and lists are views of the
+  same buffer and are decoded only when accessed in turn.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  __slots__ = ('_data', '_index', '_values', '_scan', '_resume')
+
+  def __init__(self, data: bytes, offset: int) -> None:
+    self._data = data
+    self._index = {}
+    self._values = {}
+    self._scan = offset
+    self._resume = None
+
+  def _find(self, name: str | None) -> tuple[int, int] | None:
+    """Returns the tag type and payload offset of the named entry,
+    scanning further if it has not been seen. The payload of the entry
+    found is skipped only when scanning resumes, as the caller is likely
+    to decode it."""
+    entry = self._index.get(name)
+    if entry is not None or self._scan is None:
+      return entry
+    data, offset = self._data, self._scan
+    try:
+      if self._resume is not None:
+        tagType, offset = self._resume
+        offset = skipPayload(data, offset, tagType)
+        self._resume = None
+      while True:
+        tagType = data[offset]
+        if tagType == END:
+          self._scan = None
+          return None
+        length = _ushort.unpack_from(data, offset + 1)[0]
+        _checkEnd(data, offset + 3 + length)
+        key = decodeString(data, offset + 3, length)
+        offset += 3 + length
+        self._index[key] = entry = (tagType, offset)
+        if key == name:
+          self._scan, self._resume = offset, entry
+          return entry
+        offset = skipPayload(data, offset, tagType)
+    except (IndexError, struct.error) as exception:
+      raise NbtError("""Compound exceeds the end of the data!""") \
+        from exception
+
+  def __getitem__(self, name: str) -> Any:
+    """Returns the value of the named entry"""
+    value = self._values.get(name, _missing)
+    if value is not _missing:
+      return value
+    entry = self._find(name)
+    if entry is None:
+      raise KeyError(name)
+    try:
+      value = readPayload(self._data, entry[1], entry[0])
+    except (IndexError, struct.error) as exception:
+      raise NbtError("""Tag %s exceeds the end of the data!""" % name) \
+        from exception
+    if entry[0] in (COMPOUND, LIST):
+      self._values[name] = value
+    return value
+
+  def get(self, name: str, default: Any = None) -> Any:
+    """Returns the value of the named entry or the default"""
+    try:
+      return self[name]
+    except KeyError:
+      return default
+
+  def getType(self, name: str) -> TagType:
+    """Getter-function for the tag type of the named entry"""
+    entry = self._find(name)
+    if entry is None:
+      raise KeyError(name)
+    return TagType(entry[0])
+
+  def keys(self) -> list[str]:
+    """Returns the names of the entries, scanning the whole compound"""
+    self._find(None)
+    return [*self._index]
+
+  def values(self) -> list[Any]:
+    """Returns the values of the entries"""
+    return [self[name] for name in self.keys()]
+
+  def items(self) -> list[tuple[str, Any]]:
+    """Returns the names and values of the entries"""
+    return [(name, self[name]) for name in self.keys()]
+
+  def toPython(self) -> dict[str, Any]:
+    """Decodes the compound and every tag nested in it into dictionaries
+    and lists. Arrays remain views of the buffer."""
+    return {name: _toPython(value) for (name, value) in self.items()}
+
+  def __contains__(self, name: str) -> bool:
+    """Implementation of membership test"""
+    return self._find(name) is not None
+
+  def __iter__(self) -> Iterator[str]:
+    """Implementation of iteration"""
+    return iter(self.keys())
+
+  def __len__(self) -> int:
+    """The number of entries"""
+    return len(self.keys())
+
+  def __repr__(self) -> str:
+    """Code representation"""
+    return 'NbtCompound(%s)' % ', '.join(self.keys())
+
+
+class NbtList(_NbtView):
+  """NbtList is a lazy read-only view of a list tag. Items of fixed size
+  are decoded directly from their offset. The offsets of other items are
+  found by skipping through the list once, when an item is first
+  accessed. Lists of numbers may be returned as a single array with
+  'toArray'.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  __slots__ = ('_data', '_itemType', '_count', '_start', '_offsets',
+               '_values')
+
+  def __init__(self, data: bytes, offset: int) -> None:
+    self._data = data
+    self._itemType = data[offset]
+    self._count = _checkCount(_int.unpack_from(data, offset + 1)[0])
+    self._start = _checkEnd(data, offset + 5)
+    size = _sizes.get(self._itemType)
+    if size is not None:
+      _checkEnd(data, self._start + self._count * size)
+    self._offsets = None
+    self._values = {}
+
+  def getItemType(self) -> TagType:
+    """Getter-function for the tag type of the items"""
+    return TagType(self._itemType)
+
+  def _getOffsets(self) -> list[int]:
+    """Getter-function for the offsets of the items of variable size"""
+    if self._offsets is None:
+      offsets, offset = [], self._start
+      for _ in range(self._count):
+        offsets.append(offset)
+        offset = skipPayload(self._data, offset, self._itemType)
+      self._offsets = offsets
+    return self._offsets
+
+  def __getitem__(self, index: int) -> Any:
+    """Returns the item at the index"""
+    if index < 0:
+      index += self._count
+    if not 0 <= index < self._count:
+      raise IndexError(index)
+    value = self._values.get(index, _missing)
+    if value is not _missing:
+      return value
+    size = _sizes.get(self._itemType)
+    try:
+      if size is not None:
+        offset = self._start + index * size
+      else:
+        offset = self._getOffsets()[index]
+      value = readPayload(self._data, offset, self._itemType)
+    except (IndexError, struct.error) as exception:
+      raise NbtError("""List exceeds the end of the data!""") \
+        from exception
+    if self._itemType in (COMPOUND, LIST):
+      self._values[index] = value
+    return value
+
+  def toArray(self) -> Any:
+    """Returns the items of a list of numbers as an array, which is a
+    view of the buffer if numpy is available"""
+    if self._itemType not in _sizes:
+      if self._count:
+        msg = """Expected list of numbers, but received list of %s!"""
+        raise TypeError(msg % TagType(self._itemType))
+      return numericArray(self._data, self._start, 0, BYTE)
+    return numericArray(self._data, self._start, self._count,
+                        self._itemType)
+
+  def toPython(self) -> list[Any]:
+    """Decodes the list and every tag nested in it"""
+    return [_toPython(value) for value in self]
+
+  def __iter__(self) -> Iterator[Any]:
+    """Implementation of iteration"""
+    for index in range(self._count):
+      yield self[index]
+
+  def __len__(self) -> int:
+    """The number of items"""
+    return self._count
+
+  def __repr__(self) -> str:
+    """Code representation"""
+    return 'NbtList(%s, %d)' % (TagType(self._itemType), self._count)
+
+
+def _toPython(value: Any) -> Any:
+  """Decodes lazy views recursively"""
+  if isinstance(value, (NbtCompound, NbtList)):
+    return value.toPython()
+  return value
+
+
+def readNbt(data: bytes) -> NbtCompound:
+  """Returns a lazy view of the root compound of the uncompressed NBT
+  data. The data should be bytes, as the views keep offsets into it.
+  Other buffers are copied once."""
+  if not isinstance(data, bytes):
+    data = bytes(data)
+  if not data or data[0] != COMPOUND:
+    raise NbtError("""Expected root compound tag!""")
+  try:
+    length = _ushort.unpack_from(data, 1)[0]
+  except struct.error as exception:
+    raise NbtError("""Data ends in the root tag!""") from exception
+  return NbtCompound(data, 3 + length)
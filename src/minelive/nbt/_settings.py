@@ -0,0 +1,14 @@
+"""The Settings class provides the settings used by the nbt package."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+
+class Settings:
+  """The Settings class provides the settings used by the nbt package.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  encoding = 'utf-8'
+  maxDepth = 512
+  fileCacheSize = 1024
@@ -0,0 +1,31 @@
+"""TagType enumerates the types of tags in NBT data."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+from enum import IntEnum
+
+
+class TagType(IntEnum):
+  """Enum specifying the types of tags in NBT data"""
+  END = 0
+  BYTE = 1
+  SHORT = 2
+  INT = 3
+  LONG = 4
+  FLOAT = 5
+  DOUBLE = 6
+  BYTE_ARRAY = 7
+  STRING = 8
+  LIST = 9
+  COMPOUND = 10
+  INT_ARRAY = 11
+  LONG_ARRAY = 12
+
+  def __repr__(self) -> str:
+    """Code representation"""
+    return 'TagType.%s' % self.name
+
+  def __str__(self) -> str:
+    """String representation"""
+    return self.name.lower()
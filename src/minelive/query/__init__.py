@@ -0,0 +1,44 @@
+"""The query package polls the status of many servers through the server
+list ping and the GameSpy4 query protocol."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from moreworktoy import lazyExports
+
+if TYPE_CHECKING:
+  from ._settings import Settings
+  from ._queryerror import QueryError
+  from ._slp import encodeVarInt, decodeVarInt, readVarInt
+  from ._slp import encodeString, encodePacket, encodeHandshake
+  from ._slp import flattenText, requestStatus
+  from ._queryprotocol import HANDSHAKE, STAT
+  from ._queryprotocol import encodeRequest, decodeFullStat, QueryProtocol
+  from ._serversnapshot import ServerSnapshot
+  from ._snapshottable import SnapshotTable
+  from ._serverpoller import ServerPoller
+  from ._fakeserver import FakeMinecraftServer
+
+__getattr__, __dir__ = lazyExports(__name__, {
+  'Settings': '._settings',
+  'QueryError': '._queryerror',
+  'encodeVarInt': '._slp',
+  'decodeVarInt': '._slp',
+  'readVarInt': '._slp',
+  'encodeString': '._slp',
+  'encodePacket': '._slp',
+  'encodeHandshake': '._slp',
+  'flattenText': '._slp',
+  'requestStatus': '._slp',
+  'HANDSHAKE': '._queryprotocol',
+  'STAT': '._queryprotocol',
+  'encodeRequest': '._queryprotocol',
+  'decodeFullStat': '._queryprotocol',
+  'QueryProtocol': '._queryprotocol',
+  'ServerSnapshot': '._serversnapshot',
+  'SnapshotTable': '._snapshottable',
+  'ServerPoller': '._serverpoller',
+  'FakeMinecraftServer': '._fakeserver',
+})
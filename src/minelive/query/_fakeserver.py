@@ -0,0 +1,196 @@
+"""FakeMinecraftServer is a local stand-in answering the server list ping
+and the query protocol."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import struct
+from typing import NoReturn
+
+from minelive.query import Settings, QueryError
+from minelive.query import readVarInt, decodeVarInt, encodeString
+from minelive.query import encodePacket
+from minelive.query import HANDSHAKE, STAT
+
+_request = struct.Struct('>HBi')
+_challenge = struct.Struct('>i')
+
+
+class _QueryEndpoint(asyncio.DatagramProtocol):
+  """Answers the query protocol on behalf of the server"""
+
+  def __init__(self, server: FakeMinecraftServer) -> None:
+    self._server = server
+    self._transport = None
+
+  def connection_made(self, transport: asyncio.DatagramTransport) -> None:
+    """Keeps the transport"""
+    self._transport = transport
+
+  def datagram_received(self, data: bytes, addr: tuple) -> None:
+    """Answers the request"""
+    response = self._server.answerQuery(data)
+    if response is not None:
+      self._transport.sendto(response, addr)
+
+  def close(self) -> NoReturn:
+    """Closes the socket"""
+    if self._transport is not None:
+      self._transport.close()
+
+
+class FakeMinecraftServer:
+  """FakeMinecraftServer is a local stand-in for tests and benchmarks,
+  answering the server list ping on a TCP port and the GameSpy4 query
+  protocol on the UDP port of the same number. The players may be
+  changed while running to exercise the adaptive intervals, and the
+  status replaced through 'setStatus' to exercise malformed replies. A
+  delay in seconds may be given to simulate a slow server, and setting
+  'silent' drops every request to simulate a server being down.
+
+  Use 'start' from a running event loop to listen on the loopback
+  interface. Passing port 0 picks a free port, which 'getPort' returns.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  def __init__(self, motd: str = 'A Minecraft Server', port: int = 0,
+               players: list[str] = None, maxPlayers: int = 20,
+               version: str = '1.21', delay: float = 0.) -> None:
+    self._motd = motd
+    self._port = port
+    self._players = [*(players or ())]
+    self._maxPlayers = maxPlayers
+    self._version = version
+    self._delay = delay
+    self._silent = False
+    self._status = None
+    self._challenge = random.randrange(1 << 30)
+    self._server = None
+    self._query = None
+    self._statusCount = 0
+    self._queryCount = 0
+
+  async def start(self, ) -> int:
+    """Starts listening and returns the port"""
+    loop = asyncio.get_running_loop()
+    self._server = await asyncio.start_server(self._handle, '127.0.0.1',
+                                              self._port)
+    self._port = self._server.sockets[0].getsockname()[1]
+    _, self._query = await loop.create_datagram_endpoint(
+      lambda: _QueryEndpoint(self), local_addr=('127.0.0.1', self._port))
+    return self._port
+
+  async def stop(self, ) -> NoReturn:
+    """Stops listening"""
+    if self._query is not None:
+      self._query.close()
+      self._query = None
+    if self._server is not None:
+      self._server.close()
+      await self._server.wait_closed()
+      self._server = None
+
+  def getPort(self) -> int:
+    """Getter-function for the port listened on"""
+    return self._port
+
+  def setPlayers(self, players: list[str]) -> NoReturn:
+    """Setter-function for the players online"""
+    self._players = [*players]
+
+  def setSilent(self, silent: bool) -> NoReturn:
+    """Setter-function for dropping every request"""
+    self._silent = silent
+
+  def setStatus(self, status: dict | None) -> NoReturn:
+    """Setter-function for the status JSON answered in place of the one
+    built from the players, such as a malformed one. None restores the
+    built one."""
+    self._status = status
+
+  def getStatusCount(self) -> int:
+    """Getter-function for the number of status requests answered"""
+    return self._statusCount
+
+  def getQueryCount(self) -> int:
+    """Getter-function for the number of full statistics answered"""
+    return self._queryCount
+
+  def getStatus(self) -> dict:
+    """Getter-function for the status JSON of the server list ping"""
+    if self._status is not None:
+      return self._status
+    return {
+      'version': {'name': self._version, 'protocol': 767},
+      'players': {
+        'max': self._maxPlayers,
+        'online': len(self._players),
+        'sample': [{'name': name, 'id': '00000000-0000-0000-0000-%012x' % i}
+                   for (i, name) in enumerate(self._players[:12])],
+      },
+      'description': {'text': self._motd},
+      'enforcesSecureChat': True,
+    }
+
+  def getFullStat(self) -> bytes:
+    """Getter-function for the payload of the full statistics"""
+    keyValues = [
+      'hostname', self._motd, 'gametype', 'SMP', 'game_id', 'MINECRAFT',
+      'version', self._version, 'plugins', '', 'map', 'world',
+      'numplayers', str(len(self._players)),
+      'maxplayers', str(self._maxPlayers),
+      'hostport', str(self._port), 'hostip', '127.0.0.1',
+    ]
+    encoding = Settings.encoding
+    return b''.join([
+      b'splitnum\x00\x80\x00',
+      b''.join(field.encode(encoding) + b'\0' for field in keyValues),
+      b'\x00\x01player_\x00\x00',
+      b''.join(name.encode(encoding) + b'\0' for name in self._players),
+      b'\0',
+    ])
+
+  def answerQuery(self, data: bytes) -> bytes | None:
+    """Returns the response to the query request or None to drop it"""
+    if self._silent or len(data) < 7:
+      return None
+    magic, kind, sessionId = _request.unpack_from(data)
+    if magic != 0xfefd:
+      return None
+    header = bytes([kind]) + _challenge.pack(sessionId & 0x0f0f0f0f)
+    if kind == HANDSHAKE:
+      return header + str(self._challenge).encode() + b'\0'
+    if kind == STAT and len(data) >= 11:
+      if _challenge.unpack_from(data, 7)[0] != self._challenge:
+        return None
+      self._queryCount += 1
+      return header + self.getFullStat()
+    return None
+
+  async def _handle(self, reader: asyncio.StreamReader,
+                    writer: asyncio.StreamWriter) -> NoReturn:
+    """Serves one server list ping"""
+    try:
+      while True:
+        length = await readVarInt(reader)
+        data = await reader.readexactly(length)
+        if self._silent:
+          continue
+        packetId, offset = decodeVarInt(data)
+        if packetId == 0 and offset == len(data):
+          if self._delay:
+            await asyncio.sleep(self._delay)
+          self._statusCount += 1
+          status = json.dumps(self.getStatus())
+          writer.write(encodePacket(0, encodeString(status)))
+        elif packetId == 1:
+          writer.write(encodePacket(1, data[offset:]))
+          break
+        await writer.drain()
+    except (EOFError, OSError, QueryError):
+      pass
+    finally:
+      writer.close()
@@ -0,0 +1,11 @@
+"""QueryError is raised when a server answers a poll with invalid data."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+
+class QueryError(ConnectionError):
+  """QueryError is raised when a server answers a poll with data not
+  following the protocol.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
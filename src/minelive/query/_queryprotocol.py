@@ -0,0 +1,186 @@
+"""QueryProtocol requests the full statistics of servers through the
+GameSpy4 UDP query protocol."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import asyncio
+import socket
+import struct
+from typing import NoReturn
+
+from minelive.query import Settings, QueryError
+
+HANDSHAKE, STAT = 9, 0
+
+_header = struct.Struct('>HBi')
+_challenge = struct.Struct('>i')
+_magic = 0xfefd
+_padding = b'\0\0\0\0'
+_kvPrefix = b'splitnum\x00\x80\x00'
+_playerMarker = b'\x00\x00\x01player_\x00\x00'
+
+
+def encodeRequest(kind: int, sessionId: int, challenge: int = None) -> bytes:
+  """Returns the request of the type and session id. Full statistics
+  requests include the challenge token and padding."""
+  data = _header.pack(_magic, kind, sessionId)
+  if challenge is None:
+    return data
+  return data + _challenge.pack(challenge) + _padding
+
+
+def decodeFullStat(data: bytes) -> tuple[dict[str, str], list[str]]:
+  """Decodes the payload of a full statistics response following the type
+  and session id, and returns the key-value section and player names"""
+  if not data.startswith(_kvPrefix):
+    raise QueryError("""Expected full statistics response!""")
+  keyValues, _, players = data[len(_kvPrefix):].partition(_playerMarker)
+  fields = keyValues.decode(Settings.encoding, 'replace').split('\0')
+  stats = dict(zip(fields[0::2], fields[1::2]))
+  names = players.decode(Settings.encoding, 'replace').split('\0')
+  return stats, [name for name in names if name]
+
+
+def _spreadSessionId(count: int) -> int:
+  """Returns a session id for the counter. The server keeps only the low
+  four bits of each byte of the session id, so the 16 bits of the counter
+  are spread over those to keep the ids distinct."""
+  return ((count & 0xf) | (count >> 4 & 0xf) << 8 | (count >> 8 & 0xf) << 16
+          | (count >> 12 & 0xf) << 24)
+
+
+class QueryProtocol(asyncio.DatagramProtocol):
+  """QueryProtocol requests the full statistics of servers through the
+  GameSpy4 UDP query protocol. A single socket serves every server, such
+  that polling many servers does not cost a socket each. Responses are
+  matched to the requests by the session id.
+
+  Each request for statistics needs a challenge token issued by the
+  server, which remains valid for some 30 seconds. The token is kept for
+  Settings.challengeLifetime seconds, such that most polls take one round
+  trip. Use 'open' to bind the socket on the running event loop.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  @classmethod
+  async def open(cls, ) -> QueryProtocol:
+    """Creator-function binding a new protocol on the running loop"""
+    loop = asyncio.get_running_loop()
+    _, protocol = await loop.create_datagram_endpoint(
+      cls, local_addr=('0.0.0.0', 0))
+    return protocol
+
+  def __init__(self, ) -> None:
+    self._transport = None
+    self._waiters = {}
+    self._challenges = {}
+    self._addresses = {}
+    self._count = 0
+    self._requestCount = 0
+    self._errorCount = 0
+
+  def connection_made(self, transport: asyncio.DatagramTransport) -> None:
+    """Keeps the transport"""
+    self._transport = transport
+
+  def datagram_received(self, data: bytes, addr: tuple) -> None:
+    """Completes the request of the session id of the response"""
+    if len(data) < 5:
+      self._errorCount += 1
+      return
+    sessionId, = _challenge.unpack_from(data, 1)
+    waiter = self._waiters.pop(sessionId, None)
+    if waiter is None or waiter.done():
+      return
+    waiter.set_result(data[5:])
+
+  def error_received(self, exception: OSError) -> None:
+    """Counts errors such as unreachable ports, which the requests report
+    by timing out"""
+    self._errorCount += 1
+
+  def connection_lost(self, exception: Exception | None) -> None:
+    """Fails the waiting requests"""
+    waiters, self._waiters = self._waiters, {}
+    for waiter in waiters.values():
+      if not waiter.done():
+        waiter.set_exception(
+          QueryError("""Query socket closed!""") if exception is None
+          else exception)
+
+  def _getSessionId(self) -> int:
+    """Returns a session id not in use"""
+    for _ in range(0x10000):
+      self._count = (self._count + 1) & 0xffff
+      sessionId = _spreadSessionId(self._count)
+      if sessionId not in self._waiters:
+        return sessionId
+    raise QueryError("""Too many queries in flight!""")
+
+  async def _request(self, addr: tuple, kind: int,
+                     challenge: int = None) -> bytes:
+    """Sends the request and returns the payload of the response. The
+    caller is responsible for any timeout."""
+    if self._transport is None or self._transport.is_closing():
+      raise QueryError("""Query socket is not open!""")
+    sessionId = self._getSessionId()
+    waiter = asyncio.get_running_loop().create_future()
+    self._waiters[sessionId] = waiter
+    self._requestCount += 1
+    try:
+      self._transport.sendto(encodeRequest(kind, sessionId, challenge), addr)
+      return await waiter
+    finally:
+      self._waiters.pop(sessionId, None)
+
+  async def _getChallenge(self, addr: tuple) -> int:
+    """Returns the challenge token of the server, requesting a new one if
+    the one kept has expired"""
+    now = asyncio.get_running_loop().time()
+    entry = self._challenges.get(addr)
+    if entry is not None and entry[1] > now:
+      return entry[0]
+    data = await self._request(addr, HANDSHAKE)
+    try:
+      challenge = int(data.rstrip(b'\0'))
+    except ValueError as exception:
+      raise QueryError("""Invalid challenge token!""") from exception
+    self._challenges[addr] = (challenge, now + Settings.challengeLifetime)
+    return challenge
+
+  async def _resolve(self, host: str, port: int) -> tuple:
+    """Returns the address of the host, resolving it once, as sending to
+    a host name would block the loop resolving it on every datagram"""
+    addr = self._addresses.get((host, port))
+    if addr is None:
+      infos = await asyncio.get_running_loop().getaddrinfo(
+        host, port, family=socket.AF_INET, type=socket.SOCK_DGRAM)
+      if not infos:
+        raise QueryError("""Unable to resolve %s!""" % host)
+      addr = self._addresses[(host, port)] = infos[0][4]
+    return addr
+
+  async def fullStat(self, host: str,
+                     port: int = None) -> tuple[dict[str, str], list[str]]:
+    """Requests the full statistics of the server and returns the
+    key-value section and player names. The caller is responsible for any
+    timeout, after which the challenge token is requested again."""
+    port = Settings.defaultPort if port is None else port
+    addr = await self._resolve(host, port)
+    try:
+      challenge = await self._getChallenge(addr)
+      return decodeFullStat(await self._request(addr, STAT, challenge))
+    except BaseException:
+      self._challenges.pop(addr, None)
+      raise
+
+  def getStats(self) -> dict[str, int]:
+    """Getter-function for the counters of the protocol"""
+    return dict(requests=self._requestCount, errors=self._errorCount,
+                pending=len(self._waiters))
+
+  def close(self) -> NoReturn:
+    """Closes the socket"""
+    if self._transport is not None:
+      self._transport.close()
@@ -0,0 +1,255 @@
+"""ServerPoller polls the status of many servers concurrently from one
+asyncio task group."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import NoReturn
+
+from minelive.query import Settings, QueryProtocol
+from minelive.query import ServerSnapshot, SnapshotTable
+from minelive.query import requestStatus, flattenText
+
+
+def _toInt(value: object) -> int:
+  """Returns the value as an integer or 0 if it is not one"""
+  try:
+    return int(value)
+  except (TypeError, ValueError):
+    return 0
+
+
+def _toDict(value: object) -> dict:
+  """Returns the value if it is a dictionary or else an empty one"""
+  return value if isinstance(value, dict) else {}
+
+
+class _Endpoint:
+  """Holds the address, options and polling state of one server"""
+
+  __slots__ = ('name', 'host', 'port', 'queryPort', 'slp', 'query',
+               'minInterval', 'maxInterval', 'timeout', 'interval',
+               'failures', 'last', 'task')
+
+  def __init__(self, name: str, host: str, port: int = None,
+               **kwargs) -> None:
+    self.name = name
+    self.host = host
+    self.port = Settings.defaultPort if port is None else port
+    self.queryPort = kwargs.get('queryPort', None) or self.port
+    self.slp = kwargs.get('slp', True)
+    self.query = kwargs.get('query', False)
+    self.minInterval = kwargs.get('minInterval', Settings.minInterval)
+    self.maxInterval = kwargs.get('maxInterval', Settings.maxInterval)
+    self.timeout = kwargs.get('timeout', Settings.pollTimeout)
+    self.interval = self.minInterval
+    self.failures = 0
+    self.last = None
+    self.task = None
+
+
+class ServerPoller:
+  """ServerPoller polls the status of many servers concurrently from one
+  asyncio task group. Each server is polled with the server list ping,
+  the GameSpy4 query protocol or both, as given when adding it. The query
+  protocol must be enabled in the server properties, and lists every
+  player rather than a sample. All queries share one UDP socket.
+
+  The interval of each server adapts to its activity. It is reset to the
+  minimum interval whenever the players, version or message of the day
+  change, and grows by Settings.intervalGrowth with each poll finding
+  nothing new, up to the maximum interval. A server failing to answer
+  within the timeout is retried after an exponential backoff capped at
+  Settings.maxBackoff. All delays are jittered by Settings.jitter, such
+  that servers added together drift apart rather than being polled in
+  bursts.
+
+  The latest snapshot of each server is published to the SnapshotTable,
+  which any thread may read without locking. Use 'run' on an event loop,
+  such as that of a LoopThread, and 'stop' from the same loop, for
+  example through LoopThread.call. While running, servers must be added
+  and removed from the loop as well.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  def __init__(self, table: SnapshotTable = None) -> None:
+    self._table = SnapshotTable() if table is None else table
+    self._endpoints = {}
+    self._group = None
+    self._stopped = None
+    self._query = None
+    self._pollCount = 0
+    self._failCount = 0
+
+  def getTable(self) -> SnapshotTable:
+    """Getter-function for the table of snapshots"""
+    return self._table
+
+  def addServer(self, name: str, host: str, port: int = None,
+                **kwargs) -> NoReturn:
+    """Adds the server under the given name. The keyword arguments
+    'slp' and 'query' select the protocols, defaulting to the server list
+    ping only, and 'queryPort' gives the port of the query protocol if it
+    differs. 'minInterval' and 'maxInterval' in milliseconds and 'timeout'
+    in seconds override the settings for this server."""
+    if name in self._endpoints:
+      msg = """Server named %s has already been added!"""
+      raise KeyError(msg % name)
+    endpoint = _Endpoint(name, host, port, **kwargs)
+    self._endpoints[name] = endpoint
+    if self._group is not None:
+      self._startEndpoint(endpoint)
+
+  def removeServer(self, name: str) -> NoReturn:
+    """Stops polling the named server and removes its snapshot"""
+    endpoint = self._endpoints.pop(name, None)
+    if endpoint is None:
+      msg = """No server named %s has been added!"""
+      raise KeyError(msg % name)
+    if endpoint.task is not None:
+      endpoint.task.cancel()
+    self._table.discard(name)
+
+  def getServers(self) -> list[str]:
+    """Getter-function for the names of the servers added"""
+    return [*self._endpoints]
+
+  def getPollCount(self) -> int:
+    """Getter-function for the number of polls completed"""
+    return self._pollCount
+
+  def getFailCount(self) -> int:
+    """Getter-function for the number of polls failed"""
+    return self._failCount
+
+  def isRunning(self) -> bool:
+    """Flag indicating whether the poller is running"""
+    return self._group is not None
+
+  def _startEndpoint(self, endpoint: _Endpoint) -> NoReturn:
+    """Starts the task polling the server"""
+    endpoint.task = self._group.create_task(self._pollLoop(endpoint),
+                                            name=endpoint.name)
+
+  async def run(self, ) -> NoReturn:
+    """Polls the servers until stopped"""
+    if self._group is not None:
+      raise RuntimeError("""ServerPoller is already running!""")
+    self._stopped = asyncio.Event()
+    self._query = await QueryProtocol.open()
+    try:
+      async with asyncio.TaskGroup() as group:
+        self._group = group
+        for endpoint in self._endpoints.values():
+          self._startEndpoint(endpoint)
+        await self._stopped.wait()
+        for endpoint in self._endpoints.values():
+          endpoint.task.cancel()
+    finally:
+      self._group = None
+      self._query.close()
+      self._query = None
+
+  def stop(self) -> NoReturn:
+    """Stops the poller, which must be running on the current loop"""
+    if self._stopped is not None:
+      self._stopped.set()
+
+  async def _pollLoop(self, endpoint: _Endpoint) -> NoReturn:
+    """Polls the server until cancelled"""
+    await asyncio.sleep(random.uniform(0, endpoint.minInterval / 1000))
+    while True:
+      snapshot = await self._poll(endpoint)
+      endpoint.last = snapshot
+      self._table.publish(snapshot)
+      await asyncio.sleep(snapshot.interval / 1000)
+
+  async def _poll(self, endpoint: _Endpoint) -> ServerSnapshot:
+    """Polls the server once and returns the snapshot. Any error in
+    reaching the server or decoding its reply fails this poll only, such
+    that one misbehaving server cannot stop the others being polled."""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    status, stats = None, None
+    try:
+      async with asyncio.timeout(endpoint.timeout):
+        if endpoint.slp:
+          status = await requestStatus(endpoint.host, endpoint.port)
+        if endpoint.query:
+          stats = await self._query.fullStat(endpoint.host,
+                                             endpoint.queryPort)
+      latency = (loop.time() - start) * 1000
+      return self._succeeded(endpoint, status, stats, latency)
+    except asyncio.CancelledError:
+      raise
+    except Exception as exception:
+      return self._failed(endpoint, exception)
+
+  def _jitter(self, delay: float) -> float:
+    """Returns the delay jittered"""
+    return delay * (1 + random.uniform(-Settings.jitter, Settings.jitter))
+
+  def _succeeded(self, endpoint: _Endpoint, status: dict | None,
+                 stats: tuple | None, latency: float) -> ServerSnapshot:
+    """Returns the snapshot of a successful poll and adapts the interval
+    of the server"""
+    fields = {}
+    if status is not None:
+      version = _toDict(status.get('version'))
+      players = _toDict(status.get('players'))
+      sample = players.get('sample')
+      sample = sample if isinstance(sample, list) else ()
+      fields.update(
+        version=str(version.get('name', '')),
+        protocol=_toInt(version.get('protocol')),
+        motd=flattenText(status.get('description', '')),
+        playerCount=_toInt(players.get('online')),
+        maxPlayers=_toInt(players.get('max')),
+        players=tuple(str(p.get('name', '')) for p in sample
+                      if isinstance(p, dict)),
+      )
+    if stats is not None:
+      keyValues, names = stats
+      fields.update(
+        motd=keyValues.get('hostname', fields.get('motd', '')),
+        version=keyValues.get('version', fields.get('version', '')),
+        playerCount=_toInt(keyValues.get('numplayers')),
+        maxPlayers=_toInt(keyValues.get('maxplayers')),
+        players=tuple(names),
+        map=keyValues.get('map', ''),
+        plugins=keyValues.get('plugins', ''),
+      )
+    self._pollCount += 1
+    previous = endpoint.last
+    changed = (previous is None or not previous.online
+               or any(getattr(previous, key) != fields.get(key) for key in
+                      ('version', 'motd', 'playerCount', 'players')))
+    if changed:
+      endpoint.interval = endpoint.minInterval
+    else:
+      endpoint.interval = min(endpoint.maxInterval,
+                              endpoint.interval * Settings.intervalGrowth)
+    endpoint.failures = 0
+    return ServerSnapshot(endpoint.name, True, time.time(), latency,
+                          interval=self._jitter(endpoint.interval),
+                          **fields)
+
+  def _failed(self, endpoint: _Endpoint,
+              exception: BaseException) -> ServerSnapshot:
+    """Returns the snapshot of a failed poll and backs off the server"""
+    self._failCount += 1
+    endpoint.failures += 1
+    endpoint.interval = endpoint.minInterval
+    base = max(endpoint.minInterval, Settings.minInterval)
+    exponent = min(endpoint.failures - 1, 16)
+    backoff = min(Settings.maxBackoff, base * 2 ** exponent)
+    error = str(exception) or type(exception).__name__
+    previous = endpoint.last
+    if previous is None:
+      previous = ServerSnapshot(endpoint.name, False, 0.)
+    return previous._replace(online=False, time=time.time(),
+                             failures=endpoint.failures,
+                             interval=self._jitter(backoff), error=error)
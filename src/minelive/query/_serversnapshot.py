@@ -0,0 +1,36 @@
+"""ServerSnapshot is the immutable record of the latest poll of a
+server."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class ServerSnapshot(NamedTuple):
+  """ServerSnapshot is the immutable record of the latest poll of a
+  server. The time is the wall clock time of the poll and the latency is
+  the round trip of the poll in milliseconds. The players are the names
+  listed by the query protocol or else the sample of the server list
+  ping, which the server may limit. When the poll fails, the server is
+  not online, the error describes the failure and the other fields are
+  kept from the last successful poll. Failures counts the polls failed in
+  a row, and interval is the time in milliseconds until the next poll.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  name: str
+  online: bool
+  time: float
+  latency: float = 0.
+  version: str = ''
+  protocol: int = 0
+  motd: str = ''
+  playerCount: int = 0
+  maxPlayers: int = 0
+  players: tuple[str, ...] = ()
+  map: str = ''
+  plugins: str = ''
+  failures: int = 0
+  interval: float = 0.
+  error: str = ''
@@ -0,0 +1,25 @@
+"""The Settings class provides the settings used by the query package."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+
+class Settings:
+  """The Settings class provides the settings used by the query package.
+  Intervals are given in milliseconds and timeouts in seconds.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  defaultPort = 25565
+  encoding = 'utf-8'
+
+  protocolVersion = -1
+  maxStatusSize = 1 << 21
+  challengeLifetime = 25.
+
+  pollTimeout = 3.
+  minInterval = 1000
+  maxInterval = 15000
+  intervalGrowth = 1.5
+  maxBackoff = 60000
+  jitter = 0.2
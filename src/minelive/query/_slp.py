@@ -0,0 +1,120 @@
+"""The server list ping functions request the status of a server the way
+the multiplayer menu of the game does."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import asyncio
+import json
+import struct
+
+from minelive.query import Settings, QueryError
+
+_port = struct.Struct('>H')
+_statusRequest = b'\x01\x00'
+
+
+def encodeVarInt(value: int) -> bytes:
+  """Returns the variable length encoding of the 32 bit integer. Each byte
+  holds seven bits starting from the least significant, with the high bit
+  set on every byte but the last."""
+  value &= 0xffffffff
+  data = bytearray()
+  while value > 0x7f:
+    data.append(value & 0x7f | 0x80)
+    value >>= 7
+  data.append(value)
+  return bytes(data)
+
+
+def decodeVarInt(data: bytes, offset: int = 0) -> tuple[int, int]:
+  """Decodes the variable length integer at the offset and returns it
+  with the offset following it"""
+  value = 0
+  for shift in range(0, 35, 7):
+    if offset >= len(data):
+      raise QueryError("""Unexpected end of data in variable integer!""")
+    byte = data[offset]
+    offset += 1
+    value |= (byte & 0x7f) << shift
+    if not byte & 0x80:
+      return value - (1 << 32) if value & 0x80000000 else value, offset
+  raise QueryError("""Variable integer longer than five bytes!""")
+
+
+async def readVarInt(reader: asyncio.StreamReader) -> int:
+  """Reads the next variable length integer from the stream"""
+  value = 0
+  for shift in range(0, 35, 7):
+    byte = (await reader.readexactly(1))[0]
+    value |= (byte & 0x7f) << shift
+    if not byte & 0x80:
+      return value
+  raise QueryError("""Variable integer longer than five bytes!""")
+
+
+def encodeString(text: str) -> bytes:
+  """Returns the string prefixed by its length"""
+  data = text.encode(Settings.encoding)
+  return encodeVarInt(len(data)) + data
+
+
+def encodePacket(packetId: int, payload: bytes) -> bytes:
+  """Returns the packet of the id and payload prefixed by its length"""
+  body = encodeVarInt(packetId) + payload
+  return encodeVarInt(len(body)) + body
+
+
+def encodeHandshake(host: str, port: int) -> bytes:
+  """Returns the handshake switching the connection to the status
+  state followed by the status request"""
+  payload = b''.join([encodeVarInt(Settings.protocolVersion),
+                      encodeString(host), _port.pack(port),
+                      encodeVarInt(1)])
+  return encodePacket(0, payload) + _statusRequest
+
+
+def flattenText(component: str | dict | list) -> str:
+  """Returns the plain text of the chat component, such as the
+  description of the status"""
+  if isinstance(component, str):
+    return component
+  if isinstance(component, list):
+    return ''.join(flattenText(c) for c in component)
+  if isinstance(component, dict):
+    text = flattenText(component.get('text', ''))
+    extra = component.get('extra')
+    if not isinstance(extra, list):
+      return text
+    return text + ''.join(flattenText(c) for c in extra)
+  return ''
+
+
+async def requestStatus(host: str, port: int = None) -> dict:
+  """Requests the status of the server and returns the decoded JSON
+  response. Raises QueryError if the response is invalid and OSError or
+  EOFError if the connection fails. The caller is responsible for any
+  timeout."""
+  port = Settings.defaultPort if port is None else port
+  reader, writer = await asyncio.open_connection(host, port)
+  try:
+    writer.write(encodeHandshake(host, port))
+    length = await readVarInt(reader)
+    if not 0 < length <= Settings.maxStatusSize:
+      msg = """Expected status length between 1 and %d, but received %d!"""
+      raise QueryError(msg % (Settings.maxStatusSize, length))
+    data = await reader.readexactly(length)
+  finally:
+    writer.close()
+  packetId, offset = decodeVarInt(data)
+  if packetId:
+    msg = """Expected status packet of id 0, but received %d!"""
+    raise QueryError(msg % packetId)
+  size, offset = decodeVarInt(data, offset)
+  try:
+    status = json.loads(data[offset:offset + size])
+  except ValueError as exception:
+    raise QueryError("""Unable to decode status JSON!""") from exception
+  if not isinstance(status, dict):
+    raise QueryError("""Expected status JSON object!""")
+  return status
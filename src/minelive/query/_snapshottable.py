@@ -0,0 +1,78 @@
+"""SnapshotTable shares the latest snapshot of each server with readers
+on any thread without locking."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import asyncio
+from types import MappingProxyType
+from typing import NoReturn, Mapping
+
+from minelive.query import ServerSnapshot
+
+
+class SnapshotTable:
+  """SnapshotTable shares the latest snapshot of each server with readers
+  on any thread without locking. The table is written from one event
+  loop only. Snapshots published are staged and swapped in as a new
+  read-only mapping once per iteration of the loop, such that readers
+  always see a consistent mapping, which is never changed after being
+  published. Since replacing the attribute is atomic, reading requires no
+  lock, and a reader may keep the mapping as long as it likes.
+
+  The version increases with each mapping swapped in, such that a reader
+  such as a widget refreshing on a timer can skip work when nothing has
+  changed.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  def __init__(self, ) -> None:
+    self._snapshots = MappingProxyType({})
+    self._staged = {}
+    self._version = 0
+    self._flushScheduled = False
+
+  def publish(self, snapshot: ServerSnapshot) -> NoReturn:
+    """Stages the snapshot to be swapped in with the next flush, which is
+    scheduled on the running loop"""
+    self._staged[snapshot.name] = snapshot
+    if not self._flushScheduled:
+      self._flushScheduled = True
+      asyncio.get_running_loop().call_soon(self.flush)
+
+  def discard(self, name: str) -> NoReturn:
+    """Removes the snapshot of the named server"""
+    self._staged.pop(name, None)
+    if name in self._snapshots:
+      snapshots = dict(self._snapshots)
+      del snapshots[name]
+      self._swap(snapshots)
+
+  def flush(self) -> NoReturn:
+    """Swaps in the snapshots staged"""
+    self._flushScheduled = False
+    if self._staged:
+      staged, self._staged = self._staged, {}
+      self._swap({**self._snapshots, **staged})
+
+  def _swap(self, snapshots: dict[str, ServerSnapshot]) -> NoReturn:
+    """Publishes the mapping to the readers"""
+    self._snapshots = MappingProxyType(snapshots)
+    self._version += 1
+
+  def getSnapshots(self) -> Mapping[str, ServerSnapshot]:
+    """Getter-function for the read-only mapping of server names to their
+    latest snapshot"""
+    return self._snapshots
+
+  def getSnapshot(self, name: str) -> ServerSnapshot | None:
+    """Getter-function for the latest snapshot of the named server"""
+    return self._snapshots.get(name)
+
+  def getVersion(self) -> int:
+    """Getter-function for the version of the mapping"""
+    return self._version
+
+  def __len__(self) -> int:
+    """The number of servers with a snapshot"""
+    return len(self._snapshots)
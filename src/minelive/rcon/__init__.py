@@ -0,0 +1,37 @@
+"""The rcon package executes commands on running minecraft servers through
+the RCON protocol."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from moreworktoy import lazyExports
+
+if TYPE_CHECKING:
+  from ._settings import Settings
+  from ._rconerror import RconError, RconAuthError
+  from ._packet import RESPONSE, COMMAND, AUTH_RESPONSE, AUTH
+  from ._packet import encodePacket, readPacket
+  from ._rconconnection import RconConnection
+  from ._rconpool import RconPool
+  from ._loopthread import LoopThread
+  from ._rconclient import RconClient
+  from ._fakeserver import FakeRconServer
+
+__getattr__, __dir__ = lazyExports(__name__, {
+  'Settings': '._settings',
+  'RconError': '._rconerror',
+  'RconAuthError': '._rconerror',
+  'RESPONSE': '._packet',
+  'COMMAND': '._packet',
+  'AUTH_RESPONSE': '._packet',
+  'AUTH': '._packet',
+  'encodePacket': '._packet',
+  'readPacket': '._packet',
+  'RconConnection': '._rconconnection',
+  'RconPool': '._rconpool',
+  'LoopThread': '._loopthread',
+  'RconClient': '._rconclient',
+  'FakeRconServer': '._fakeserver',
+})
@@ -0,0 +1,124 @@
+"""FakeRconServer is a local stand-in for the RCON server of minecraft."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import asyncio
+from typing import NoReturn, Callable
+
+from minelive.rcon import Settings, RconError, encodePacket, readPacket
+from minelive.rcon import COMMAND, AUTH_RESPONSE, AUTH, RESPONSE
+
+_defaultResponses = {
+  'list': 'There are 0 of a max of 20 players online: ',
+  'tick query': 'The game is running normally\nTarget tick rate: 20.0 '
+                'per second.\nAverage time per tick: 1.2ms (Target: '
+                '50.0ms)',
+  'forge tps': 'Overall: Mean tick time: 1.204 ms. Mean TPS: 20.000',
+  'scoreboard players list': 'There are no tracked entities',
+}
+
+
+class FakeRconServer:
+  """FakeRconServer is a local stand-in for the RCON server of minecraft
+  for tests and benchmarks. It accepts the given password and answers
+  each command with the response given for it, which may be a string or
+  a callable receiving the command. Unknown commands are answered the
+  way the server does. Like the server, it handles the packets of each
+  connection in order, splits responses into fragments of
+  Settings.fragmentSize bytes and answers packets of other types with
+  'Unknown request'. A delay in seconds may be given to simulate the time
+  the server takes for each command.
+
+  Use 'start' from a running event loop to listen on the loopback
+  interface. Passing port 0 picks a free port, which 'getPort' returns.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  def __init__(self, password: str = 'minelive', port: int = 0,
+               responses: dict[str, str | Callable] = None,
+               delay: float = 0.) -> None:
+    self._password = password
+    self._port = port
+    self._responses = {**_defaultResponses, **(responses or {})}
+    self._delay = delay
+    self._server = None
+    self._connectionCount = 0
+    self._commandCount = 0
+
+  async def start(self, ) -> int:
+    """Starts listening and returns the port"""
+    self._server = await asyncio.start_server(self._handle, '127.0.0.1',
+                                              self._port)
+    self._port = self._server.sockets[0].getsockname()[1]
+    return self._port
+
+  async def stop(self, ) -> NoReturn:
+    """Stops listening and closes the connections"""
+    if self._server is not None:
+      self._server.close()
+      await self._server.wait_closed()
+      self._server = None
+
+  def getPort(self) -> int:
+    """Getter-function for the port listened on"""
+    return self._port
+
+  def getConnectionCount(self) -> int:
+    """Getter-function for the number of connections accepted"""
+    return self._connectionCount
+
+  def getCommandCount(self) -> int:
+    """Getter-function for the number of commands executed"""
+    return self._commandCount
+
+  def setResponse(self, command: str, response: str | Callable) -> NoReturn:
+    """Sets the response to the command"""
+    self._responses[command] = response
+
+  def _respond(self, command: str) -> str:
+    """Returns the response to the command"""
+    response = self._responses.get(command)
+    if response is None:
+      msg = 'Unknown or incomplete command, see below for error%s<--[HERE]'
+      return msg % command
+    return response(command) if callable(response) else response
+
+  @staticmethod
+  def _fragment(requestId: int, response: str) -> bytes:
+    """Returns the packets of the response split into fragments"""
+    data = response.encode(Settings.encoding)
+    size = Settings.fragmentSize
+    chunks = [data[i:i + size] for i in range(0, len(data), size)] or [b'']
+    return b''.join(
+      encodePacket(requestId, RESPONSE,
+                   chunk.decode(Settings.encoding, 'replace'))
+      for chunk in chunks)
+
+  async def _handle(self, reader: asyncio.StreamReader,
+                    writer: asyncio.StreamWriter) -> NoReturn:
+    """Serves one connection"""
+    self._connectionCount += 1
+    authenticated = False
+    try:
+      while True:
+        requestId, kind, body = await readPacket(reader)
+        if kind == AUTH:
+          authenticated = body == self._password
+          replyId = requestId if authenticated else -1
+          writer.write(encodePacket(replyId, AUTH_RESPONSE, ''))
+        elif not authenticated:
+          break
+        elif kind == COMMAND:
+          if self._delay:
+            await asyncio.sleep(self._delay)
+          self._commandCount += 1
+          writer.write(self._fragment(requestId, self._respond(body)))
+        else:
+          writer.write(encodePacket(requestId, RESPONSE,
+                                    'Unknown request %x' % kind))
+        await writer.drain()
+    except (EOFError, OSError, RconError):
+      pass
+    finally:
+      writer.close()
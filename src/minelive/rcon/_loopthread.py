@@ -0,0 +1,87 @@
+"""LoopThread runs an asyncio event loop on a dedicated thread alongside
+the Qt event loop."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import NoReturn, Coroutine, Callable
+
+
+class LoopThread:
+  """LoopThread runs an asyncio event loop on a dedicated thread alongside
+  the Qt event loop. Coroutines are submitted from any thread with
+  'submit', which returns a concurrent future. Results reach the GUI
+  thread by emitting signals from the coroutines, which Qt queues to the
+  receivers living in the GUI thread, so that neither loop waits for the
+  other. The thread is started on first use.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  def __init__(self, name: str = 'LoopThread') -> None:
+    self._name = name
+    self._loop = None
+    self._thread = None
+    self._lock = threading.Lock()
+
+  def start(self, ) -> NoReturn:
+    """Starts the event loop thread unless running"""
+    with self._lock:
+      if self._thread is not None:
+        return
+      self._loop = asyncio.new_event_loop()
+      ready = threading.Event()
+      self._thread = threading.Thread(target=self._run, args=(ready,),
+                                      name=self._name, daemon=True)
+      self._thread.start()
+      ready.wait()
+
+  def _run(self, ready: threading.Event) -> NoReturn:
+    """Runs the event loop until stopped"""
+    asyncio.set_event_loop(self._loop)
+    self._loop.call_soon(ready.set)
+    self._loop.run_forever()
+
+  def getLoop(self) -> asyncio.AbstractEventLoop:
+    """Getter-function for the event loop, starting it if required"""
+    if self._loop is None:
+      self.start()
+    return self._loop
+
+  def isRunning(self) -> bool:
+    """Flag indicating whether the loop thread is running"""
+    return self._thread is not None
+
+  def submit(self, coroutine: Coroutine) -> Future:
+    """Schedules the coroutine on the loop and returns a concurrent future
+    of its result"""
+    return asyncio.run_coroutine_threadsafe(coroutine, self.getLoop())
+
+  def call(self, callback: Callable, *args) -> NoReturn:
+    """Calls the callback on the loop thread"""
+    self.getLoop().call_soon_threadsafe(callback, *args)
+
+  def stop(self, timeout: float = None) -> NoReturn:
+    """Cancels the remaining tasks, stops the loop and waits for the
+    thread for at most the given time"""
+    with self._lock:
+      thread, loop = self._thread, self._loop
+      self._thread, self._loop = None, None
+    if thread is None:
+      return
+    asyncio.run_coroutine_threadsafe(self._shutdown(), loop)
+    thread.join(timeout)
+    if not thread.is_alive():
+      loop.close()
+
+  @staticmethod
+  async def _shutdown() -> NoReturn:
+    """Cancels every other task on the loop and stops it"""
+    current = asyncio.current_task()
+    tasks = [t for t in asyncio.all_tasks() if t is not current]
+    for task in tasks:
+      task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    asyncio.get_running_loop().stop()
@@ -0,0 +1,34 @@
+"""The packet functions encode and decode the packets of the RCON
+protocol."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import asyncio
+import struct
+
+from minelive.rcon import Settings, RconError
+
+RESPONSE, COMMAND, AUTH_RESPONSE, AUTH = 0, 2, 2, 3
+
+_header = struct.Struct('<iii')
+_length = struct.Struct('<i')
+
+
+def encodePacket(requestId: int, kind: int, body: str) -> bytes:
+  """Returns the packet of the given request id, type and body. A packet
+  is the little endian length, request id and type followed by the body
+  and two null bytes."""
+  data = body.encode(Settings.encoding)
+  return _header.pack(len(data) + 10, requestId, kind) + data + b'\0\0'
+
+
+async def readPacket(reader: asyncio.StreamReader) -> tuple[int, int, str]:
+  """Reads the next packet and returns the request id, type and body"""
+  length, = _length.unpack(await reader.readexactly(4))
+  if not 10 <= length <= Settings.maxPacketSize:
+    msg = """Expected packet length between 10 and %d, but received %d!"""
+    raise RconError(msg % (Settings.maxPacketSize, length))
+  data = await reader.readexactly(length)
+  requestId, kind = struct.unpack_from('<ii', data)
+  return requestId, kind, data[8:-2].decode(Settings.encoding, 'replace')
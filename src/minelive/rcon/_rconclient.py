@@ -0,0 +1,138 @@
+"""RconClient lets the GUI thread execute and poll RCON commands on many
+servers."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import NoReturn
+
+from PySide6.QtCore import QObject, Signal
+from worktoy.core import maybe
+
+from minelive.rcon import Settings, RconPool, LoopThread
+
+
+class RconClient(QObject):
+  """RconClient lets the GUI thread execute and poll RCON commands on many
+  servers. Each server added is given an RconPool, and every pool lives
+  on one LoopThread, such that the connections are shared by all
+  commands to the server. Every command completed emits 'received' with
+  the name of the server, the command and the response, and every
+  command failed emits 'failed' with the error instead. The signals are
+  emitted from the loop thread and delivered in the thread of the
+  receivers.
+
+  Polls execute a list of commands on a server at a fixed interval. The
+  commands of a poll are pipelined and the interval is measured from the
+  start of each round, such that slow responses do not delay the
+  following rounds.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  received = Signal(str, str, str)
+  failed = Signal(str, str, str)
+
+  def __init__(self, loopThread: LoopThread = None, *args,
+               **kwargs) -> None:
+    QObject.__init__(self, *args, **kwargs)
+    self._loopThread = maybe(loopThread, LoopThread('RconClient'))
+    self._pools = {}
+    self._polls = {}
+
+  def getLoopThread(self) -> LoopThread:
+    """Getter-function for the thread running the event loop"""
+    return self._loopThread
+
+  def addServer(self, name: str, host: str, port: int = None,
+                password: str = None, **kwargs) -> NoReturn:
+    """Adds the server under the given name. Further keyword arguments
+    are passed on to the RconPool."""
+    if name in self._pools:
+      msg = """Server named %s has already been added!"""
+      raise KeyError(msg % name)
+    self._pools[name] = RconPool(host, port, password, **kwargs)
+
+  def getServers(self) -> list[str]:
+    """Getter-function for the names of the servers added"""
+    return [*self._pools]
+
+  def getPool(self, name: str) -> RconPool:
+    """Getter-function for the pool of the named server"""
+    pool = self._pools.get(name)
+    if pool is None:
+      msg = """No server named %s has been added!"""
+      raise KeyError(msg % name)
+    return pool
+
+  async def _execute(self, name: str, command: str) -> str:
+    """Executes the command on the loop thread and emits the outcome"""
+    try:
+      response = await self.getPool(name).execute(command)
+    except asyncio.CancelledError:
+      raise
+    except Exception as exception:
+      self.failed.emit(name, command, str(exception))
+      raise
+    self.received.emit(name, command, response)
+    return response
+
+  def execute(self, name: str, command: str) -> Future:
+    """Executes the command on the named server. Returns a concurrent
+    future of the response, which must not be waited on from the GUI
+    thread. Connect to 'received' instead."""
+    self.getPool(name)
+    return self._loopThread.submit(self._execute(name, command))
+
+  async def _poll(self, name: str, commands: list[str],
+                  interval: float) -> NoReturn:
+    """Executes the commands every interval until cancelled"""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    while True:
+      await asyncio.gather(*(self._execute(name, c) for c in commands),
+                           return_exceptions=True)
+      start += interval
+      now = loop.time()
+      if start < now:
+        start = now
+      await asyncio.sleep(start - now)
+
+  def startPolling(self, name: str, commands: list[str],
+                   interval: int = None) -> NoReturn:
+    """Executes the commands on the named server every interval given in
+    milliseconds, defaulting to Settings.pollInterval. Any previous poll
+    of the server is replaced."""
+    self.getPool(name)
+    self.stopPolling(name)
+    interval = maybe(interval, Settings.pollInterval) / 1000
+    self._polls[name] = self._loopThread.submit(
+      self._poll(name, [*commands], interval))
+
+  def stopPolling(self, name: str) -> NoReturn:
+    """Stops polling the named server"""
+    poll = self._polls.pop(name, None)
+    if poll is not None:
+      poll.cancel()
+
+  def isPolling(self, name: str) -> bool:
+    """Flag indicating whether the named server is polled"""
+    return name in self._polls
+
+  async def _closePools(self, ) -> NoReturn:
+    """Closes the connections of every pool"""
+    for pool in self._pools.values():
+      await pool.close()
+
+  def close(self, timeout: float = 1.) -> NoReturn:
+    """Stops every poll, closes the connections and stops the loop thread,
+    waiting at most the given number of seconds"""
+    for name in [*self._polls]:
+      self.stopPolling(name)
+    if self._loopThread.isRunning():
+      try:
+        self._loopThread.submit(self._closePools()).result(timeout)
+      except (FutureTimeout, ConnectionError):
+        pass
+      self._loopThread.stop(timeout)
@@ -0,0 +1,205 @@
+"""RconConnection is one authenticated RCON connection on which commands
+are pipelined."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import asyncio
+from typing import NoReturn
+
+from worktoy.core import maybe
+
+from minelive.rcon import Settings, RconError, RconAuthError
+from minelive.rcon import encodePacket, readPacket
+from minelive.rcon import RESPONSE, COMMAND, AUTH_RESPONSE, AUTH
+
+
+class RconConnection:
+  """RconConnection is one authenticated RCON connection on which commands
+  are pipelined. Any number of coroutines may call 'execute' at once, up
+  to Settings.pipelineDepth commands being in flight, and each command is
+  written as soon as it is called. A single reader task matches the
+  responses to the commands by request id.
+
+  The server splits responses longer than Settings.fragmentSize bytes
+  into several packets with the request id of the command. To know when a
+  response is complete, each command is followed by an empty packet of
+  the response type, which the server answers after the last fragment of
+  the command. If Settings.sentinel is False, a response is instead taken
+  to be complete on the first fragment shorter than the fragment size,
+  which fails for responses of exactly that length.
+
+  The connection must be used from the event loop that opened it.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  def __init__(self, host: str, port: int = None, password: str = None,
+               **kwargs) -> None:
+    self._host = host
+    self._port = maybe(port, Settings.defaultPort)
+    self._password = password
+    self._sentinel = kwargs.get('sentinel', Settings.sentinel)
+    self._connectTimeout = kwargs.get('connectTimeout',
+                                      Settings.connectTimeout)
+    self._commandTimeout = kwargs.get('commandTimeout',
+                                      Settings.commandTimeout)
+    self._depth = asyncio.Semaphore(
+      kwargs.get('pipelineDepth', Settings.pipelineDepth))
+    self._reader = None
+    self._writer = None
+    self._readTask = None
+    self._nextId = 1
+    self._pending = {}
+    self._sentinels = {}
+    self._closed = False
+    self._commandCount = 0
+
+  def _getRequestId(self) -> int:
+    """Returns the next request id, skipping -1 which signals a failed
+    authentication"""
+    requestId = self._nextId
+    self._nextId = requestId + 1 if requestId < 0x7fffffff else 1
+    return requestId
+
+  async def open(self, ) -> NoReturn:
+    """Opens and authenticates the connection. Raises RconAuthError if the
+    password is rejected and RconError if the server cannot be reached."""
+    if self._password is None:
+      self._password = Settings.getPassword()
+    try:
+      self._reader, self._writer = await asyncio.wait_for(
+        asyncio.open_connection(self._host, self._port),
+        self._connectTimeout)
+      authId = self._getRequestId()
+      self._writer.write(encodePacket(authId, AUTH, self._password))
+      await self._writer.drain()
+      while True:
+        requestId, kind, _ = await asyncio.wait_for(
+          readPacket(self._reader), self._connectTimeout)
+        if kind == AUTH_RESPONSE:
+          break
+    except (OSError, EOFError, asyncio.TimeoutError) as exception:
+      await self.close()
+      msg = """Unable to connect to %s:%d!"""
+      raise RconError(msg % (self._host, self._port)) from exception
+    if requestId != authId:
+      await self.close()
+      msg = """Authentication rejected by %s:%d!"""
+      raise RconAuthError(msg % (self._host, self._port))
+    self._readTask = asyncio.get_running_loop().create_task(
+      self._readLoop())
+
+  async def _readLoop(self, ) -> NoReturn:
+    """Reads the responses and completes the commands"""
+    pending, sentinels = self._pending, self._sentinels
+    fragmentSize, sentinel = Settings.fragmentSize, self._sentinel
+    encoding = Settings.encoding
+    try:
+      while True:
+        requestId, _, body = await readPacket(self._reader)
+        entry = pending.get(requestId)
+        if entry is not None:
+          entry[1].append(body)
+          if not sentinel and len(body.encode(encoding)) < fragmentSize:
+            self._complete(requestId)
+          continue
+        commandId = sentinels.pop(requestId, None)
+        if commandId is not None:
+          self._complete(commandId)
+    except asyncio.CancelledError:
+      raise
+    except (OSError, EOFError, RconError) as exception:
+      self._fail(exception)
+      self._closeWriter()
+
+  def _complete(self, requestId: int) -> NoReturn:
+    """Completes the command of the request id with the fragments
+    received"""
+    entry = self._pending.pop(requestId, None)
+    if entry is not None and not entry[0].done():
+      entry[0].set_result(''.join(entry[1]))
+
+  def _fail(self, exception: BaseException) -> NoReturn:
+    """Fails every pending command"""
+    self._closed = True
+    pending, self._pending = self._pending, {}
+    self._sentinels.clear()
+    for (future, _) in pending.values():
+      if not future.done():
+        msg = """Connection to %s:%d lost!"""
+        error = RconError(msg % (self._host, self._port))
+        error.__cause__ = exception
+        future.set_exception(error)
+
+  def _closeWriter(self, ) -> NoReturn:
+    """Closes the transport"""
+    if self._writer is not None:
+      self._writer.close()
+
+  def _expire(self, future: asyncio.Future) -> NoReturn:
+    """Fails the command of the future for taking too long"""
+    if not future.done():
+      msg = """Command timed out on %s:%d!"""
+      future.set_exception(RconError(msg % (self._host, self._port)))
+
+  async def execute(self, command: str) -> str:
+    """Executes the command and returns the response. Raises RconError if
+    the connection is lost or no response arrives within the command
+    timeout."""
+    async with self._depth:
+      if self._closed or self._readTask is None:
+        msg = """Connection to %s:%d is not open!"""
+        raise RconError(msg % (self._host, self._port))
+      loop = asyncio.get_running_loop()
+      requestId, sentinelId = self._getRequestId(), None
+      future = loop.create_future()
+      self._pending[requestId] = (future, [])
+      packet = encodePacket(requestId, COMMAND, command)
+      if self._sentinel:
+        sentinelId = self._getRequestId()
+        self._sentinels[sentinelId] = requestId
+        packet += encodePacket(sentinelId, RESPONSE, '')
+      timer = loop.call_later(self._commandTimeout, self._expire, future)
+      self._commandCount += 1
+      try:
+        self._writer.write(packet)
+        await self._writer.drain()
+        return await future
+      except OSError as exception:
+        self._fail(exception)
+        msg = """Connection to %s:%d lost!"""
+        raise RconError(msg % (self._host, self._port)) from exception
+      finally:
+        timer.cancel()
+        self._pending.pop(requestId, None)
+        self._sentinels.pop(sentinelId, None)
+
+  def isOpen(self) -> bool:
+    """Flag indicating whether the connection is open"""
+    return self._readTask is not None and not self._closed
+
+  def getPendingCount(self) -> int:
+    """Getter-function for the number of commands in flight"""
+    return len(self._pending)
+
+  def getCommandCount(self) -> int:
+    """Getter-function for the number of commands sent"""
+    return self._commandCount
+
+  async def close(self, ) -> NoReturn:
+    """Closes the connection failing any pending command"""
+    self._fail(RconError('Connection closed'))
+    if self._readTask is not None:
+      self._readTask.cancel()
+      try:
+        await self._readTask
+      except asyncio.CancelledError:
+        pass
+      self._readTask = None
+    if self._writer is not None:
+      self._writer.close()
+      try:
+        await self._writer.wait_closed()
+      except OSError:
+        pass
+      self._writer = None
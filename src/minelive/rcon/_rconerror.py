@@ -0,0 +1,17 @@
+"""RconError is raised when a command cannot be executed over RCON."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+
+class RconError(ConnectionError):
+  """RconError is raised when a command cannot be executed over RCON,
+  because the connection failed, was closed or timed out.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+
+class RconAuthError(RconError):
+  """RconAuthError is raised when the server rejects the password.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
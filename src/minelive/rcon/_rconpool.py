@@ -0,0 +1,122 @@
+"""RconPool keeps a small pool of authenticated connections to one
+server."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import asyncio
+from typing import NoReturn
+
+from worktoy.core import maybe
+
+from minelive.rcon import Settings, RconError
+from minelive.rcon import RconConnection
+
+
+class RconPool:
+  """RconPool keeps a small pool of authenticated connections to one
+  server. Each command is sent on the open connection with the fewest
+  commands in flight. Connections are opened when needed, while every
+  open connection is busy, up to the size of the pool, which defaults to
+  Settings.poolSize. A command failing because its connection was lost
+  is retried once on another connection. Commands rejected for a wrong
+  password are not retried. Commands are not retried after timing out,
+  as they may have been executed.
+
+  The pool must be used from a single event loop.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  def __init__(self, host: str, port: int = None, password: str = None,
+               **kwargs) -> None:
+    self._host = host
+    self._port = maybe(port, Settings.defaultPort)
+    self._password = password
+    self._size = kwargs.pop('size', Settings.poolSize)
+    self._kwargs = kwargs
+    self._connections = []
+    self._opening = None
+    self._openCount = 0
+    self._failCount = 0
+
+  def getHost(self) -> str:
+    """Getter-function for the host of the server"""
+    return self._host
+
+  def getPort(self) -> int:
+    """Getter-function for the port of the server"""
+    return self._port
+
+  def _startOpening(self, ) -> asyncio.Task:
+    """Starts opening a new connection unless one is being opened, and
+    returns the task opening it"""
+    if self._opening is None:
+      self._opening = asyncio.get_running_loop().create_task(
+        self._openConnection())
+      self._opening.add_done_callback(self._openingDone)
+    return self._opening
+
+  def _openingDone(self, task: asyncio.Task) -> NoReturn:
+    """Clears the finished task opening a connection"""
+    self._opening = None
+    if not task.cancelled() and task.exception() is not None:
+      self._failCount += 1
+
+  async def _openConnection(self, ) -> RconConnection:
+    """Creator-function for a new connection"""
+    connection = RconConnection(self._host, self._port, self._password,
+                                **self._kwargs)
+    await connection.open()
+    self._connections.append(connection)
+    self._openCount += 1
+    return connection
+
+  async def _acquire(self, ) -> RconConnection:
+    """Returns the connection to send the next command on. While every
+    open connection is busy and the pool has room, another connection is
+    opened in the background for later commands."""
+    connections = [c for c in self._connections if c.isOpen()]
+    self._connections = connections
+    best = None
+    for connection in connections:
+      if best is None or (connection.getPendingCount()
+                          < best.getPendingCount()):
+        best = connection
+    if best is None:
+      return await asyncio.shield(self._startOpening())
+    if best.getPendingCount() and len(connections) < self._size:
+      self._startOpening()
+    return best
+
+  async def execute(self, command: str) -> str:
+    """Executes the command and returns the response"""
+    connection = await self._acquire()
+    try:
+      return await connection.execute(command)
+    except RconError:
+      if connection.isOpen():
+        raise
+    connection = await self._acquire()
+    return await connection.execute(command)
+
+  async def executeAll(self, commands: list[str]) -> list[str | Exception]:
+    """Executes the commands concurrently and returns the responses in
+    order. A command that failed is given by its exception."""
+    return await asyncio.gather(*(self.execute(c) for c in commands),
+                                return_exceptions=True)
+
+  def getStats(self) -> dict[str, int]:
+    """Getter-function for the counters of the pool"""
+    return dict(
+      connections=len(self._connections),
+      pending=sum(c.getPendingCount() for c in self._connections),
+      commands=sum(c.getCommandCount() for c in self._connections),
+      opened=self._openCount,
+      failed=self._failCount,
+    )
+
+  async def close(self, ) -> NoReturn:
+    """Closes every connection"""
+    connections, self._connections = self._connections, []
+    for connection in connections:
+      await connection.close()
@@ -0,0 +1,36 @@
+"""The Settings class provides the settings used by the rcon package."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import os
+
+
+class Settings:
+  """The Settings class provides the settings used by the rcon package.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  passwordEnv = 'MINELIVE_RCON_PASSWORD'
+  defaultPort = 25575
+  encoding = 'utf-8'
+
+  poolSize = 2
+  pipelineDepth = 64
+  connectTimeout = 5.
+  commandTimeout = 10.
+  maxPacketSize = 1 << 16
+  fragmentSize = 4096
+  sentinel = True
+
+  pollInterval = 1000
+
+  @classmethod
+  def getPassword(cls) -> str:
+    """Getter-function for the password given by the environment
+    variable."""
+    fromEnv = os.getenv(cls.passwordEnv)
+    if fromEnv:
+      return fromEnv
+    e = """Environment variable %s not recognized!""" % cls.passwordEnv
+    raise KeyError(e)
@@ -0,0 +1,46 @@
+"""The region package reads the chunks of the Anvil region files of a
+world, decompressing only the chunks requested, and decodes their packed
+block states, biomes and heightmaps."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from moreworktoy import lazyExports
+
+if TYPE_CHECKING:
+  from ._settings import Settings
+  from ._regionerror import RegionError
+  from ._chunkcache import ChunkCache, chunkCache
+  from ._regionfile import GZIP, ZLIB, NONE, LZ4, CUSTOM, EXTERNAL
+  from ._regionfile import decompressChunk, RegionFile
+  from ._regionfolder import RegionFolder
+  from ._palette import SPANNING_VERSION, inferBits, unpackIndices
+  from ._palette import paletteNames, paletteIds, decodePaletted
+  from ._palette import decodeBlockStates, decodeBiomes, decodeHeightmap
+
+__getattr__, __dir__ = lazyExports(__name__, {
+  'Settings': '._settings',
+  'RegionError': '._regionerror',
+  'ChunkCache': '._chunkcache',
+  'chunkCache': '._chunkcache',
+  'GZIP': '._regionfile',
+  'ZLIB': '._regionfile',
+  'NONE': '._regionfile',
+  'LZ4': '._regionfile',
+  'CUSTOM': '._regionfile',
+  'EXTERNAL': '._regionfile',
+  'decompressChunk': '._regionfile',
+  'RegionFile': '._regionfile',
+  'RegionFolder': '._regionfolder',
+  'SPANNING_VERSION': '._palette',
+  'inferBits': '._palette',
+  'unpackIndices': '._palette',
+  'paletteNames': '._palette',
+  'paletteIds': '._palette',
+  'decodePaletted': '._palette',
+  'decodeBlockStates': '._palette',
+  'decodeBiomes': '._palette',
+  'decodeHeightmap': '._palette',
+})
@@ -0,0 +1,78 @@
+"""ChunkCache keeps decoded chunks in a least recently used cache bounded
+by their size in bytes."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import NoReturn, Hashable
+
+from minelive.nbt import NbtCompound, readNbt
+from minelive.region import Settings
+
+
+class ChunkCache:
+  """ChunkCache keeps decoded chunks in a least recently used cache bounded
+  by the total size of their decompressed data, which defaults to
+  Settings.chunkCacheBytes. Each chunk is stored with a stamp, such as
+  the timestamp and sector of the chunk in the region header, and a chunk
+  whose stamp has changed is read again. The chunks are lazy NBT views,
+  so the values decoded from a cached chunk are kept along with it.
+  Chunks larger than the whole cache are decoded but not kept.
+
+  The module level instance 'chunkCache' is shared by every RegionFile
+  not given a cache of its own. The cache must be used from one thread.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  def __init__(self, capacity: int = None) -> None:
+    self._capacity = Settings.chunkCacheBytes if capacity is None \
+      else capacity
+    self._chunks = OrderedDict()
+    self._size = 0
+    self._hits = 0
+    self._misses = 0
+    self._evictions = 0
+
+  def get(self, key: Hashable, stamp: Hashable) -> NbtCompound | None:
+    """Returns the chunk of the key if cached with the same stamp"""
+    entry = self._chunks.get(key)
+    if entry is None or entry[0] != stamp:
+      self._misses += 1
+      return None
+    self._hits += 1
+    self._chunks.move_to_end(key)
+    return entry[1]
+
+  def put(self, key: Hashable, stamp: Hashable, data: bytes) -> NbtCompound:
+    """Decodes the chunk data, caches it and returns the root compound"""
+    self.discard(key)
+    root = readNbt(data)
+    if len(data) > self._capacity:
+      return root
+    self._chunks[key] = (stamp, root, len(data))
+    self._size += len(data)
+    while self._size > self._capacity:
+      self._size -= self._chunks.popitem(last=False)[1][2]
+      self._evictions += 1
+    return root
+
+  def discard(self, key: Hashable) -> NoReturn:
+    """Removes the chunk of the key"""
+    entry = self._chunks.pop(key, None)
+    if entry is not None:
+      self._size -= entry[2]
+
+  def getStats(self) -> dict[str, int]:
+    """Getter-function for the counters of the cache"""
+    return dict(chunks=len(self._chunks), bytes=self._size,
+                hits=self._hits, misses=self._misses,
+                evictions=self._evictions)
+
+  def clear(self) -> NoReturn:
+    """Forgets every chunk"""
+    self._chunks.clear()
+    self._size = 0
+
+
+chunkCache = ChunkCache()
@@ -0,0 +1,174 @@
+"""The palette functions decode the packed block states, biomes and
+heightmaps of chunks with numpy."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import Any
+
+import numpy
+
+from minelive.region import RegionError
+
+SPANNING_VERSION = 2556
+
+_shiftCache = {}
+
+
+def _toUnsigned(data: Any) -> numpy.ndarray:
+  """Returns the longs as native unsigned 64 bit integers. Big endian
+  views of NBT data are converted in one pass."""
+  longs = numpy.asarray(data)
+  if longs.dtype.kind == 'i':
+    longs = longs.view(longs.dtype.str.replace('i', 'u'))
+  return longs.astype(numpy.uint64, copy=False)
+
+
+def inferBits(longCount: int, count: int, spanning: bool = False) -> int:
+  """Returns the bits per entry of the count entries packed into the
+  given number of longs. Without spanning, several sizes may need the
+  same number of longs, in which case the smallest is returned."""
+  if not longCount or not count:
+    return 0
+  if spanning:
+    return longCount * 64 // count
+  for bits in range(1, 33):
+    if -(-count // (64 // bits)) == longCount:
+      return bits
+  msg = """Unable to fit %d entries in %d longs!"""
+  raise RegionError(msg % (count, longCount))
+
+
+def _getShifts(bits: int) -> numpy.ndarray:
+  """Getter-function for the shifts of the entries within a long"""
+  shifts = _shiftCache.get(bits)
+  if shifts is None:
+    shifts = numpy.arange(64 // bits, dtype=numpy.uint64)
+    shifts = _shiftCache[bits] = shifts * numpy.uint64(bits)
+  return shifts
+
+
+def unpackIndices(data: Any, bits: int, count: int,
+                  spanning: bool = False) -> numpy.ndarray:
+  """Unpacks the count entries of the given bits from the longs into an
+  array of uint16. Entries are packed from the least significant bit.
+  Since 1.16 entries do not span two longs, leaving the high bits of
+  each long unused. Before, the entries formed one continuous stream of
+  bits, which 'spanning' selects."""
+  if not 0 < bits <= 16:
+    raise RegionError("""Expected 1 to 16 bits, but received %d!""" % bits)
+  longs = _toUnsigned(data)
+  mask = numpy.uint64((1 << bits) - 1)
+  if not spanning:
+    shifts = _getShifts(bits)
+    needed = -(-count // len(shifts))
+    if len(longs) < needed:
+      msg = """Expected at least %d longs, but received %d!"""
+      raise RegionError(msg % (needed, len(longs)))
+    values = (longs[:needed, None] >> shifts) & mask
+    return values.reshape(-1)[:count].astype(numpy.uint16)
+  if len(longs) * 64 < count * bits:
+    msg = """Expected at least %d bits, but received %d!"""
+    raise RegionError(msg % (count * bits, len(longs) * 64))
+  offsets = numpy.arange(count, dtype=numpy.uint64) * numpy.uint64(bits)
+  index = (offsets >> numpy.uint64(6)).astype(numpy.intp)
+  shift = offsets & numpy.uint64(63)
+  padded = numpy.append(longs, numpy.uint64(0))
+  low = padded[index] >> shift
+  spill = (shift + numpy.uint64(bits)) > numpy.uint64(64)
+  high = numpy.where(spill, padded[index + 1] << ((numpy.uint64(64) - shift)
+                                                  & numpy.uint64(63)), 0)
+  return ((low | high) & mask).astype(numpy.uint16)
+
+
+def paletteNames(palette: Any) -> numpy.ndarray:
+  """Returns the names of the palette as an array of objects. Block
+  palettes are lists of compounds of which the name is used, while biome
+  palettes are lists of names."""
+  names = numpy.empty(len(palette), object)
+  for (i, entry) in enumerate(palette):
+    names[i] = entry if isinstance(entry, str) else entry['Name']
+  return names
+
+
+def paletteIds(palette: Any, registry: dict[str, int]) -> numpy.ndarray:
+  """Returns the ids of the names of the palette in the registry as an
+  array of uint16. Names not in the registry are added with the next
+  id."""
+  names = paletteNames(palette)
+  return numpy.fromiter((registry.setdefault(name, len(registry))
+                         for name in names), numpy.uint16, len(names))
+
+
+def decodePaletted(data: Any, palette: numpy.ndarray, count: int,
+                   spanning: bool = False,
+                   minBits: int = 4) -> numpy.ndarray:
+  """Decodes the count entries of the packed data through the palette in
+  a single take. A palette of one entry has no data. The bits per entry
+  follow from the size of the palette, but at least minBits, unless the
+  length of the data disagrees, in which case they are inferred from
+  it."""
+  if len(palette) == 1:
+    return numpy.resize(palette, count)
+  if data is None:
+    raise RegionError("""Missing data of palette with several entries!""")
+  bits = max(minBits, (len(palette) - 1).bit_length())
+  longCount = len(data)
+  expected = -(-count * bits // 64) if spanning \
+    else -(-count // (64 // bits))
+  if expected != longCount:
+    bits = inferBits(longCount, count, spanning)
+  indices = unpackIndices(data, bits, count, spanning)
+  try:
+    return palette.take(indices)
+  except IndexError as exception:
+    msg = """Palette index exceeds the palette of %d entries!"""
+    raise RegionError(msg % len(palette)) from exception
+
+
+def decodeBlockStates(section: Any, registry: dict[str, int] = None,
+                      dataVersion: int = None) -> numpy.ndarray | None:
+  """Decodes the blocks of the chunk section into an array of shape
+  (16, 16, 16) indexed by y, z and x. The blocks are given by their ids
+  in the registry if given and otherwise by name. Both the block_states
+  compound of 1.18 and the Palette and BlockStates of earlier versions
+  are read. The data version selects the layout of the longs and
+  defaults to non-spanning. Returns None for sections without blocks."""
+  states = section.get('block_states')
+  if states is not None:
+    palette, data = states.get('palette'), states.get('data')
+  else:
+    palette, data = section.get('Palette'), section.get('BlockStates')
+  if palette is None or not len(palette):
+    return None
+  spanning = dataVersion is not None and dataVersion < SPANNING_VERSION
+  entries = paletteNames(palette) if registry is None \
+    else paletteIds(palette, registry)
+  blocks = decodePaletted(data, entries, 4096, spanning)
+  return blocks.reshape(16, 16, 16)
+
+
+def decodeBiomes(section: Any,
+                 registry: dict[str, int] = None) -> numpy.ndarray | None:
+  """Decodes the biomes of the chunk section into an array of shape
+  (4, 4, 4) indexed by y, z and x of each cell of four blocks. Returns
+  None for sections without biomes."""
+  biomes = section.get('biomes')
+  if biomes is None:
+    return None
+  palette = biomes.get('palette')
+  if palette is None or not len(palette):
+    return None
+  entries = paletteNames(palette) if registry is None \
+    else paletteIds(palette, registry)
+  values = decodePaletted(biomes.get('data'), entries, 64, minBits=1)
+  return values.reshape(4, 4, 4)
+
+
+def decodeHeightmap(data: Any, spanning: bool = False) -> numpy.ndarray:
+  """Decodes the heightmap into an array of shape (16, 16) of uint16
+  indexed by z and x. The heights are counted from the bottom of the
+  world, such that the minimum build height must be added to give the y
+  coordinate."""
+  bits = inferBits(len(data), 256, spanning)
+  return unpackIndices(data, bits, 256, spanning).reshape(16, 16)
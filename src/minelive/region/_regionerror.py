@@ -0,0 +1,13 @@
+"""RegionError is raised when a region file is damaged or uses an
+unsupported format."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+
+class RegionError(ValueError):
+  """RegionError is raised when a region file is damaged, such as when a
+  chunk points beyond the end of the file, or when a chunk uses an
+  unsupported compression.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
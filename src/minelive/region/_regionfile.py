@@ -0,0 +1,253 @@
+"""RegionFile reads the chunks of an Anvil region file on demand."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import struct
+import zlib
+from typing import NoReturn
+
+import numpy
+
+from minelive.nbt import NbtCompound
+from minelive.region import Settings, RegionError, ChunkCache, chunkCache
+
+GZIP, ZLIB, NONE, LZ4, CUSTOM = 1, 2, 3, 4, 127
+EXTERNAL = 0x80
+
+_chunkHeader = struct.Struct('>IB')
+_regionName = re.compile(r'r\.(-?\d+)\.(-?\d+)\.mca$')
+
+
+def decompressChunk(payload: bytes, compression: int) -> bytes:
+  """Returns the payload decompressed by the compression type of the
+  chunk. Raises RegionError for LZ4 and custom compression, which the
+  standard library cannot decompress."""
+  try:
+    if compression == ZLIB:
+      return zlib.decompress(payload)
+    if compression == GZIP:
+      return zlib.decompress(payload, 31)
+  except zlib.error as exception:
+    raise RegionError("""Unable to decompress chunk!""") from exception
+  if compression == NONE:
+    return bytes(payload)
+  msg = """Unsupported chunk compression type %d!"""
+  raise RegionError(msg % compression)
+
+
+class RegionFile:
+  """RegionFile reads the chunks of an Anvil region file on demand. The
+  file is memory mapped, and only the 8 KiB header is parsed when the
+  file is opened, into arrays of the sector offset, sector count and
+  timestamp of each of the 1024 chunks. Listing the chunks present thus
+  never touches their payloads, which are read from the mapping and
+  decompressed only when a chunk is requested. Chunks too large for the
+  region are stored in external .mcc files next to it, which are read
+  when required.
+
+  The game rewrites region files while running. Before a chunk is read,
+  the modification time and size of the file are compared with those
+  recorded when it was mapped, and if either changed, the file is mapped
+  again and its header parsed again.
+
+  Decoded chunks are kept in a ChunkCache shared by all regions, keyed by
+  the path of the region and stamped with the header entry of the chunk.
+  Chunk coordinates may be given either within the region or in the
+  world, as only the low five bits are used.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  def __init__(self, path: str, cache: ChunkCache = None) -> None:
+    self._path = os.path.abspath(path)
+    self._cache = chunkCache if cache is None else cache
+    match = _regionName.search(os.path.basename(path))
+    self._regionX = int(match.group(1)) if match else None
+    self._regionZ = int(match.group(2)) if match else None
+    self._file = None
+    self._map = None
+    self._stat = None
+    self._closed = False
+    self._open()
+    self._readCount = 0
+
+  def _open(self) -> NoReturn:
+    """Opens and maps the file and parses its header. The modification
+    time and size of the file are recorded, such that 'refresh' notices
+    when the file is written."""
+    self._file = open(self._path, 'rb')
+    try:
+      stat = os.fstat(self._file.fileno())
+      if stat.st_size >= 2 * Settings.sectorSize:
+        self._map = mmap.mmap(self._file.fileno(), 0,
+                              access=mmap.ACCESS_READ)
+    except OSError:
+      self._file.close()
+      raise
+    self._stat = (stat.st_mtime_ns, stat.st_size)
+    self._readHeader()
+
+  def _release(self) -> NoReturn:
+    """Closes the mapping and the file"""
+    if self._map is not None:
+      self._map.close()
+      self._map = None
+    self._file.close()
+
+  def refresh(self) -> bool:
+    """Maps the file again and parses its header if the modification time
+    or size of the file changed since it was mapped, such that chunks
+    written since are read from their new sectors. Returns True if the
+    file was mapped again."""
+    if self._closed:
+      raise RegionError("""Region %s is closed!""" % self._path)
+    try:
+      stat = os.stat(self._path)
+    except FileNotFoundError as exception:
+      msg = """Region %s no longer exists!"""
+      raise RegionError(msg % self._path) from exception
+    if (stat.st_mtime_ns, stat.st_size) == self._stat:
+      return False
+    self._release()
+    self._open()
+    return True
+
+  def _readHeader(self) -> NoReturn:
+    """Parses the location and timestamp tables of the header. The
+    arrays are copied to native byte order, such that no view of the
+    mapping outlives it."""
+    if self._map is None:
+      header = numpy.zeros(2048, numpy.uint32)
+    else:
+      header = numpy.frombuffer(self._map, '>u4', 2048).astype(numpy.uint32)
+    locations = header[:1024]
+    self._offsets = locations >> 8
+    self._sectors = (locations & 0xff).astype(numpy.uint8)
+    self._timestamps = header[1024:]
+
+  def getPath(self) -> str:
+    """Getter-function for the path of the region file"""
+    return self._path
+
+  def getRegionCoords(self) -> tuple[int, int] | None:
+    """Getter-function for the coordinates of the region given by the
+    name of the file"""
+    if self._regionX is None:
+      return None
+    return self._regionX, self._regionZ
+
+  def getOffsets(self) -> numpy.ndarray:
+    """Getter-function for the sector offset of each chunk, which is 0
+    for chunks not present"""
+    return self._offsets
+
+  def getSectorCounts(self) -> numpy.ndarray:
+    """Getter-function for the number of sectors of each chunk"""
+    return self._sectors
+
+  def getTimestamps(self) -> numpy.ndarray:
+    """Getter-function for the time each chunk was last saved in seconds
+    since the epoch"""
+    return self._timestamps
+
+  def getChunkCount(self) -> int:
+    """Getter-function for the number of chunks present"""
+    return int(numpy.count_nonzero(self._offsets))
+
+  def getChunkCoords(self, world: bool = True) -> numpy.ndarray:
+    """Returns the coordinates of the chunks present as an array of shape
+    (n, 2) of x and z. The coordinates are in the world if known from the
+    name of the file, unless world is False."""
+    indices = numpy.flatnonzero(self._offsets).astype(numpy.int32)
+    coords = numpy.column_stack((indices & 31, indices >> 5))
+    if world and self._regionX is not None:
+      coords += (self._regionX * 32, self._regionZ * 32)
+    return coords
+
+  def hasChunk(self, x: int, z: int) -> bool:
+    """Flag indicating whether the chunk is present"""
+    return bool(self._offsets[(x & 31) | (z & 31) << 5])
+
+  def getTimestamp(self, x: int, z: int) -> int:
+    """Getter-function for the time the chunk was last saved"""
+    return int(self._timestamps[(x & 31) | (z & 31) << 5])
+
+  def _readExternal(self, x: int, z: int) -> bytes:
+    """Reads the payload of the chunk from its external file"""
+    if self._regionX is None:
+      msg = """Unable to locate the external chunk of %s!"""
+      raise RegionError(msg % self._path)
+    name = 'c.%d.%d.mcc' % (self._regionX * 32 + (x & 31),
+                            self._regionZ * 32 + (z & 31))
+    try:
+      with open(os.path.join(os.path.dirname(self._path), name), 'rb') as f:
+        return f.read()
+    except FileNotFoundError as exception:
+      msg = """Missing external chunk file %s!"""
+      raise RegionError(msg % name) from exception
+
+  def readData(self, x: int, z: int) -> bytes | None:
+    """Reads and decompresses the NBT data of the chunk, bypassing the
+    cache. Returns None if the chunk is not present."""
+    self.refresh()
+    return self._readData(x, z)
+
+  def _readData(self, x: int, z: int) -> bytes | None:
+    """Reads and decompresses the NBT data of the chunk from the current
+    mapping"""
+    index = (x & 31) | (z & 31) << 5
+    offset = int(self._offsets[index])
+    if not offset or self._map is None:
+      return None
+    start = offset * Settings.sectorSize
+    end = start + int(self._sectors[index]) * Settings.sectorSize
+    if start + _chunkHeader.size > len(self._map):
+      msg = """Chunk %d, %d of %s starts beyond the end of the file!"""
+      raise RegionError(msg % (x & 31, z & 31, self._path))
+    length, compression = _chunkHeader.unpack_from(self._map, start)
+    self._readCount += 1
+    if compression & EXTERNAL:
+      payload = self._readExternal(x, z)
+    else:
+      stop = start + 4 + length
+      if length < 1 or stop > min(end, len(self._map)):
+        msg = """Chunk %d, %d of %s exceeds its sectors!"""
+        raise RegionError(msg % (x & 31, z & 31, self._path))
+      payload = self._map[start + 5:stop]
+    return decompressChunk(payload, compression & ~EXTERNAL)
+
+  def readChunk(self, x: int, z: int) -> NbtCompound | None:
+    """Returns the root compound of the chunk, decoding it only if not
+    cached. Returns None if the chunk is not present."""
+    self.refresh()
+    index = (x & 31) | (z & 31) << 5
+    key = (self._path, index)
+    stamp = (int(self._offsets[index]), int(self._sectors[index]),
+             int(self._timestamps[index]))
+    root = self._cache.get(key, stamp)
+    if root is not None:
+      return root
+    data = self._readData(x, z)
+    if data is None:
+      return None
+    return self._cache.put(key, stamp, data)
+
+  def getReadCount(self) -> int:
+    """Getter-function for the number of chunk payloads read"""
+    return self._readCount
+
+  def close(self) -> NoReturn:
+    """Closes the mapping and the file"""
+    self._closed = True
+    self._release()
+
+  def __enter__(self) -> RegionFile:
+    """Implementation of context manager"""
+    return self
+
+  def __exit__(self, *_) -> None:
+    """Closes the region on exit"""
+    self.close()
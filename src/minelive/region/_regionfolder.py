@@ -0,0 +1,114 @@
+"""RegionFolder reads the chunks of a dimension from its folder of region
+files."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import os
+import re
+from collections import OrderedDict
+from typing import NoReturn, Iterator
+
+import numpy
+
+from minelive.nbt import NbtCompound
+from minelive.region import Settings, ChunkCache, RegionFile
+
+_regionName = re.compile(r'r\.(-?\d+)\.(-?\d+)\.mca$')
+
+
+class RegionFolder:
+  """RegionFolder reads the chunks of a dimension from its folder of
+  region files, such as 'world/region'. The folder is listed once when
+  first required and again on 'refresh'. Regions are opened on demand and
+  at most Settings.openRegions are kept open, closing the least recently
+  used. Enumerating the chunks reads only the headers of the regions.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  def __init__(self, path: str, cache: ChunkCache = None) -> None:
+    self._path = path
+    self._cache = cache
+    self._paths = None
+    self._regions = OrderedDict()
+
+  def refresh(self) -> NoReturn:
+    """Lists the region files again and closes the open regions"""
+    self.close()
+    self._paths = None
+
+  def getRegionPaths(self) -> dict[tuple[int, int], str]:
+    """Getter-function for the paths of the region files by their
+    coordinates"""
+    if self._paths is None:
+      paths = {}
+      with os.scandir(self._path) as entries:
+        for entry in entries:
+          match = _regionName.match(entry.name)
+          if match is not None:
+            coords = (int(match.group(1)), int(match.group(2)))
+            paths[coords] = entry.path
+      self._paths = paths
+    return self._paths
+
+  def getRegion(self, regionX: int, regionZ: int) -> RegionFile | None:
+    """Getter-function for the region at the coordinates or None if it
+    does not exist"""
+    coords = (regionX, regionZ)
+    region = self._regions.get(coords)
+    if region is not None:
+      self._regions.move_to_end(coords)
+      return region
+    path = self.getRegionPaths().get(coords)
+    if path is None:
+      return None
+    region = self._regions[coords] = RegionFile(path, self._cache)
+    while len(self._regions) > Settings.openRegions:
+      self._regions.popitem(last=False)[1].close()
+    return region
+
+  def iterRegions(self) -> Iterator[RegionFile]:
+    """Iterates over the regions in the order of their coordinates"""
+    for coords in sorted(self.getRegionPaths()):
+      region = self.getRegion(*coords)
+      if region is not None:
+        yield region
+
+  def getChunkCoords(self) -> numpy.ndarray:
+    """Returns the world coordinates of every chunk present as an array of
+    shape (n, 2) of x and z"""
+    coords = [region.getChunkCoords() for region in self.iterRegions()]
+    if not coords:
+      return numpy.zeros((0, 2), numpy.int32)
+    return numpy.concatenate(coords)
+
+  def getChunkCount(self) -> int:
+    """Getter-function for the number of chunks present"""
+    return sum(region.getChunkCount() for region in self.iterRegions())
+
+  def readChunk(self, chunkX: int, chunkZ: int) -> NbtCompound | None:
+    """Returns the root compound of the chunk at the world coordinates or
+    None if it is not present"""
+    region = self.getRegion(chunkX >> 5, chunkZ >> 5)
+    if region is None:
+      return None
+    return region.readChunk(chunkX, chunkZ)
+
+  def getReadCount(self) -> int:
+    """Getter-function for the number of chunk payloads read from the open
+    regions"""
+    return sum(region.getReadCount() for region in self._regions.values())
+
+  def close(self) -> NoReturn:
+    """Closes the open regions"""
+    regions, self._regions = self._regions, OrderedDict()
+    for region in regions.values():
+      region.close()
+
+  def __enter__(self) -> RegionFolder:
+    """Implementation of context manager"""
+    return self
+
+  def __exit__(self, *_) -> None:
+    """Closes the regions on exit"""
+    self.close()
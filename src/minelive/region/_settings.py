@@ -0,0 +1,14 @@
+"""The Settings class provides the settings used by the region package."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+
+class Settings:
+  """The Settings class provides the settings used by the region package.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  sectorSize = 4096
+  chunkCacheBytes = 64 << 20
+  openRegions = 64
@@ -3,28 +3,63 @@
 #  Copyright (c) 2023 Asger Jon Vistisen
 from __future__ import annotations
 
-from ._invalidnamespaceerror import InvalidNameSpaceError
-from ._keytype import keyType
-from ._args import Args
-from ._keys import Keys
-from ._accessorerror import AccessorError
-from ._secretpropertyerror import SecretPropertyError
-from ._readonlyerror import ReadOnlyError
-from ._protectedpropertyerror import ProtectedPropertyError
-from ._permissionlevel import PermissionLevel
-from ._abstractfield import AbstractField
-from ._field import Field
-from ._constant import Constant
-from ._namespace import NameSpace
-from ._worktypemeta import WorkTypeMeta
-from ._worktype import WorkType
-from ._enumify import Enumify, EnumifyMeta
-from ._argumenterror import ArgumentError
-from ._illegalaccessorfunction import noAcc, Accessor
-from ._categorify import Categorify
-from ._textbetween import textBetween
-from ._floatfield import FloatField
-from ._index import Index
-from ._typekey import TypeKey
-from ._parentparser import parentParser
-from ._itermeta import Iterify
+from typing import TYPE_CHECKING
+
+from moreworktoy._lazyexports import lazyExports
+
+if TYPE_CHECKING:
+  from ._invalidnamespaceerror import InvalidNameSpaceError
+  from ._keytype import keyType
+  from ._args import Args
+  from ._keys import Keys
+  from ._accessorerror import AccessorError
+  from ._secretpropertyerror import SecretPropertyError
+  from ._readonlyerror import ReadOnlyError
+  from ._protectedpropertyerror import ProtectedPropertyError
+  from ._permissionlevel import PermissionLevel
+  from ._abstractfield import AbstractField
+  from ._field import Field
+  from ._constant import Constant
+  from ._namespace import NameSpace
+  from ._worktypemeta import WorkTypeMeta
+  from ._worktype import WorkType
+  from ._enumify import Enumify, EnumifyMeta
+  from ._argumenterror import ArgumentError
+  from ._illegalaccessorfunction import noAcc, Accessor
+  from ._categorify import Categorify
+  from ._textbetween import textBetween
+  from ._floatfield import FloatField
+  from ._index import Index
+  from ._typekey import TypeKey
+  from ._parentparser import parentParser
+  from ._itermeta import Iterify
+
+__getattr__, __dir__ = lazyExports(__name__, {
+  'InvalidNameSpaceError': '._invalidnamespaceerror',
+  'keyType': '._keytype',
+  'Args': '._args',
+  'Keys': '._keys',
+  'AccessorError': '._accessorerror',
+  'SecretPropertyError': '._secretpropertyerror',
+  'ReadOnlyError': '._readonlyerror',
+  'ProtectedPropertyError': '._protectedpropertyerror',
+  'PermissionLevel': '._permissionlevel',
+  'AbstractField': '._abstractfield',
+  'Field': '._field',
+  'Constant': '._constant',
+  'NameSpace': '._namespace',
+  'WorkTypeMeta': '._worktypemeta',
+  'WorkType': '._worktype',
+  'Enumify': '._enumify',
+  'EnumifyMeta': '._enumify',
+  'ArgumentError': '._argumenterror',
+  'noAcc': '._illegalaccessorfunction',
+  'Accessor': '._illegalaccessorfunction',
+  'Categorify': '._categorify',
+  'textBetween': '._textbetween',
+  'FloatField': '._floatfield',
+  'Index': '._index',
+  'TypeKey': '._typekey',
+  'parentParser': '._parentparser',
+  'Iterify': '._itermeta',
+})
@@ -8,7 +8,6 @@ from abc import abstractmethod
 from typing import Never, Any
 from warnings import warn
 
-from icecream import ic
 from worktoy.parsing import maybeType
 from worktoy.stringtools import monoSpace
 from worktoy.typetools import CallMeMaybe
@@ -17,8 +16,6 @@ from moreworktoy import ProtectedPropertyError, ReadOnlyError, \
   SecretPropertyError, Args
 from moreworktoy import PermissionLevel as PermLvl
 
-ic.configureOutput(includeContext=True)
-
 
 class AbstractField:
   """Field quickly provides a property to a class. Specify default value,
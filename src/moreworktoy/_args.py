@@ -5,11 +5,8 @@ from __future__ import annotations
 
 from typing import Any
 
-from icecream import ic
 from worktoy.stringtools import monoSpace
 
-ic.configureOutput(includeContext=True)
-
 
 class Args(list):
   """Args is a subclass of list organizing the positional arguments. To
@@ -3,12 +3,9 @@
 #  Copyright (c) 2023 Asger Jon Vistisen
 from __future__ import annotations
 
-from icecream import ic
 from worktoy.parsing import maybeTypes
 from worktoy.waitaminute import ExceptionCore
 
-ic.configureOutput(includeContext=True)
-
 
 class ArgumentError(ExceptionCore):
   """ArgumentError should be invoked where required arguments are missing.
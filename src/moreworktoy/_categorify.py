@@ -3,10 +3,6 @@
 #  Copyright (c) 2023 Asger Jon Vistisen
 from __future__ import annotations
 
-from icecream import ic
-
-ic.configureOutput(includeContext=True)
-
 
 class _CategorifyMeta(type):
   """Categorify is an alternative to Enum
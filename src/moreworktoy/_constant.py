@@ -6,12 +6,8 @@ existence of the instance. The type is inferred automatically."""
 #  Copyright (c) 2023 Asger Jon Vistisen
 from __future__ import annotations
 
-from icecream import ic
-
 from moreworktoy import PermissionLevel, Field
 
-ic.configureOutput(includeContext=True)
-
 
 class Constant(Field):
   """Constant subclasses Field to provide a simplified version when fields
@@ -3,10 +3,8 @@
 #  Copyright (c) 2023 Asger Jon Vistisen
 from __future__ import annotations
 
-from icecream import ic
 from worktoy.waitaminute import InstantiationError
 
-ic.configureOutput(includeContext=True)
 
 Bases = tuple[type, ...]
 
@@ -5,12 +5,9 @@ from __future__ import annotations
 
 from typing import NoReturn
 
-from icecream import ic
 from worktoy.core import maybe
 from worktoy.field import BaseField
 
-ic.configureOutput(includeContext=True)
-
 
 class FloatField(BaseField):
   """FloatField is a Field representing floating points
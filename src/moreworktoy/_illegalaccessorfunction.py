@@ -6,7 +6,6 @@ from __future__ import annotations
 from enum import Enum, IntEnum
 from typing import Never
 
-from icecream import ic
 from worktoy.core import maybe
 from worktoy.parsing import extractArg, maybeType
 from worktoy.stringtools import stringList, monoSpace
@@ -15,8 +14,6 @@ from worktoy.waitaminute import ReadOnlyError, UnexpectedStateError
 
 from moreworktoy import ArgumentError
 
-ic.configureOutput(includeContext=True)
-
 
 class Accessor(IntEnum):
   """Accessor types"""
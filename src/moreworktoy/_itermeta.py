@@ -8,11 +8,9 @@ from typing import NoReturn
 
 from worktoy.core import maybe
 from worktoy.typetools import CallMeMaybe
-from icecream import ic
 from worktoy.waitaminute import ProceduralError
 
 Bases = tuple[type, ...]
-ic.configureOutput(includeContext=True)
 
 
 class IterMeta(type):
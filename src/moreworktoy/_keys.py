@@ -6,14 +6,11 @@ from __future__ import annotations
 
 from typing import Any
 
-from icecream import ic
 from worktoy.core import maybe
 from worktoy.stringtools import stringList
 
 from moreworktoy import Args
 
-ic.configureOutput(includeContext=True)
-
 
 class Keys(list):
   """cunts"""
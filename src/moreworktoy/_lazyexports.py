@@ -0,0 +1,39 @@
+"""The lazyExports function lets a package import its submodules on first
+use of the names it exports."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import sys
+from typing import Callable
+
+
+def lazyExports(packageName: str,
+                exports: dict[str, str]) -> tuple[Callable, Callable]:
+  """Returns the module level '__getattr__' and '__dir__' of the package
+  of the given name. The exports map each name exported by the package to
+  the submodule defining it, given relative to the package. A name is
+  imported from its submodule the first time it is accessed on the
+  package, including through 'from package import name', and is then
+  stored on the package, such that later access does not reach
+  '__getattr__' again. Packages should repeat the imports under
+  TYPE_CHECKING for the benefit of type checkers and editors."""
+
+  def __getattr__(name: str) -> object:
+    """Imports the exported name from its submodule"""
+    moduleName = exports.get(name)
+    if moduleName is None:
+      msg = """module '%s' has no attribute '%s'"""
+      raise AttributeError(msg % (packageName, name))
+    fullName = packageName + moduleName
+    __import__(fullName)
+    value = getattr(sys.modules[fullName], name)
+    setattr(sys.modules[packageName], name, value)
+    return value
+
+  def __dir__() -> list[str]:
+    """Lists the attributes of the package including the exports not yet
+    imported"""
+    return sorted({*vars(sys.modules[packageName]), *exports})
+
+  return __getattr__, __dir__
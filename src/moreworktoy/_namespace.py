@@ -6,12 +6,8 @@ from __future__ import annotations
 
 from typing import Any, Never
 
-from icecream import ic
-
 from moreworktoy import Field, ReadOnlyError, ProtectedPropertyError
 
-ic.configureOutput(includeContext=True)
-
 
 class NameSpace(dict):
   """NameSpace provides a flexible mapping for use in the __prepare__ method
@@ -6,7 +6,6 @@ from __future__ import annotations
 import typing
 from typing import TYPE_CHECKING
 
-from icecream import ic
 from worktoy.stringtools import justify
 from worktoy.typetools import CallMeMaybe
 from worktoy.waitaminute import UnexpectedStateError, ProceduralError
@@ -20,8 +19,6 @@ else:
 
 Bases = tuple[type, ...]
 
-ic.configureOutput(includeContext=True)
-
 
 class OverloadMeta(type):
   """OverLoad is a metaclass enabling overloading
@@ -6,10 +6,6 @@ not be reused."""
 #  Copyright (c) 2023 Asger Jon Vistisen
 from __future__ import annotations
 
-from icecream import ic
-
-ic.configureOutput(includeContext=True)
-
 
 def takeArg(type_: type, *args, ) -> dict:
   """The takeArg function removes from a series of positional arguments the
@@ -4,10 +4,6 @@
 from __future__ import annotations
 import re
 
-from icecream import ic
-
-ic.configureOutput(includeContext=True)
-
 
 def textBetween(text, openTag, closeTag) -> list[str]:
   """The textBetween function finds text between given tags
@@ -9,11 +9,9 @@ from typing import Self, Any
 
 from worktoy.core import plenty
 from worktoy.stringtools import monoSpace
-from icecream import ic
 
 from moreworktoy import PermissionLevel, Field
 
-ic.configureOutput(includeContext=True)
 readOnly = PermissionLevel.READ_ONLY
 
 
@@ -7,7 +7,6 @@ from __future__ import annotations
 import os
 import time
 
-from icecream import ic
 import builtins
 
 from worktoy.stringtools import stringList
@@ -37,4 +36,3 @@ def customImport(name, gls=None, lcs=None, fromlist=(), level=0):
 
 
 builtins.__import__ = customImport
-ic.configureOutput(includeContext=True)
@@ -4,6 +4,17 @@ effects."""
 #  Copyright (c) 2023 Asger Jon Vistisen
 from __future__ import annotations
 
-from ._settings import Settings
-from ._soundeffect import SoundEffect
-from ._soundenum import Sound
+from typing import TYPE_CHECKING
+
+from moreworktoy import lazyExports
+
+if TYPE_CHECKING:
+  from ._settings import Settings
+  from ._soundeffect import SoundEffect
+  from ._soundenum import Sound
+
+__getattr__, __dir__ = lazyExports(__name__, {
+  'Settings': '._settings',
+  'SoundEffect': '._soundeffect',
+  'Sound': '._soundenum',
+})
@@ -5,10 +5,6 @@ variables. """
 #  Copyright (c) 2023 Asger Jon Vistisen
 from __future__ import annotations
 
-from icecream import ic
-
-ic.configureOutput(includeContext=True)
-
 
 class Settings:
   """The Settings class provides all of the Settings used by the audio
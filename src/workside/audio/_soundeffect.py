@@ -6,7 +6,6 @@ from __future__ import annotations
 from PySide6.QtCore import QObject
 from PySide6.QtMultimedia import QSoundEffect, QAudioDevice, QMediaDevices
 from PySide6.QtWidgets import QApplication
-from icecream import ic
 from worktoy.core import maybe, plenty
 from worktoy.parsing import searchKeys, maybeType
 from worktoy.stringtools import stringList
@@ -15,7 +14,6 @@ from moreworktoy import ArgumentError
 from workside.audio import Settings
 from workside.widgets import CoreWidget
 
-ic.configureOutput(includeContext=True)
 Device = QAudioDevice
 
 
@@ -8,7 +8,6 @@ from typing import Never
 
 from PySide6.QtCore import QUrl, QObject
 from PySide6.QtWidgets import QApplication
-from icecream import ic
 from worktoy.core import maybe
 from worktoy.parsing import extractArg
 from worktoy.stringtools import stringList
@@ -18,8 +17,6 @@ from moreworktoy import Iterify
 from workside.audio import SoundEffect, Settings
 from workside.widgets import CoreWidget
 
-ic.configureOutput(includeContext=True)
-
 
 class _SoundProperties(Iterify):
   """Class containing the properties for the sound class"""
@@ -4,6 +4,10 @@ in the WorkSide framework"""
 #  Copyright (c) 2023 Asger Jon Vistisen
 from __future__ import annotations
 
+import os
+import sys
+
+from PySide6.QtGui import QGuiApplication
 from PySide6.QtWidgets import QWidget
 from worktoy.parsing import extractArg
 from worktoy.stringtools import stringList
@@ -15,4 +19,31 @@ def parseParent(*args, **kwargs) -> QWidget:
   parent, args, kwargs = extractArg(QWidget, parentKeys, *args, **kwargs)
   if isinstance(parent, QWidget):
     return parent
- 
\ No newline at end of file
+ 
+
+def frameInterval(widget: QWidget = None) -> int:
+  """Returns the interval in milliseconds between frames on the screen
+  showing the given widget, falling back to the primary screen and then
+  to 60 frames per second."""
+  screen = widget.screen() if isinstance(widget, QWidget) else None
+  if screen is None:
+    screen = QGuiApplication.primaryScreen()
+  rate = screen.refreshRate() if screen is not None else 0
+  return max(1, int(1000 / rate)) if rate > 0 else 16
+
+
+def residentMemory() -> int:
+  """Returns the resident memory of the process in bytes. On Linux, this
+  is read from /proc/self/statm. Elsewhere, the peak resident memory is
+  returned if available and otherwise 0."""
+  try:
+    with open('/proc/self/statm', 'rb') as statm:
+      return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+  except (OSError, ValueError, IndexError, AttributeError):
+    pass
+  try:
+    import resource
+  except ImportError:
+    return 0
+  peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  return peak if sys.platform == 'darwin' else peak * 1024
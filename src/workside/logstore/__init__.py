@@ -0,0 +1,23 @@
+"""The logstore package persists log messages outside of the widgets
+showing them."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from moreworktoy import lazyExports
+
+if TYPE_CHECKING:
+  from ._logindex import tokenize, parseQuery, matchesQuery, LogIndex
+  from ._logsink import LogSink
+  from ._segmentstore import SegmentStore
+
+__getattr__, __dir__ = lazyExports(__name__, {
+  'tokenize': '._logindex',
+  'parseQuery': '._logindex',
+  'matchesQuery': '._logindex',
+  'LogIndex': '._logindex',
+  'LogSink': '._logsink',
+  'SegmentStore': '._segmentstore',
+})
@@ -0,0 +1,223 @@
+"""LogIndex is an inverted index from the words of log messages to the
+sequence numbers of the messages containing them."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import NoReturn
+
+from workside.settings import Settings
+
+_wordPattern = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> list[str]:
+  """Returns the lowercase words in the text"""
+  return _wordPattern.findall(text.lower())
+
+
+def parseQuery(query: str) -> tuple[list[str], str | None]:
+  """Parses the query into the complete words and the word being typed.
+  The last word is taken as a prefix unless the query ends with
+  whitespace."""
+  words = tokenize(query)
+  if not words or not _wordPattern.match(query[-1]):
+    return words, None
+  return words[:-1], words[-1]
+
+
+def matchesQuery(text: str, words: list[str], prefix: str = None) -> bool:
+  """Checks if the text contains every word and, if given, a word starting
+  with the prefix. This applies the query to a single message without
+  the index."""
+  found = set(tokenize(text))
+  for word in words:
+    if word not in found:
+      return False
+  if prefix is None:
+    return True
+  for word in found:
+    if word.startswith(prefix):
+      return True
+  return False
+
+
+class LogIndex:
+  """LogIndex is an inverted index from the words of log messages to the
+  sequence numbers of the messages containing them. Messages are numbered
+  in the order they are added starting from the given start, such that
+  the numbers may continue those of a SegmentStore.
+
+  The posting list of each word is kept in blocks of fixed size. The
+  first number of each block is kept in an array of block heads, while
+  the remaining numbers are kept as differences to the preceding number
+  in an array of the smallest type fitting the largest difference. A
+  word found on most lines takes a byte per line. Numbers not yet filling
+  a block are kept in a list until the block is sealed.
+
+  Lookups taking a lower bound skip directly to the first block that may
+  contain it by bisecting the block heads. This keeps queries confined
+  to the messages still shown by the LogModel fast regardless of the
+  total number of messages indexed.
+
+  The index may be extended from one thread while queried from another.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  def __init__(self, start: int = 0, blockSize: int = None) -> None:
+    self._blockSize = blockSize or Settings.logIndexBlockSize
+    self._lock = threading.Lock()
+    self._tails = {}
+    self._heads = {}
+    self._blocks = {}
+    self._vocabulary = []
+    self._newWords = []
+    self._start = start
+    self._count = start
+
+  def __len__(self) -> int:
+    """The sequence number of the next message to be indexed"""
+    return self._count
+
+  def getStart(self) -> int:
+    """Getter-function for the sequence number of the first message
+    indexed"""
+    return self._start
+
+  def getVocabularySize(self) -> int:
+    """Getter-function for the number of distinct words"""
+    return len(self._tails)
+
+  def append(self, message: str) -> NoReturn:
+    """Indexes the message"""
+    self.extend([message])
+
+  def extend(self, messages: list[str]) -> NoReturn:
+    """Indexes the messages. Large batches are indexed in chunks releasing
+    the lock in between such that queries are not held up."""
+    chunk = Settings.logIndexChunk
+    for i in range(0, len(messages), chunk):
+      with self._lock:
+        self._extend(messages[i:i + chunk])
+
+  def _extend(self, messages: list[str]) -> NoReturn:
+    """Indexes the messages holding the lock"""
+    tails, newWords = self._tails, self._newWords
+    findAll = _wordPattern.findall
+    seq = self._count
+    touched = set()
+    for message in messages:
+      words = set(findAll(message.lower()))
+      for word in words:
+        tail = tails.get(word)
+        if tail is None:
+          tails[word] = [seq]
+          newWords.append(word)
+        else:
+          tail.append(seq)
+      touched |= words
+      seq += 1
+    self._count = seq
+    blockSize = self._blockSize
+    for word in touched:
+      if len(tails[word]) >= blockSize:
+        self._seal(word)
+    if len(newWords) > Settings.logIndexMergeSize:
+      self._mergeVocabulary()
+
+  def _seal(self, word: str) -> NoReturn:
+    """Moves the full blocks of the word from its tail into compressed
+    blocks"""
+    tail, blockSize = self._tails[word], self._blockSize
+    heads = self._heads.get(word)
+    if heads is None:
+      heads = self._heads[word] = array('I')
+      self._blocks[word] = []
+    blocks = self._blocks[word]
+    sealed = len(tail) - len(tail) % blockSize
+    for i in range(0, sealed, blockSize):
+      block = tail[i:i + blockSize]
+      deltas = [b - a for a, b in zip(block, block[1:])]
+      largest = max(deltas)
+      typeCode = 'B' if largest < 256 else 'H' if largest < 65536 else 'I'
+      heads.append(block[0])
+      blocks.append(array(typeCode, deltas))
+    del tail[:sealed]
+
+  def _mergeVocabulary(self) -> NoReturn:
+    """Merges the new words into the sorted vocabulary"""
+    self._vocabulary.extend(self._newWords)
+    self._vocabulary.sort()
+    self._newWords = []
+
+  def lookup(self, word: str, since: int = 0) -> list[int]:
+    """Returns the sequence numbers of the messages containing the word
+    starting from 'since' in ascending order."""
+    with self._lock:
+      return self._lookup(word, since)
+
+  def _lookup(self, word: str, since: int) -> list[int]:
+    """Implementation of lookup holding the lock"""
+    tail = self._tails.get(word)
+    if tail is None:
+      return []
+    out = []
+    heads = self._heads.get(word)
+    if heads:
+      blocks = self._blocks[word]
+      first = max(bisect_right(heads, since) - 1, 0)
+      for head, deltas in zip(heads[first:], blocks[first:]):
+        out.extend(accumulate(deltas, initial=head))
+      if out and out[0] < since:
+        del out[:bisect_left(out, since)]
+    if tail and tail[-1] >= since:
+      out.extend(tail[bisect_left(tail, since):])
+    return out
+
+  def estimate(self, word: str) -> int:
+    """Returns the number of messages containing the word"""
+    blocks = self._blocks.get(word)
+    count = len(blocks) * self._blockSize if blocks else 0
+    return count + len(self._tails.get(word, ()))
+
+  def expand(self, prefix: str, limit: int = None) -> list[str] | None:
+    """Returns the words starting with the prefix. If more than 'limit'
+    words match, None is returned instead."""
+    with self._lock:
+      vocabulary = self._vocabulary
+      start = bisect_left(vocabulary, prefix)
+      end = bisect_left(vocabulary, '%s\U0010ffff' % prefix, start)
+      out = vocabulary[start:end]
+      out.extend(w for w in self._newWords if w.startswith(prefix))
+    if limit is not None and len(out) > limit:
+      return None
+    return out
+
+  def search(self, words: list[str], prefix: str = None,
+             since: int = 0) -> list[int] | None:
+    """Returns the sequence numbers from 'since' in ascending order of the
+    messages containing every word and, if given, a word starting with
+    the prefix. If neither words nor prefix are given, None is returned
+    indicating that every message matches."""
+    expanded = None if prefix is None else self.expand(prefix)
+    with self._lock:
+      words = sorted(set(words), key=self.estimate)
+      if not words and expanded is None:
+        return None
+      if words:
+        matches = set(self._lookup(words[0], since))
+        for word in words[1:]:
+          if not matches:
+            break
+          matches.intersection_update(self._lookup(word, since))
+      if expanded is not None:
+        union = set()
+        for word in expanded:
+          union.update(self._lookup(word, since))
+        matches = matches & union if words else union
+    return sorted(matches)
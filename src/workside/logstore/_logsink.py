@@ -0,0 +1,351 @@
+"""LogSink streams log messages to append-only segment files from a worker
+thread."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import atexit
+import bz2
+import gzip
+import lzma
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from queue import SimpleQueue, Empty
+from typing import NoReturn, BinaryIO, Callable
+
+from worktoy.core import maybe
+
+from workside.logstore import LogIndex, SegmentStore
+from workside.settings import Settings
+
+_compressors = {
+  None: ('', None, open),
+  'gzip': ('.gz', lambda f: gzip.GzipFile(fileobj=f, mode='wb'), gzip.open),
+  'bz2': ('.bz2', lambda f: bz2.BZ2File(f, 'wb'), bz2.open),
+  'lzma': ('.xz', lambda f: lzma.LZMAFile(f, 'wb'), lzma.open),
+}
+_segmentName = re.compile(r'^.+-\d{6}\.log(\.gz|\.bz2|\.xz)?$')
+
+
+def _remove(path: str) -> bool:
+  """Deletes the file returning False if it could not be deleted"""
+  try:
+    os.remove(path)
+  except OSError:
+    return False
+  return True
+
+
+class _Snapshot:
+  """Request for a snapshot placed on the queue of the worker thread"""
+
+  def __init__(self, fileName: str, header: str, callback: Callable,
+               errback: Callable) -> None:
+    self.fileName = fileName
+    self.header = header
+    self.callback = callback
+    self.errback = errback
+
+
+class LogSink:
+  """LogSink streams log messages to append-only segment files from a
+  worker thread. Messages are put on a queue from any thread and written
+  in batches. When the current segment exceeds the segment size, it is
+  closed and a new segment is started.
+
+  If an index is given, every message written is also added to the
+  index from the worker thread, such that indexing keeps up with the
+  messages without taking time from the thread putting them. Likewise,
+  if a SegmentStore is given, every message written is also appended to
+  it from the worker thread, such that the history is written once and
+  never by the thread putting the messages.
+
+  Segments may be compressed with gzip, bz2 or lzma from the standard
+  library. A snapshot is saved as plain text to exactly the file name
+  given, by decompressing the closed segments while copying them rather
+  than by serialising the messages again.
+
+  The segments of a sink are deleted when it is closed, unless it is set
+  to keep them. Segments left behind by earlier sessions in the directory
+  are deleted by the worker thread when it starts if older than
+  Settings.logRetentionAge seconds, after which the oldest are deleted
+  until they take up at most Settings.logRetentionBytes.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  @staticmethod
+  def getDefaultDirectory() -> str:
+    """Getter-function for the default directory given by the environment
+    variable or a folder in the temporary directory."""
+    fromEnv = os.getenv(Settings.logDirEnv)
+    if fromEnv:
+      return fromEnv
+    return os.path.join(tempfile.gettempdir(), 'workside-logs')
+
+  def __init__(self, name: str, directory: str = None, **kwargs) -> None:
+    self._name = name
+    self._directory = maybe(directory, self.getDefaultDirectory())
+    self._segmentSize = kwargs.get('segmentSize', Settings.logSegmentSize)
+    compression = kwargs.get('compression', Settings.logCompression)
+    if compression not in _compressors:
+      msg = """Expected compression to be one of %s, but received %s!"""
+      raise ValueError(msg % ([*_compressors], compression))
+    self._compression = compression
+    self._index = kwargs.get('index', None)
+    if self._index is not None and not isinstance(self._index, LogIndex):
+      msg = """Expected index to be of type %s, but received %s!"""
+      raise TypeError(msg % (LogIndex, type(self._index)))
+    self._store = kwargs.get('store', None)
+    if self._store is not None and not isinstance(self._store, SegmentStore):
+      msg = """Expected store to be of type %s, but received %s!"""
+      raise TypeError(msg % (SegmentStore, type(self._store)))
+    self._queue = SimpleQueue()
+    self._thread = None
+    self._lock = threading.Lock()
+    self._raw = None
+    self._file = None
+    self._segmentIndex = self._findLastIndex()
+    self._segments = []
+    self._messageCount = 0
+    self._error = None
+    self._keep = kwargs.get('keep', Settings.logKeepSegments)
+
+  def _getSuffix(self) -> str:
+    """Getter-function for the file suffix of the segments"""
+    return '.log%s' % _compressors[self._compression][0]
+
+  def _segmentPath(self, index: int) -> str:
+    """Returns the path to the segment at the given index"""
+    fileName = '%s-%06d%s' % (self._name, index, self._getSuffix())
+    return os.path.join(self._directory, fileName)
+
+  def _findLastIndex(self) -> int:
+    """Finds the index of the last segment already on disk"""
+    pattern = re.compile(
+      r'^%s-(\d{6})%s$' % (re.escape(self._name),
+                           re.escape(self._getSuffix())))
+    try:
+      names = os.listdir(self._directory)
+    except FileNotFoundError:
+      return 0
+    indices = [int(m.group(1)) for m in map(pattern.match, names) if m]
+    return max(indices, default=0)
+
+  def getSegments(self) -> list[str]:
+    """Getter-function for the paths of the segments written by this
+    sink, including the current segment."""
+    return [*self._segments]
+
+  def getIndex(self) -> LogIndex | None:
+    """Getter-function for the index of the messages written"""
+    return self._index
+
+  def getStore(self) -> SegmentStore | None:
+    """Getter-function for the store of the messages written"""
+    return self._store
+
+  def getMessageCount(self) -> int:
+    """Getter-function for the number of messages written"""
+    return self._messageCount
+
+  def isKeeping(self) -> bool:
+    """Flag indicating whether the segments are kept when closed"""
+    return self._keep
+
+  def setKeep(self, keep: bool) -> NoReturn:
+    """Setter-function for keeping the segments when closed"""
+    self._keep = keep
+
+  def getError(self) -> OSError | None:
+    """Getter-function for the most recent error raised by the worker
+    thread"""
+    return self._error
+
+  def _start(self) -> NoReturn:
+    """Starts the worker thread"""
+    with self._lock:
+      if self._thread is not None:
+        return
+      self._thread = threading.Thread(
+        target=self._work, name='LogSink-%s' % self._name, daemon=True)
+      self._thread.start()
+      atexit.register(self.close)
+
+  def put(self, message: str) -> NoReturn:
+    """Enqueues the message for writing"""
+    if self._thread is None:
+      self._start()
+    self._queue.put(message)
+
+  def putAll(self, messages: list[str]) -> NoReturn:
+    """Enqueues the messages for writing"""
+    if self._thread is None:
+      self._start()
+    self._queue.put(messages)
+
+  def snapshot(self, fileName: str, header: str = None,
+               callback: Callable = None,
+               errback: Callable = None) -> NoReturn:
+    """Saves every message written so far to the given file without
+    blocking. The file is plain text regardless of the compression of
+    the segments. The current segment is closed first such that every
+    segment copied is complete. If a header is given, it is written
+    before the messages. The callback, if given, receives the file name
+    from the worker thread once the snapshot is saved. The errback, if
+    given, instead receives the OSError from the worker thread if the
+    snapshot could not be saved."""
+    if self._thread is None:
+      self._start()
+    self._queue.put(_Snapshot(fileName, header, callback, errback))
+
+  def flush(self, timeout: float = None) -> bool:
+    """Blocks until every message enqueued before this call has been
+    written. Returns False on timeout."""
+    if self._thread is None:
+      return True
+    done = threading.Event()
+    self._queue.put(done)
+    return done.wait(timeout)
+
+  def close(self, ) -> NoReturn:
+    """Writes the pending messages, closes the current segment and stops
+    the worker thread. The segments are then deleted unless kept."""
+    with self._lock:
+      thread, self._thread = self._thread, None
+    if thread is None:
+      return
+    self._queue.put(None)
+    thread.join()
+    atexit.unregister(self.close)
+    if not self._keep:
+      self._removeSegments()
+
+  def _removeSegments(self) -> NoReturn:
+    """Deletes the segments written by this sink"""
+    segments, self._segments = self._segments, []
+    for path in segments:
+      _remove(path)
+
+  def _prune(self) -> NoReturn:
+    """Deletes the segments of earlier sessions in the directory that are
+    older than the retention age, and then the oldest of them until they
+    fit in the retention size."""
+    try:
+      entries = [e for e in os.scandir(self._directory)
+                 if _segmentName.match(e.name) and e.is_file()]
+    except FileNotFoundError:
+      return
+    cutoff = time.time() - Settings.logRetentionAge
+    kept, total = [], 0
+    for entry in entries:
+      stat = entry.stat()
+      if stat.st_mtime < cutoff:
+        _remove(entry.path)
+      else:
+        kept.append((stat.st_mtime, stat.st_size, entry.path))
+        total += stat.st_size
+    for (_, size, path) in sorted(kept):
+      if total <= Settings.logRetentionBytes:
+        break
+      if _remove(path):
+        total -= size
+
+  def _openSegment(self) -> BinaryIO:
+    """Opens a new segment"""
+    os.makedirs(self._directory, exist_ok=True)
+    self._segmentIndex += 1
+    path = self._segmentPath(self._segmentIndex)
+    self._segments.append(path)
+    self._raw = open(path, 'wb')
+    wrap = _compressors[self._compression][1]
+    self._file = self._raw if wrap is None else wrap(self._raw)
+    return self._file
+
+  def _closeSegment(self) -> NoReturn:
+    """Closes the current segment"""
+    if self._file is None:
+      return
+    if self._file is not self._raw:
+      self._file.close()
+    self._raw.close()
+    self._file, self._raw = None, None
+
+  def _write(self, messages: list[str]) -> NoReturn:
+    """Writes the messages to the current segment rotating if required"""
+    file = self._file if self._file is not None else self._openSegment()
+    file.write(('%s\n' % '\n'.join(messages)).encode('utf-8'))
+    self._messageCount += len(messages)
+    if self._raw.tell() >= self._segmentSize:
+      self._closeSegment()
+
+  def _consume(self, messages: list[str]) -> NoReturn:
+    """Writes, stores and indexes the messages"""
+    self._guarded(self._write, messages)
+    if self._store is not None:
+      self._guarded(self._store.extend, messages)
+    if self._index is not None:
+      self._index.extend(messages)
+
+  def _saveSnapshot(self, snapshot: _Snapshot) -> NoReturn:
+    """Saves the snapshot by decompressing the closed segments into the
+    file"""
+    self._closeSegment()
+    reader = _compressors[self._compression][2]
+    with open(snapshot.fileName, 'wb') as target:
+      if snapshot.header is not None:
+        target.write(('%s\n' % snapshot.header).encode('utf-8'))
+      for path in self._segments:
+        with reader(path, 'rb') as source:
+          shutil.copyfileobj(source, target, 1 << 20)
+    if snapshot.callback is not None:
+      snapshot.callback(snapshot.fileName)
+
+  def _guarded(self, func: Callable, *args) -> OSError | None:
+    """Calls the function keeping the worker thread alive if the file
+    system raises an error. The error is returned and is available from
+    'getError'."""
+    try:
+      func(*args)
+    except OSError as e:
+      self._error = e
+      self._closeSegment()
+      return e
+    return None
+
+  def _work(self) -> NoReturn:
+    """Worker thread writing batches of messages from the queue"""
+    self._guarded(self._prune)
+    queue = self._queue
+    while True:
+      item = queue.get()
+      batch = []
+      while True:
+        if isinstance(item, str):
+          batch.append(item)
+        elif isinstance(item, list):
+          batch.extend(item)
+        else:
+          if batch:
+            self._consume(batch)
+            batch = []
+          if item is None:
+            self._closeSegment()
+            return
+          if isinstance(item, _Snapshot):
+            error = self._guarded(self._saveSnapshot, item)
+            if error is not None and item.errback is not None:
+              item.errback(error)
+          elif isinstance(item, threading.Event):
+            if self._file is not None:
+              self._file.flush()
+            item.set()
+        try:
+          item = queue.get_nowait()
+        except Empty:
+          break
+      if batch:
+        self._consume(batch)
@@ -0,0 +1,253 @@
+"""SegmentStore keeps every log message in memory-mapped segment files
+with an offset index, such that any message can be read back by its
+sequence number without holding the history in memory."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import atexit
+import mmap
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import NoReturn
+
+from worktoy.core import maybe
+
+from workside.settings import Settings
+
+
+class _Segment:
+  """A segment holding the data file and the offset index of a range of
+  consecutive messages. The files are mapped only when first read."""
+
+  def __init__(self, dataPath: str, indexPath: str, start: int,
+               count: int) -> None:
+    self.dataPath = dataPath
+    self.indexPath = indexPath
+    self.start = start
+    self.count = count
+    self.data = None
+    self.offsets = None
+    self._indexMap = None
+
+  def open(self) -> NoReturn:
+    """Maps the files for reading"""
+    with open(self.dataPath, 'rb') as file:
+      if os.fstat(file.fileno()).st_size:
+        self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+      else:
+        self.data = b''
+    with open(self.indexPath, 'rb') as file:
+      self._indexMap = mmap.mmap(file.fileno(), 0,
+                                 access=mmap.ACCESS_READ)
+    self.offsets = memoryview(self._indexMap).cast('Q')
+
+  def close(self) -> NoReturn:
+    """Unmaps the files"""
+    if self.offsets is not None:
+      self.offsets.release()
+      self._indexMap.close()
+      if isinstance(self.data, mmap.mmap):
+        self.data.close()
+    self.data, self.offsets, self._indexMap = None, None, None
+
+
+class SegmentStore:
+  """SegmentStore keeps every log message in memory-mapped segment files
+  with an offset index, such that any message can be read back by its
+  sequence number without holding the history in memory. Messages are
+  numbered from zero in the order they are appended across restarts.
+
+  Each segment consists of a data file of fixed size holding the encoded
+  messages back to back and an index file holding the end offset of
+  each message as an unsigned 64 bit integer. The data file of the
+  segment being written is mapped for writing and is truncated to the
+  length used once full. Messages are written to the data file before
+  their offsets, such that a segment is consistent up to the last
+  offset written even if the process is killed.
+
+  When reopened, existing segments are found from the names in the
+  directory and the number of messages in each from the size of its
+  index file. No segment is read until a message in it is requested, at
+  which point both files are mapped. At most
+  Settings.logSpillOpenSegments segments are kept mapped. Messages may be
+  appended from one thread while read from another, such as the worker
+  thread of a LogSink and the thread showing them.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  def __init__(self, name: str, directory: str = None, **kwargs) -> None:
+    self._name = name
+    self._directory = maybe(directory, os.getcwd())
+    self._segmentSize = kwargs.get('segmentSize',
+                                   Settings.logSpillSegmentSize)
+    self._segments = []
+    self._starts = []
+    self._opened = OrderedDict()
+    self._nextIndex = 1
+    self._data = None
+    self._dataPath = None
+    self._dataSize = 0
+    self._offsets = array('Q')
+    self._end = 0
+    self._indexFile = None
+    self._count = 0
+    self._closed = False
+    self._lock = threading.Lock()
+    self._reopen()
+    atexit.register(self.close)
+
+  def _segmentPath(self, index: int, suffix: str) -> str:
+    """Returns the path to the file of the segment at the given index"""
+    fileName = '%s-%06d%s' % (self._name, index, suffix)
+    return os.path.join(self._directory, fileName)
+
+  def _reopen(self) -> NoReturn:
+    """Finds the segments already on disk"""
+    pattern = re.compile(r'^%s-(\d{6})\.idx$' % re.escape(self._name))
+    try:
+      names = os.listdir(self._directory)
+    except FileNotFoundError:
+      names = []
+    indices = sorted(
+      int(m.group(1)) for m in map(pattern.match, names) if m)
+    for index in indices:
+      dataPath = self._segmentPath(index, '.seg')
+      indexPath = self._segmentPath(index, '.idx')
+      count = os.stat(indexPath).st_size // 8
+      if not count or not os.path.exists(dataPath):
+        continue
+      self._segments.append(_Segment(dataPath, indexPath, self._count,
+                                     count))
+      self._starts.append(self._count)
+      self._count += count
+    if indices:
+      self._nextIndex = indices[-1] + 1
+
+  def __len__(self) -> int:
+    """The number of messages held"""
+    return self._count
+
+  def getSegmentCount(self) -> int:
+    """Getter-function for the number of segments including the one being
+    written"""
+    return len(self._segments) + (0 if self._data is None else 1)
+
+  def _openSegment(self, size: int) -> NoReturn:
+    """Starts a new segment of at least the given size"""
+    os.makedirs(self._directory, exist_ok=True)
+    index = self._nextIndex
+    self._nextIndex += 1
+    self._dataSize = max(self._segmentSize, size)
+    self._dataPath = self._segmentPath(index, '.seg')
+    with open(self._dataPath, 'wb+') as file:
+      file.truncate(self._dataSize)
+      self._data = mmap.mmap(file.fileno(), self._dataSize)
+    self._indexFile = open(self._segmentPath(index, '.idx'), 'wb')
+    self._offsets = array('Q')
+    self._end = 0
+    self._starts.append(self._count)
+
+  def _sealSegment(self) -> NoReturn:
+    """Closes the segment being written truncating the data file to the
+    length used"""
+    if self._data is None:
+      return
+    self._data.flush()
+    self._data.close()
+    self._indexFile.close()
+    os.truncate(self._dataPath, self._end)
+    self._segments.append(_Segment(self._dataPath, self._indexFile.name,
+                                   self._starts[-1], len(self._offsets)))
+    self._data, self._indexFile = None, None
+    self._offsets = array('Q')
+
+  def append(self, message: str) -> NoReturn:
+    """Appends the message"""
+    self.extend([message])
+
+  def extend(self, messages: list[str]) -> NoReturn:
+    """Appends the messages"""
+    with self._lock:
+      self._extend(messages)
+
+  def _extend(self, messages: list[str]) -> NoReturn:
+    """Appends the messages holding the lock"""
+    if self._closed:
+      raise RuntimeError('SegmentStore is closed!')
+    written = array('Q')
+    for message in messages:
+      record = message.encode('utf-8')
+      end = self._end + len(record)
+      if self._data is None or end > self._dataSize:
+        if written:
+          self._indexFile.write(written.tobytes())
+          written = array('Q')
+        self._sealSegment()
+        self._openSegment(len(record))
+        end = len(record)
+      self._data[self._end:end] = record
+      self._end = end
+      written.append(end)
+      self._offsets.append(end)
+      self._count += 1
+    if written:
+      self._indexFile.write(written.tobytes())
+
+  def _getSegment(self, seq: int) -> _Segment:
+    """Returns the sealed segment holding the message, mapping it if
+    required"""
+    segment = self._segments[bisect_right(self._starts, seq) - 1]
+    if segment.data is None:
+      segment.open()
+      while len(self._opened) >= Settings.logSpillOpenSegments:
+        self._opened.popitem(last=False)[1].close()
+      self._opened[segment.start] = segment
+    else:
+      self._opened.move_to_end(segment.start)
+    return segment
+
+  def get(self, seq: int) -> str:
+    """Returns the message at the given sequence number"""
+    with self._lock:
+      return self._get(seq)
+
+  def _get(self, seq: int) -> str:
+    """Returns the message at the given sequence number holding the
+    lock"""
+    if not 0 <= seq < self._count:
+      raise IndexError(seq)
+    if self._data is not None and seq >= self._starts[-1]:
+      data, offsets, i = self._data, self._offsets, seq - self._starts[-1]
+    else:
+      segment = self._getSegment(seq)
+      data, offsets, i = segment.data, segment.offsets, seq - segment.start
+    start = offsets[i - 1] if i else 0
+    return data[start:offsets[i]].decode('utf-8')
+
+  def __getitem__(self, seq: int) -> str:
+    """Returns the message at the given sequence number"""
+    return self.get(seq)
+
+  def flush(self) -> NoReturn:
+    """Flushes the segment being written to disk"""
+    with self._lock:
+      if self._data is not None:
+        self._data.flush()
+        self._indexFile.flush()
+
+  def close(self) -> NoReturn:
+    """Seals the segment being written and unmaps every segment"""
+    with self._lock:
+      if self._closed:
+        return
+      self._closed = True
+      self._sealSegment()
+      for segment in self._opened.values():
+        segment.close()
+      self._opened.clear()
+    atexit.unregister(self.close)
@@ -0,0 +1,18 @@
+"""The profiling package provides the tools behind the debug actions of
+BaseWindow."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from moreworktoy import lazyExports
+
+if TYPE_CHECKING:
+  from ._collapse import collapseStats
+  from ._profiletoolkit import ProfileToolkit
+
+__getattr__, __dir__ = lazyExports(__name__, {
+  'collapseStats': '._collapse',
+  'ProfileToolkit': '._profiletoolkit',
+})
@@ -0,0 +1,61 @@
+"""The collapseStats function converts the statistics collected by
+cProfile into collapsed stacks for flame graphs."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import os
+import pstats
+
+from workside.settings import Settings
+
+
+def _label(func: tuple[str, int, str]) -> str:
+  """Returns the frame label of the function key used by pstats"""
+  fileName, line, name = func
+  if fileName == '~':
+    return name.replace(';', ',')
+  label = '%s (%s:%d)' % (name, os.path.basename(fileName), line)
+  return label.replace(';', ',')
+
+
+def collapseStats(stats: pstats.Stats) -> list[str]:
+  """Returns the collapsed stacks of the given statistics, one line of
+  semicolon separated frames followed by the time in microseconds, as
+  read by flamegraph.pl, inferno and speedscope. Since cProfile records
+  only the edges between callers and callees, the stacks are rebuilt by
+  descending from the functions without callers, dividing the time of
+  each function between its callers in proportion to the time recorded
+  on each edge. Recursive calls are folded into the first frame, stacks
+  deeper than Settings.profileStackDepth are cut, and calls taking less
+  than Settings.profileMinFraction of the total time are dropped, which
+  bounds the number of stacks."""
+  entries = stats.stats
+  callees = {}
+  for (func, (_, _, _, _, callers)) in entries.items():
+    for (caller, edge) in callers.items():
+      callees.setdefault(caller, []).append((func, edge[3]))
+  roots = [func for (func, entry) in entries.items() if not entry[4]]
+  weights = {}
+  minTime = sum(entries[func][3] for func in roots)
+  minTime *= Settings.profileMinFraction
+  pending = [((func,), entries[func][3]) for func in roots]
+  while pending:
+    stack, budget = pending.pop()
+    func = stack[-1]
+    total, own = entries[func][3], entries[func][2]
+    scale = budget / total if total else 0.
+    weights[stack] = weights.get(stack, 0.) + own * scale
+    if len(stack) >= Settings.profileStackDepth:
+      continue
+    for (callee, edgeTime) in callees.get(func, ()):
+      if callee in stack or edgeTime * scale <= minTime:
+        continue
+      pending.append((stack + (callee,), edgeTime * scale))
+  lines = []
+  for (stack, weight) in weights.items():
+    micros = int(weight * 1e6)
+    if micros:
+      lines.append('%s %d' % (';'.join(map(_label, stack)), micros))
+  lines.sort()
+  return lines
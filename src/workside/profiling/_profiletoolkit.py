@@ -0,0 +1,296 @@
+"""ProfileToolkit toggles cProfile, tracemalloc and garbage collection
+statistics for the GUI thread and writes the results from a worker
+thread."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import cProfile
+import gc
+import io
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from array import array
+from queue import SimpleQueue
+from typing import NoReturn, Callable
+
+from PySide6.QtCore import QObject, Signal
+from worktoy.core import maybe
+
+from workside.profiling import collapseStats
+from workside.settings import Settings
+
+
+_ignoredFiles = (tracemalloc.__file__, '<frozen importlib._bootstrap>',
+                 '<frozen importlib._bootstrap_external>')
+
+
+class ProfileToolkit(QObject):
+  """ProfileToolkit toggles cProfile, tracemalloc and garbage collection
+  statistics for the GUI thread. Only starting and stopping happen on the
+  calling thread. Writing files and comparing snapshots are done by a
+  single worker thread in the order requested, after which the report is
+  emitted with 'reportReady' as a title and a text. Short notes on what
+  was toggled are emitted with 'message'.
+
+  The files are written to the directory given, to the directory named by
+  the environment variable Settings.profileDirEnv or to a folder in the
+  temporary directory, each named by the time it was requested:
+    profile-<time>.prof: the pstats of the profiled period
+    profile-<time>.folded: the collapsed stacks for flame graphs
+    tracemalloc-<time>.snapshot: the tracemalloc snapshot
+    runtime-<time>.txt: the garbage collection statistics
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  reportReady = Signal(str, str)
+  message = Signal(str)
+
+  @staticmethod
+  def getDefaultDirectory() -> str:
+    """Getter-function for the default directory given by the environment
+    variable or a folder in the temporary directory."""
+    fromEnv = os.getenv(Settings.profileDirEnv)
+    if fromEnv:
+      return fromEnv
+    return os.path.join(tempfile.gettempdir(), 'workside-profiles')
+
+  def __init__(self, directory: str = None, *args, **kwargs) -> None:
+    QObject.__init__(self, *args, **kwargs)
+    self._directory = maybe(directory, self.getDefaultDirectory())
+    self._queue = SimpleQueue()
+    self._thread = None
+    self._profile = None
+    self._snapshot = None
+    self._switchInterval = None
+    self._gcStart = 0.
+    self._gcCounts = array('Q', bytes(8 * 3))
+    self._gcCollected = array('Q', bytes(8 * 3))
+    self._gcTotals = array('d', bytes(8 * 3))
+    self._gcMaxima = array('d', bytes(8 * 3))
+
+  def getDirectory(self) -> str:
+    """Getter-function for the output directory"""
+    return self._directory
+
+  def setDirectory(self, directory: str) -> NoReturn:
+    """Setter-function for the output directory"""
+    if not isinstance(directory, str):
+      msg = """Expected directory to be of type %s, but received %s!"""
+      raise TypeError(msg % (str, type(directory)))
+    self._directory = directory
+
+  def _getPath(self, kind: str, stamp: str, extension: str) -> str:
+    """Returns the path of the output file, creating the directory if
+    required. Only the worker thread calls this method."""
+    os.makedirs(self._directory, exist_ok=True)
+    fileName = '%s-%s.%s' % (kind, stamp, extension)
+    return os.path.join(self._directory, fileName)
+
+  @staticmethod
+  def _getStamp() -> str:
+    """Returns the time used to name the output files"""
+    now = time.time()
+    return '%s-%03d' % (time.strftime('%Y%m%d-%H%M%S',
+                                      time.localtime(now)),
+                        int(now % 1 * 1000))
+
+  def _submit(self, job: Callable, *args) -> NoReturn:
+    """Queues the job for the worker thread, starting it if required"""
+    if self._thread is None:
+      self._thread = threading.Thread(target=self._work, daemon=True,
+                                      name='ProfileToolkit')
+      self._thread.start()
+    self._queue.put((job, args))
+
+  def _work(self, ) -> NoReturn:
+    """Runs the queued jobs and emits their reports"""
+    while True:
+      item = self._queue.get()
+      if item is None:
+        return
+      job, args = item
+      try:
+        title, text = job(*args)
+      except Exception as exception:
+        title, text = 'Profiling failed', repr(exception)
+      try:
+        self.reportReady.emit(title, text)
+      except RuntimeError:
+        return
+
+  def shutdown(self, wait: bool = False, timeout: float = None) -> bool:
+    """Stops every tool and lets the worker thread finish the queued
+    jobs. If wait is True, this blocks until the worker has finished or
+    the timeout in seconds has passed. Returns False if the worker is
+    still writing when this returns."""
+    if self._profile is not None:
+      self.toggleProfiler()
+    if self._switchInterval is not None:
+      self.toggleRuntimeStats()
+    if tracemalloc.is_tracing():
+      self.stopTracing()
+    thread, self._thread = self._thread, None
+    if thread is None:
+      return True
+    self._queue.put(None)
+    if wait:
+      thread.join(timeout)
+    return not thread.is_alive()
+
+  def isProfiling(self) -> bool:
+    """Flag indicating whether cProfile is running"""
+    return False if self._profile is None else True
+
+  def toggleProfiler(self, ) -> bool:
+    """Starts cProfile on the calling thread or stops it and queues the
+    output. Returns True if profiling was started."""
+    if self._profile is None:
+      self._profile = cProfile.Profile()
+      self._profile.enable()
+      self.message.emit('cProfile started')
+      return True
+    profile, self._profile = self._profile, None
+    profile.disable()
+    self._submit(self._writeProfile, profile, self._getStamp())
+    self.message.emit('cProfile stopped')
+    return False
+
+  def _writeProfile(self, profile: cProfile.Profile,
+                    stamp: str) -> tuple[str, str]:
+    """Writes the pstats and the collapsed stacks of the profile"""
+    stream = io.StringIO()
+    stats = pstats.Stats(profile, stream=stream)
+    statsPath = self._getPath('profile', stamp, 'prof')
+    stats.dump_stats(statsPath)
+    foldedPath = self._getPath('profile', stamp, 'folded')
+    with open(foldedPath, 'w', encoding='utf-8') as f:
+      for line in collapseStats(stats):
+        f.write(line + '\n')
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    stats.print_stats(Settings.profileTopCount)
+    text = '%s\n%s\n%s' % (statsPath, foldedPath, stream.getvalue())
+    return 'cProfile', text
+
+  def isTracing(self) -> bool:
+    """Flag indicating whether tracemalloc is tracing"""
+    return tracemalloc.is_tracing()
+
+  def snapshotAllocations(self, ) -> bool:
+    """Starts tracemalloc and queues a first snapshot, or queues a
+    snapshot compared to the previous one. Returns True if tracing was
+    started."""
+    if not tracemalloc.is_tracing():
+      tracemalloc.start(Settings.tracemallocFrames)
+      self._submit(self._compareSnapshot, self._getStamp())
+      self.message.emit('tracemalloc started')
+      return True
+    self._submit(self._compareSnapshot, self._getStamp())
+    return False
+
+  def stopTracing(self, ) -> NoReturn:
+    """Stops tracemalloc and discards the snapshots"""
+    self._submit(self._discardSnapshot)
+    tracemalloc.stop()
+    self.message.emit('tracemalloc stopped')
+
+  def _discardSnapshot(self, ) -> tuple[str, str]:
+    """Discards the previous snapshot"""
+    self._snapshot = None
+    return 'tracemalloc', 'Tracing stopped'
+
+  def _compareSnapshot(self, stamp: str) -> tuple[str, str]:
+    """Takes a snapshot and compares its statistics by line to those of
+    the previous snapshot. The statistics of each snapshot are computed
+    once and kept for the next comparison, and allocations made by
+    tracemalloc and the import machinery are left out of the report."""
+    if not tracemalloc.is_tracing():
+      return 'tracemalloc', 'Tracing stopped before the snapshot'
+    snapshot = tracemalloc.take_snapshot()
+    path = self._getPath('tracemalloc', stamp, 'snapshot')
+    snapshot.dump(path)
+    statistics = {stat.traceback: stat
+                  for stat in snapshot.statistics('lineno')}
+    previous, self._snapshot = self._snapshot, statistics
+    current, peak = tracemalloc.get_traced_memory()
+    lines = [path, 'traced %.1f MB, peak %.1f MB' % (
+      current / (1 << 20), peak / (1 << 20))]
+    if previous is None:
+      lines.append('First snapshot taken. Trigger again to compare.')
+      return 'tracemalloc', '\n'.join(lines)
+    diffs = []
+    for traceback in {*statistics, *previous}:
+      if traceback[0].filename in _ignoredFiles:
+        continue
+      new, old = statistics.get(traceback), previous.get(traceback)
+      size, count = (new.size, new.count) if new else (0, 0)
+      oldSize, oldCount = (old.size, old.count) if old else (0, 0)
+      if size != oldSize or count != oldCount:
+        diffs.append(tracemalloc.StatisticDiff(
+          traceback, size, size - oldSize, count, count - oldCount))
+    diffs.sort(key=lambda diff: (abs(diff.size_diff), diff.size),
+               reverse=True)
+    lines.extend(str(diff) for diff in diffs[:Settings.profileTopCount])
+    return 'tracemalloc', '\n'.join(lines)
+
+  def isCollectingRuntimeStats(self) -> bool:
+    """Flag indicating whether the runtime statistics are collected"""
+    return False if self._switchInterval is None else True
+
+  def toggleRuntimeStats(self, ) -> bool:
+    """Sets the switch interval to Settings.profileSwitchInterval and
+    starts timing the garbage collections, or restores the switch interval
+    and queues the statistics. Returns True if collection was started."""
+    if self._switchInterval is None:
+      self._switchInterval = sys.getswitchinterval()
+      sys.setswitchinterval(Settings.profileSwitchInterval)
+      for values in (self._gcCounts, self._gcCollected, self._gcTotals,
+                     self._gcMaxima):
+        for i in range(3):
+          values[i] = 0
+      gc.callbacks.append(self._gcCallback)
+      self.message.emit('Switch interval %.1f ms, timing collections' % (
+        Settings.profileSwitchInterval * 1000))
+      return True
+    gc.callbacks.remove(self._gcCallback)
+    sys.setswitchinterval(self._switchInterval)
+    self._switchInterval = None
+    counters = (self._gcCounts.tolist(), self._gcCollected.tolist(),
+                self._gcTotals.tolist(), self._gcMaxima.tolist())
+    self._submit(self._writeRuntimeStats, counters, self._getStamp())
+    self.message.emit('Switch interval restored')
+    return False
+
+  def _gcCallback(self, phase: str, info: dict) -> NoReturn:
+    """Times the garbage collections. It is called by the thread running
+    the collection and only updates the preallocated counters."""
+    if phase == 'start':
+      self._gcStart = time.perf_counter()
+      return
+    generation = info['generation']
+    pause = (time.perf_counter() - self._gcStart) * 1000
+    self._gcCounts[generation] += 1
+    self._gcCollected[generation] += info['collected']
+    self._gcTotals[generation] += pause
+    if pause > self._gcMaxima[generation]:
+      self._gcMaxima[generation] = pause
+
+  def _writeRuntimeStats(self, counters: tuple,
+                         stamp: str) -> tuple[str, str]:
+    """Writes the garbage collection statistics"""
+    counts, collected, totals, maxima = counters
+    lines = ['generation  collections  collected  total ms    max ms']
+    for i in range(3):
+      lines.append('%10d  %11d  %9d  %8.2f  %8.2f' % (
+        i, counts[i], collected[i], totals[i], maxima[i]))
+    lines.append('thresholds %s  counts %s' % (gc.get_threshold(),
+                                               gc.get_count()))
+    path = self._getPath('runtime', stamp, 'txt')
+    with open(path, 'w', encoding='utf-8') as f:
+      f.write('\n'.join(lines) + '\n')
+    return 'Runtime statistics', '%s\n%s' % (path, '\n'.join(lines))
@@ -3,10 +3,20 @@
 #  MIT Licence
 from __future__ import annotations
 
-from icecream import ic
+from typing import TYPE_CHECKING
 
-ic.configureOutput(includeContext=True)
+from moreworktoy import lazyExports
 
-from ._timer import timer
-from ._flag import flag
-from ._settings import Settings
+if TYPE_CHECKING:
+  from ._settings import Settings
+  from ._timerwheel import TimerWheel, WheelTimer
+  from ._timer import timer
+  from ._flag import flag
+
+__getattr__, __dir__ = lazyExports(__name__, {
+  'Settings': '._settings',
+  'TimerWheel': '._timerwheel',
+  'WheelTimer': '._timerwheel',
+  'timer': '._timer',
+  'flag': '._flag',
+})
@@ -7,10 +7,6 @@ of an immutable type."""
 #  MIT Licence
 from __future__ import annotations
 
-from icecream import ic
-
-ic.configureOutput(includeContext=True)
-
 
 class _ClassAwareMeta(type):
   """This private class is the actual custom metaclass"""
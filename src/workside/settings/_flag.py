@@ -1,17 +1,70 @@
-"""Flag is a class decorator"""
+"""Flag is a class decorator. Each flag applied to a class is allocated a
+bit in the integer bitfield '_flags' of the instances. The bit of each
+flag is found in the 'flagMasks' mapping of the class."""
 #  Copyright (c) 2023 Asger Jon Vistisen
 #  MIT Licence
 from __future__ import annotations
 
-from typing import NoReturn
+from functools import partialmethod
+from typing import NoReturn, Any
 
-from PySide6.QtCore import QEvent
-from PySide6.QtGui import QEnterEvent, QPainterPath
-from icecream import ic
 from worktoy.typetools import CallMeMaybe
 from worktoy.waitaminute import ProceduralError
 
-ic.configureOutput(includeContext=True)
+
+def setFlagBits(self: Any, mask: int, value: bool) -> NoReturn:
+  """Sets or clears the bits of the mask in the flags of the instance. If
+  the flags change, the 'flagsChanged' signal of the instance is emitted
+  with the old and the new flags, provided '_flagListeners' counts any
+  connection to it."""
+  old = self._flags
+  new = old | mask if value else old & ~mask
+  if new != old:
+    self._flags = new
+    if getattr(self, '_flagListeners', 0):
+      self.flagsChanged.emit(old, new)
+
+
+def getFlagBits(self: Any, mask: int) -> bool:
+  """Returns True if any bit of the mask is set in the flags of the
+  instance"""
+  return True if self._flags & mask else False
+
+
+class FlagBit:
+  """FlagBit is the descriptor generated by the flag decorator. It reads
+  and writes the bit of one flag in the '_flags' of the instance. Calling
+  it on an instance returns the value of the flag.
+  #  Copyright (c) 2023 Asger Jon Vistisen
+  #  MIT Licence"""
+
+  __slots__ = ('_name', '_mask')
+
+  def __init__(self, name: str, mask: int) -> None:
+    self._name = name
+    self._mask = mask
+
+  def getName(self) -> str:
+    """Getter-function for the name of the flag"""
+    return self._name
+
+  def getMask(self) -> int:
+    """Getter-function for the bit of the flag"""
+    return self._mask
+
+  def __get__(self, instance: Any, owner: type) -> Any:
+    """Returns the value of the flag"""
+    if instance is None:
+      return self
+    return True if instance._flags & self._mask else False
+
+  def __set__(self, instance: Any, value: bool) -> NoReturn:
+    """Sets the value of the flag"""
+    setFlagBits(instance, self._mask, value)
+
+  def __call__(self, instance: Any) -> bool:
+    """Returns the value of the flag on the given instance"""
+    return True if instance._flags & self._mask else False
 
 
 def flag(flagName: str) -> CallMeMaybe:
@@ -19,62 +72,34 @@ def flag(flagName: str) -> CallMeMaybe:
 
   def decorator(cls: type) -> type:
     """The actual decorator returned by the factory"""
-    _name = '_%s' % flagName
     Name = '%s%s' % (flagName[0].upper(), flagName[1:])
     _setName = '_set%s' % (Name)
     _getName = '_get%s' % (Name)
     _deactivatorName = 'deactivate%s' % Name
     _activatorName = 'activate%s' % Name
 
-    init = getattr(cls, '__init__', None)
-    if init is None:
-      raise KeyError('__init__')
-
-    def getFlag(self) -> bool:
-      """Get the value of the flag."""
-      return True if getattr(self, _name, ) else False
-
-    def setFlag(self, value) -> NoReturn:
-      """Set the value of the flag."""
-      setattr(self, _name, value)
-
-    def activateFlag(self) -> NoReturn:
-      """Activate the flag."""
-      setattr(self, _name, True)
-
-    def deactivateFlag(self) -> NoReturn:
-      """Deactivate the flag."""
-      setattr(self, _name, False)
-
-    def _postInit(self, ) -> NoReturn:
-      """Extra __init__"""
-      setattr(self, _name, False)
-      pointF = getattr(self, 'getViewPort')().center().toPointF()
-      enterEvent = QEnterEvent(pointF, pointF, self.mapToGlobal(pointF), )
-      getattr(self, 'enterEvent')(enterEvent)
-      getattr(self, 'leaveEvent')(QEvent(QEvent.Leave))
-
-    def newInit(self, *args, **kwargs) -> NoReturn:
-      """New init function"""
-      init(self, *args, **kwargs)
-      _postInit(self)
-
-    setattr(cls, '__init__', newInit)
-
-    setattr(cls, flagName, property(getFlag, setFlag))
-    setattr(cls, _deactivatorName, activateFlag)
-    setattr(cls, _activatorName, deactivateFlag)
-    setattr(cls, _getName, getFlag)
-    setattr(cls, _setName, setFlag)
-
-    flagGetters = getattr(cls, 'flagGetters', [])
-    flagNames = getattr(cls, 'flagNames', [])
-    if getFlag in flagGetters:
+    flagGetters = [*getattr(cls, 'flagGetters', [])]
+    flagNames = [*getattr(cls, 'flagNames', [])]
+    flagMasks = {**getattr(cls, 'flagMasks', {})}
+    if flagName in flagNames:
       raise ProceduralError('Same flag applied a second time')
-    flagGetters.append(getFlag)
+    bit = 1 << len(flagNames)
+    if '_flags' not in dir(cls):
+      setattr(cls, '_flags', 0)
+
+    flagBit = FlagBit(flagName, bit)
+    setattr(cls, flagName, flagBit)
+    setattr(cls, _activatorName, partialmethod(setFlagBits, bit, True))
+    setattr(cls, _deactivatorName, partialmethod(setFlagBits, bit, False))
+    setattr(cls, _getName, partialmethod(getFlagBits, bit))
+    setattr(cls, _setName, partialmethod(setFlagBits, bit))
+
+    flagGetters.append(flagBit)
     flagNames.append(flagName)
+    flagMasks[flagName] = bit
     setattr(cls, 'flagGetters', flagGetters)
     setattr(cls, 'flagNames', flagNames)
+    setattr(cls, 'flagMasks', flagMasks)
 
     return cls
 
@@ -5,9 +5,28 @@ from __future__ import annotations
 
 from PySide6.QtCore import QSize, QMargins
 from PySide6.QtGui import QFont
-from icecream import ic
 
-ic.configureOutput(includeContext=True)
+from workside.styles import Family
+
+
+class _DefaultFont:
+  """Descriptor creating the default font on first access rather than
+  when the settings are imported"""
+
+  __slots__ = ('_font',)
+
+  def __init__(self, ) -> None:
+    self._font = None
+
+  def __get__(self, instance: object, owner: type) -> QFont:
+    """Returns the default font, creating it if required"""
+    if self._font is None:
+      font = QFont()
+      font @ Family.COURIERNEW
+      font.setWeight(QFont.Weight.Normal)
+      font.setPointSize(12)
+      self._font = font
+    return self._font
 
 
 class Settings:
@@ -25,17 +44,61 @@ class Settings:
   doubleClickLockoutTime = 200
   releaseClickDelayTime = 100
 
+  #  Timers
+  timerWheel = True
+  timerWheelTick = 1
+
   minimumWidgetSize = QSize(32, 32)
   minimumFontSize = 10
 
+  #  Painting
+  pixmapCacheStates = 8
+  repaintScheduler = True
+  repaintMergeRatio = 0.5
+  repaintHistory = 512
+  instrumentationEnv = 'WORKSIDE_INSTRUMENT'
+  instrumentationReportRows = 20
+
+  #  Status
+  statusMonitor = True
+  statusInterval = 1000
+
+  #  Profiling
+  profileDirEnv = 'WORKSIDE_PROFILE_DIR'
+  profileTopCount = 25
+  profileStackDepth = 64
+  profileMinFraction = 1e-4
+  profileSwitchInterval = 0.001
+  profileShutdownTimeout = 5.0
+  tracemallocFrames = 1
+
+  #  Fonts
+  fontCacheSize = 64
+  textCacheSize = 4096
+
+  #  Log
+  logCapacity = 100000
+  logBatching = True
+  logDirEnv = 'WORKSIDE_LOG_DIR'
+  logSegmentSize = 8 << 20
+  logCompression = 'gzip'
+  logKeepSegments = False
+  logRetentionAge = 7 * 24 * 3600
+  logRetentionBytes = 256 << 20
+  logIndexBlockSize = 128
+  logIndexChunk = 512
+  logIndexMergeSize = 4096
+  logIndexPrefixLimit = 256
+  logSpill = False
+  logSpillSegmentSize = 64 << 20
+  logSpillOpenSegments = 32
+  logSpillPage = 1000
+  logSpillFlushTimeout = 1.0
+
   #  Label
   labelMargins = QMargins(4, 4, 4, 4)
   labelPadding = QMargins(2, 2, 2, 2)
 
-  defaultFont = QFont()
-  from workside.styles import Family
-  defaultFont @ Family.COURIERNEW
-  defaultFont.setWeight(QFont.Weight.Normal)
-  defaultFont.setPointSize(12)
+  defaultFont = _DefaultFont()
 
   DEBUGGING = True
@@ -1,4 +1,6 @@
-"""The timer function decorates classes with a QTimer"""
+"""The timer function decorates classes with a timer. The timer is a
+WheelTimer scheduled on the TimerWheel of the thread if Settings.timerWheel
+is set and otherwise a QTimer."""
 #  MIT Licence
 #  Copyright (c) 2023 Asger Jon Vistisen
 from __future__ import annotations
@@ -6,11 +8,10 @@ from __future__ import annotations
 from typing import NoReturn
 
 from PySide6.QtCore import QTimer, Qt, Slot
-from icecream import ic
 from worktoy.core import maybe
 from worktoy.typetools import CallMeMaybe
 
-ic.configureOutput(includeContext=True)
+from workside.settings import Settings, WheelTimer
 
 
 def timer(timerName: str, interval: int, signal: str = None) -> CallMeMaybe:
@@ -42,7 +43,10 @@ def timer(timerName: str, interval: int, signal: str = None) -> CallMeMaybe:
 
     def createTimer(self, ) -> NoReturn:
       """Creator function for the timer"""
-      _timer = QTimer()
+      if Settings.timerWheel:
+        _timer = WheelTimer()
+      else:
+        _timer = QTimer()
       _timer.setTimerType(Qt.TimerType.PreciseTimer)
       _timer.setInterval(interval)
       _timer.setSingleShot(True)
@@ -54,7 +58,7 @@ def timer(timerName: str, interval: int, signal: str = None) -> CallMeMaybe:
       _timer.timeout.connect(_signal.emit)
       setattr(self, _name, _timer)
 
-    def getTimer(self, ) -> QTimer:
+    def getTimer(self, ) -> QTimer | WheelTimer:
       """Getter-function for the timer"""
       _timer = getattr(self, _name, None)
       if _timer is None:
@@ -62,17 +66,17 @@ def timer(timerName: str, interval: int, signal: str = None) -> CallMeMaybe:
         _getTimer = getattr(self, _getterName, )
         _createTimer()
         return _getTimer()
-      if isinstance(_timer, QTimer):
+      if isinstance(_timer, (QTimer, WheelTimer)):
         return _timer
-      eMsg = """Expected a QTimer, but received: %s!""" % (type(_timer))
+      eMsg = """Expected a timer, but received: %s!""" % (type(_timer))
       raise TypeError(eMsg)
 
-    def resetTimer(self, ) -> QTimer:
+    def resetTimer(self, ) -> QTimer | WheelTimer:
       """Resetter-function for the timer"""
       _timer = getattr(self, _name)
-      if not isinstance(_timer, QTimer):
+      if not isinstance(_timer, (QTimer, WheelTimer)):
         msg = """Expected _timer to be of type %s, but received %s"""
-        raise TypeError(msg % (QTimer, type(_timer)))
+        raise TypeError(msg % ((QTimer, WheelTimer), type(_timer)))
       _timer.stop()
       _timer.start()
       return _timer
@@ -0,0 +1,263 @@
+"""TimerWheel schedules every WheelTimer of a thread on a hierarchical
+timing wheel driven by a single QTimer."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import threading
+import time
+from typing import NoReturn, Callable
+
+from PySide6.QtCore import QObject, QTimer, Qt, Slot
+
+from workside.settings import Settings
+
+_bits = 6
+_size = 1 << _bits
+_mask = _size - 1
+_levels = 4
+_span = 1 << (_bits * _levels)
+
+
+def _now() -> int:
+  """Returns the current time in ticks"""
+  return time.monotonic_ns() // (Settings.timerWheelTick * 1000000)
+
+
+class _Timeout:
+  """Holds the callables connected to the timeout of a WheelTimer. This
+  mirrors the connect and disconnect of a Qt signal without requiring a
+  QObject."""
+
+  __slots__ = ('_callbacks',)
+
+  def __init__(self, ) -> None:
+    self._callbacks = []
+
+  def connect(self, callback: Callable) -> NoReturn:
+    """Connects the callback"""
+    self._callbacks.append(callback)
+
+  def disconnect(self, callback: Callable = None) -> NoReturn:
+    """Disconnects the callback or every callback if none is given"""
+    if callback is None:
+      return self._callbacks.clear()
+    self._callbacks.remove(callback)
+
+  def emit(self, ) -> NoReturn:
+    """Calls every connected callback"""
+    for callback in [*self._callbacks]:
+      callback()
+
+
+class WheelTimer:
+  """WheelTimer provides the part of the QTimer interface used by the
+  'timer' decorator, but is scheduled on the TimerWheel of the thread
+  creating it instead of owning a native timer. Starting, stopping and
+  restarting take constant time.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  __slots__ = ('timeout', '_interval', '_singleShot', '_deadline',
+               '_slot', '_wheel', '__weakref__')
+
+  def __init__(self, interval: int = 0, singleShot: bool = False) -> None:
+    self.timeout = _Timeout()
+    self._interval = interval
+    self._singleShot = singleShot
+    self._deadline = 0
+    self._slot = None
+    self._wheel = TimerWheel.forThread()
+
+  def interval(self) -> int:
+    """Getter-function for the interval in milliseconds"""
+    return self._interval
+
+  def setInterval(self, interval: int) -> NoReturn:
+    """Setter-function for the interval in milliseconds. An active timer
+    is restarted."""
+    self._interval = interval
+    if self._slot is not None:
+      self.start()
+
+  def isSingleShot(self) -> bool:
+    """Getter-function for the single shot flag"""
+    return self._singleShot
+
+  def setSingleShot(self, singleShot: bool) -> NoReturn:
+    """Setter-function for the single shot flag"""
+    self._singleShot = True if singleShot else False
+
+  def setTimerType(self, *_) -> NoReturn:
+    """Accepted for compatibility with QTimer. Every WheelTimer has the
+    precision given by Settings.timerWheelTick."""
+
+  def isActive(self) -> bool:
+    """Getter-function for the active flag"""
+    return self._slot is not None
+
+  def remainingTime(self) -> int:
+    """Returns the remaining time in milliseconds or -1 if inactive"""
+    if self._slot is None:
+      return -1
+    remaining = (self._deadline - _now()) * Settings.timerWheelTick
+    return max(remaining, 0)
+
+  def start(self, interval: int = None) -> NoReturn:
+    """Starts or restarts the timer"""
+    if interval is not None:
+      self._interval = interval
+    if self._slot is not None:
+      self._wheel.remove(self)
+    self._wheel.add(self)
+
+  def stop(self, ) -> NoReturn:
+    """Stops the timer"""
+    if self._slot is not None:
+      self._wheel.remove(self)
+
+
+class TimerWheel(QObject):
+  """TimerWheel schedules every WheelTimer of a thread on a hierarchical
+  timing wheel driven by a single QTimer. The wheel has four levels of 64
+  slots, with the slots of the first level one tick wide and the slots of
+  each further level as wide as the whole level below. A timer is placed
+  in the slot of the lowest level reaching its deadline, such that adding
+  and removing a timer takes constant time. When the first level wraps,
+  the next slot of the level above is emptied into the levels below.
+
+  The native timer is started only when a timer is due or a slot above
+  the first level must be emptied, and it is stopped while no timer is
+  active. Use 'forThread' to get the wheel of the current thread.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  _local = threading.local()
+
+  @classmethod
+  def forThread(cls) -> TimerWheel:
+    """Returns the wheel of the current thread, creating it if required"""
+    wheel = getattr(cls._local, 'wheel', None)
+    if wheel is None:
+      wheel = cls._local.wheel = cls()
+    return wheel
+
+  def __init__(self, *args, **kwargs) -> None:
+    QObject.__init__(self, *args, **kwargs)
+    self._wheel = [[set() for _ in range(_size)] for _ in range(_levels)]
+    self._tick = _now()
+    self._count = 0
+    self._wakeups = 0
+    self._timer = QTimer(self)
+    self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+    self._timer.setSingleShot(True)
+    self._timer.timeout.connect(self.advance)
+    self._wakeAt = None
+
+  def __len__(self) -> int:
+    """The number of active timers"""
+    return self._count
+
+  def getWakeupCount(self) -> int:
+    """Getter-function for the number of times the native timer fired"""
+    return self._wakeups
+
+  def _place(self, wheelTimer: WheelTimer) -> NoReturn:
+    """Places the timer in the slot reaching its deadline"""
+    deadline = wheelTimer._deadline
+    delta = min(max(deadline - self._tick, 0), _span - 1)
+    level = 0
+    while delta >= _size:
+      delta >>= _bits
+      level += 1
+    slot = self._wheel[level][(deadline >> (_bits * level)) & _mask]
+    slot.add(wheelTimer)
+    wheelTimer._slot = slot
+
+  def add(self, wheelTimer: WheelTimer) -> NoReturn:
+    """Schedules the timer after its interval"""
+    now = _now()
+    if not self._count:
+      self._tick = now
+    ticks = -(-wheelTimer._interval // Settings.timerWheelTick)
+    wheelTimer._deadline = now + max(ticks, 0) + 1
+    self._place(wheelTimer)
+    self._count += 1
+    if self._wakeAt is None or wheelTimer._deadline < self._wakeAt:
+      self._schedule(wheelTimer._deadline)
+
+  def remove(self, wheelTimer: WheelTimer) -> NoReturn:
+    """Removes the timer from its slot"""
+    wheelTimer._slot.discard(wheelTimer)
+    wheelTimer._slot = None
+    self._count -= 1
+    if not self._count:
+      self._timer.stop()
+      self._wakeAt = None
+
+  def _schedule(self, tick: int) -> NoReturn:
+    """Starts the native timer to fire at the given tick"""
+    self._wakeAt = tick
+    delay = max(tick - _now(), 0) * Settings.timerWheelTick
+    self._timer.start(delay)
+
+  def _nextWake(self) -> int | None:
+    """Returns the first tick at which a slot must be visited, or None if
+    every slot is empty"""
+    tick, best = self._tick, None
+    for level in range(_levels):
+      shift = _bits * level
+      slots = self._wheel[level]
+      current = tick >> shift
+      for step in range(1, _size + 1):
+        if slots[(current + step) & _mask]:
+          candidate = (current + step) << shift
+          if best is None or candidate < best:
+            best = candidate
+          break
+    return best
+
+  def _cascade(self, level: int) -> NoReturn:
+    """Empties the current slot of the given level into the levels
+    below"""
+    slot = self._wheel[level][(self._tick >> (_bits * level)) & _mask]
+    if not slot:
+      return
+    timers = [*slot]
+    slot.clear()
+    for wheelTimer in timers:
+      self._place(wheelTimer)
+
+  @Slot()
+  def advance(self, ) -> NoReturn:
+    """Visits every slot due up to now, skipping the empty slots in
+    between, and fires the timers due"""
+    self._wakeups += 1
+    self._wakeAt = None
+    now = _now()
+    fired = []
+    while self._count:
+      tick = self._nextWake()
+      if tick is None or tick > now:
+        break
+      self._tick = tick
+      level = _levels - 1
+      while level:
+        if not tick & ((1 << (_bits * level)) - 1):
+          self._cascade(level)
+        level -= 1
+      slot = self._wheel[0][tick & _mask]
+      if slot:
+        due = [*slot]
+        slot.clear()
+        for wheelTimer in due:
+          wheelTimer._slot = None
+        self._count -= len(due)
+        fired.extend(due)
+    self._tick = now
+    for wheelTimer in fired:
+      if not wheelTimer._singleShot and wheelTimer._slot is None:
+        self.add(wheelTimer)
+      wheelTimer.timeout.emit()
+    if self._count:
+      self._schedule(self._nextWake())
@@ -3,14 +3,36 @@
 #  Copyright (c) 2023 Asger Jon Vistisen
 from __future__ import annotations
 
-from icecream import ic
+from typing import TYPE_CHECKING
 
-from ._fontfamily import Family
-from ._basestyle import BaseStyle
-from ._styleinstances import backgroundStyle, labelStyle, headerStyle
-from ._styleinstances import debugStyle, lightSquareStyle, darkSquareStyle
-from ._styleinstances import outlineStyle, textButtonStyle, bezelStyle
-from ._styleinstances import baseButtonStyle, hoverButtonStyle, gridStyle
-from ._styleinstances import hoveredSquareStyle
+from moreworktoy import lazyExports
 
-ic.configureOutput(includeContext=True)
+if TYPE_CHECKING:
+  from ._fontfamily import Family
+  from ._fontcache import FontCache, fontCache
+  from ._basestyle import BaseStyle
+  from ._styleinstances import backgroundStyle, labelStyle, headerStyle
+  from ._styleinstances import debugStyle, lightSquareStyle, darkSquareStyle
+  from ._styleinstances import outlineStyle, textButtonStyle, bezelStyle
+  from ._styleinstances import baseButtonStyle, hoverButtonStyle, gridStyle
+  from ._styleinstances import hoveredSquareStyle
+
+__getattr__, __dir__ = lazyExports(__name__, {
+  'Family': '._fontfamily',
+  'FontCache': '._fontcache',
+  'fontCache': '._fontcache',
+  'BaseStyle': '._basestyle',
+  'backgroundStyle': '._styleinstances',
+  'labelStyle': '._styleinstances',
+  'headerStyle': '._styleinstances',
+  'debugStyle': '._styleinstances',
+  'lightSquareStyle': '._styleinstances',
+  'darkSquareStyle': '._styleinstances',
+  'outlineStyle': '._styleinstances',
+  'textButtonStyle': '._styleinstances',
+  'bezelStyle': '._styleinstances',
+  'baseButtonStyle': '._styleinstances',
+  'hoverButtonStyle': '._styleinstances',
+  'gridStyle': '._styleinstances',
+  'hoveredSquareStyle': '._styleinstances',
+})
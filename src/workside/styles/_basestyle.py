@@ -3,28 +3,32 @@
 #  Copyright (c) 2023 Asger Jon Vistisen
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, NoReturn
 
 from PySide6.QtCore import Qt, QRectF, QMargins
 from PySide6.QtGui import QBrush, QFont, QPen, QColor, QPainter, \
   QFontMetricsF
-from icecream import ic
 from worktoy.core import maybe
 from worktoy.typetools import TypeBag
 
 from workside.settings import Settings
-from workside.styles import Family
+from workside.styles import Family, FontCache, fontCache
 
 if TYPE_CHECKING:
   from workside.widgets import CoreWidget
+  from workside.styles._fontcache import FontKey
 
   Graphic = TypeBag(QPainter, CoreWidget)
 
-ic.configureOutput(includeContext=True)
-
 
 class BaseStyle:
-  """Instances must contain settings applied to QPainters"""
+  """Instances must contain settings applied to QPainters. The pen, brush
+  and font are created once from the data and are shared by every call to
+  the getters until the data is changed through 'setValue' or 'update'.
+  The shared objects must not be mutated by callers, who should instead
+  make a copy. Fonts and font metrics are taken from the process wide
+  FontCache."""
 
   _baseValues = dict(
     fillColor=QColor(0, 0, 0, 0),
@@ -47,32 +51,90 @@ class BaseStyle:
     self._data = {}
     for (key, val) in BaseStyle._baseValues.items():
       self._data |= {key: data.get(key, val)}
+    self._pen = None
+    self._brush = None
+    self._font = None
     self._fontMetrics = None
+    self._fontKey = None
     self._margins = None
+    self._version = 0
 
   def createMargins(self) -> None:
     """Creator-function for the margins"""
 
   def getMargins(self) -> QMargins:
     """Getter-function for the margins"""
-    return self.getData().get('margins')
-
-  def getData(self) -> dict:
-    """Getter-function for data"""
-    return self._data
+    return self._data.get('margins')
+
+  def getData(self) -> MappingProxyType:
+    """Getter-function for a read-only view of the data. Use 'setValue'
+    or 'update' to change the data."""
+    return MappingProxyType(self._data)
+
+  def getValue(self, key: str) -> Any:
+    """Getter-function for the value at the given key"""
+    if key in self._data:
+      return self._data[key]
+    raise KeyError('Style key %s not recognized!' % key)
+
+  def setValue(self, key: str, value: Any) -> NoReturn:
+    """Setter-function for the value at the given key"""
+    self.update(**{key: value})
+
+  def update(self, **kwargs) -> NoReturn:
+    """Sets the values given by the keyword arguments. The cached objects
+    are rebuilt only if a value actually changes."""
+    changed = False
+    for (key, val) in kwargs.items():
+      if key not in self._data:
+        raise KeyError('Style key %s not recognized!' % key)
+      if self._data[key] != val:
+        self._data[key] = val
+        changed = True
+    if changed:
+      self._invalidate()
+
+  def getVersion(self) -> int:
+    """Getter-function for the version, which is incremented whenever the
+    data changes"""
+    return self._version
+
+  def _invalidate(self) -> NoReturn:
+    """Clears the cached objects such that they are rebuilt from the data
+    when next requested"""
+    self._pen = None
+    self._brush = None
+    self._font = None
+    self._fontMetrics = None
+    self._fontKey = None
+    self._version += 1
+
+  def _createFontKey(self) -> NoReturn:
+    """Creator-function for the key of the font in the shared FontCache"""
+    self._fontKey = FontCache.createKey(self._data.get('fontFamily'),
+                                        self._data.get('fontWeight'),
+                                        self._data.get('fontSize'))
+
+  def getFontKey(self) -> FontKey:
+    """Getter-function for the key of the font in the shared FontCache"""
+    if self._fontKey is None:
+      self._createFontKey()
+    return self._fontKey
+
+  def _createFont(self) -> NoReturn:
+    """Creator-function for the QFont. The font is shared with every
+    other style of the same family, weight and size."""
+    self._font = fontCache.getFont(self.getFontKey())
 
   def getFont(self, ) -> QFont:
     """Getter-function for QFont"""
-    font = self._data.get('fontFamily').asQFont()
-    weight = self._data.get('fontWeight')
-    font.setWeight(weight)
-    fontSize = self._data.get('fontSize')
-    font.setPointSize(max(fontSize, Settings.minimumFontSize))
-    return font
+    if self._font is None:
+      self._createFont()
+    return self._font
 
   def _createFontMetrics(self) -> None:
     """Creator-function for font metrics"""
-    self._fontMetrics = QFontMetricsF(self.getFont())
+    self._fontMetrics = fontCache.getFontMetrics(self.getFontKey())
 
   def getFontMetrics(self) -> QFontMetricsF:
     """Getter-function for font metrics"""
@@ -85,23 +147,41 @@ class BaseStyle:
     raise TypeError(msg % (QFontMetricsF, type(self._fontMetrics)))
 
   def getBoundingRect(self, text: str) -> QRectF:
-    """Getter-function for bounding rect"""
-    return self.getFontMetrics().boundingRect(text)
+    """Getter-function for bounding rect. The measurement is memoized by
+    the shared FontCache."""
+    return fontCache.boundingRect(self.getFontKey(), text)
 
-  def getBrush(self) -> QBrush:
-    """Getter-function for QBrush"""
+  def getTextWidth(self, text: str) -> float:
+    """Getter-function for the horizontal advance of the text. The
+    measurement is memoized by the shared FontCache."""
+    return fontCache.horizontalAdvance(self.getFontKey(), text)
+
+  def _createBrush(self) -> NoReturn:
+    """Creator-function for the QBrush"""
     brush = QBrush()
     brush.setStyle(self._data.get('fillStyle'))
     brush.setColor(self._data.get('fillColor'))
-    return brush
+    self._brush = brush
 
-  def getPen(self) -> QPen:
-    """Getter-function for QPen"""
+  def getBrush(self) -> QBrush:
+    """Getter-function for QBrush"""
+    if self._brush is None:
+      self._createBrush()
+    return self._brush
+
+  def _createPen(self) -> NoReturn:
+    """Creator-function for the QPen"""
     pen = QPen()
     pen.setStyle(self._data.get('lineStyle'))
     pen.setColor(self._data.get('lineColor'))
     pen.setWidth(self._data.get('lineWidth'))
-    return pen
+    self._pen = pen
+
+  def getPen(self) -> QPen:
+    """Getter-function for QPen"""
+    if self._pen is None:
+      self._createPen()
+    return self._pen
 
   def __matmul__(self, other: Graphic) -> Graphic:
     """Applies these settings to the given painter"""
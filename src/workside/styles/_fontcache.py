@@ -0,0 +1,134 @@
+"""FontCache shares QFont and QFontMetricsF instances across the process
+and memoizes text measurements."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import NoReturn
+
+from PySide6.QtCore import QRectF
+from PySide6.QtGui import QFont, QFontMetricsF
+
+from workside.settings import Settings
+from workside.styles import Family
+
+FontKey = tuple[Family, QFont.Weight, int]
+
+
+class FontCache:
+  """FontCache shares QFont and QFontMetricsF instances across the process
+  and memoizes text measurements. Fonts are keyed by family, weight and
+  point size. Both the fonts and the measurements are held in bounded
+  least recently used caches whose sizes are given by
+  Settings.fontCacheSize and Settings.textCacheSize.
+
+  The fonts returned are shared and must not be mutated. The module level
+  instance 'fontCache' should be used rather than creating new instances.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  @staticmethod
+  def createKey(family: Family, weight: QFont.Weight = None,
+                size: int = None) -> FontKey:
+    """Creates the key of the font. The size is raised to
+    Settings.minimumFontSize."""
+    if not isinstance(family, Family):
+      msg = """Expected family to be of type %s, but received %s!"""
+      raise TypeError(msg % (Family, type(family)))
+    weight = QFont.Weight.Normal if weight is None else weight
+    size = 12 if size is None else size
+    return family, weight, max(size, Settings.minimumFontSize)
+
+  def __init__(self, ) -> None:
+    self._fonts = OrderedDict()
+    self._texts = OrderedDict()
+    self._fontHits = 0
+    self._fontMisses = 0
+    self._textHits = 0
+    self._textMisses = 0
+
+  def _createEntry(self, key: FontKey) -> list:
+    """Creates the font of the key and an empty slot for its metrics"""
+    family, weight, size = key
+    font = QFont()
+    font @ family
+    font.setWeight(weight)
+    font.setPointSize(size)
+    return [font, None]
+
+  def _getEntry(self, key: FontKey) -> list:
+    """Getter-function for the entry of the key"""
+    entry = self._fonts.get(key)
+    if entry is not None:
+      self._fontHits += 1
+      self._fonts.move_to_end(key)
+      return entry
+    self._fontMisses += 1
+    entry = self._fonts[key] = self._createEntry(key)
+    while len(self._fonts) > Settings.fontCacheSize:
+      self._fonts.popitem(last=False)
+    return entry
+
+  def getFont(self, key: FontKey) -> QFont:
+    """Getter-function for the font of the key"""
+    return self._getEntry(key)[0]
+
+  def getFontMetrics(self, key: FontKey) -> QFontMetricsF:
+    """Getter-function for the font metrics of the key"""
+    entry = self._getEntry(key)
+    if entry[1] is None:
+      entry[1] = QFontMetricsF(entry[0])
+    return entry[1]
+
+  def _measure(self, key: FontKey, text: str) -> list:
+    """Returns the memoized measurement of the text in the font"""
+    textKey = (key, text)
+    entry = self._texts.get(textKey)
+    if entry is not None:
+      self._textHits += 1
+      self._texts.move_to_end(textKey)
+      return entry
+    self._textMisses += 1
+    fontMetrics = self.getFontMetrics(key)
+    entry = [fontMetrics.boundingRect(text),
+             fontMetrics.horizontalAdvance(text)]
+    self._texts[textKey] = entry
+    while len(self._texts) > Settings.textCacheSize:
+      self._texts.popitem(last=False)
+    return entry
+
+  def boundingRect(self, key: FontKey, text: str) -> QRectF:
+    """Returns the bounding rectangle of the text in the font. The
+    rectangle returned is a copy and may be mutated."""
+    return QRectF(self._measure(key, text)[0])
+
+  def horizontalAdvance(self, key: FontKey, text: str) -> float:
+    """Returns the width of the text in the font"""
+    return self._measure(key, text)[1]
+
+  def clear(self) -> NoReturn:
+    """Removes every font and measurement"""
+    self._fonts.clear()
+    self._texts.clear()
+
+  def resetStats(self) -> NoReturn:
+    """Resets the counters"""
+    self._fontHits = 0
+    self._fontMisses = 0
+    self._textHits = 0
+    self._textMisses = 0
+
+  def getStats(self) -> dict[str, int]:
+    """Getter-function for the hit and miss counters"""
+    return dict(
+      fonts=len(self._fonts),
+      fontHits=self._fontHits,
+      fontMisses=self._fontMisses,
+      texts=len(self._texts),
+      textHits=self._textHits,
+      textMisses=self._textMisses,
+    )
+
+
+fontCache = FontCache()
@@ -8,11 +8,8 @@ from enum import Enum
 from PySide6.QtGui import QFont, QPainter
 from PySide6.QtCore import QObject
 from PySide6.QtWidgets import QWidget
-from icecream import ic
 from worktoy.core import maybe
 
-ic.configureOutput(includeContext=True)
-
 
 class Family(Enum):
   """Enum specifying font families"""
@@ -22,10 +22,6 @@ the following order:
 #  MIT Licence
 from __future__ import annotations
 
-from icecream import ic
-
-ic.configureOutput(includeContext=True)
-
 
 class PaintMeLike:
   """"""
@@ -7,13 +7,10 @@ of CoreWidget. """
 from __future__ import annotations
 
 from PySide6.QtGui import QBrush
-from icecream import ic
 from worktoy.typetools import CallMeMaybe
 
 from workside.styles import BaseStyle
 
-ic.configureOutput(includeContext=True)
-
 
 class StateStyle(BaseStyle):
   """StateStyle subclasses BaseStyle and provides style values that are
@@ -5,11 +5,9 @@ from __future__ import annotations
 
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor, QFont
-from icecream import ic
 
 from workside.styles import BaseStyle, Family
 
-ic.configureOutput(includeContext=True)
 _baseData = dict(
   fillColor=QColor(0, 0, 0, 0),
   fillStyle=Qt.BrushStyle.SolidPattern,
@@ -3,19 +3,51 @@
 #  Copyright (c) 2023 Asger Jon Vistisen
 from __future__ import annotations
 
-from icecream import ic
+from typing import TYPE_CHECKING
 
-from ._corewidget import CoreWidget
-from ._gridlayout import GridLayout
-from ._layoutBackground import LayoutBackground
-from ._mousebutton import MouseButton
-from ._buttonfactory import buttonFactory
-from ._abstractbutton import AbstractButton
-from ._debugbutton import DebugButton
-from ._stylestates import AbstractStyleStates, AbstractButtonStyle
-from ._label import Label
-from ._listwidget import ListWidget
-from ._logwidget import LogWidget
-from ._spacer import Spacer, VSpacer, HSpacer, DoubleSpacer
+from moreworktoy import lazyExports
 
-ic.configureOutput(includeContext=True)
+if TYPE_CHECKING:
+  from ._repaintscheduler import RepaintScheduler
+  from ._instrumentation import Instrumentation
+  from ._corewidget import CoreWidget
+  from ._gridlayout import GridLayout
+  from ._layoutBackground import LayoutBackground
+  from ._clickmachine import ClickMachine
+  from ._buttonfactory import buttonFactory
+  from ._abstractbutton import AbstractButton
+  from ._stylestates import AbstractStyleStates, AbstractButtonStyle
+  from ._debugbutton import DebugButton
+  from ._label import Label
+  from ._logmodel import LogModel
+  from ._logfiltermodel import LogFilterModel
+  from ._logbuffer import LogBuffer
+  from ._statusmonitor import StatusMonitor
+  from ._listwidget import ListWidget
+  from ._logwidget import LogWidget
+  from ._spacer import Spacer, VSpacer, HSpacer, DoubleSpacer
+
+__getattr__, __dir__ = lazyExports(__name__, {
+  'RepaintScheduler': '._repaintscheduler',
+  'Instrumentation': '._instrumentation',
+  'CoreWidget': '._corewidget',
+  'GridLayout': '._gridlayout',
+  'LayoutBackground': '._layoutBackground',
+  'ClickMachine': '._clickmachine',
+  'buttonFactory': '._buttonfactory',
+  'AbstractButton': '._abstractbutton',
+  'AbstractStyleStates': '._stylestates',
+  'AbstractButtonStyle': '._stylestates',
+  'DebugButton': '._debugbutton',
+  'Label': '._label',
+  'LogModel': '._logmodel',
+  'LogFilterModel': '._logfiltermodel',
+  'LogBuffer': '._logbuffer',
+  'StatusMonitor': '._statusmonitor',
+  'ListWidget': '._listwidget',
+  'LogWidget': '._logwidget',
+  'Spacer': '._spacer',
+  'VSpacer': '._spacer',
+  'HSpacer': '._spacer',
+  'DoubleSpacer': '._spacer',
+})
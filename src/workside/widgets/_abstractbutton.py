@@ -8,12 +8,9 @@ from typing import NoReturn
 
 from PySide6.QtCore import QEvent, Signal
 from PySide6.QtGui import QPaintEvent, QEnterEvent, QMouseEvent
-from icecream import ic
 
 from workside.settings import flag, timer, Settings
-from workside.widgets import CoreWidget, buttonFactory
-
-ic.configureOutput(includeContext=True)
+from workside.widgets import CoreWidget, buttonFactory, ClickMachine
 
 
 @buttonFactory('left')
@@ -42,6 +39,7 @@ class AbstractButton(CoreWidget):
 
   def __init__(self, *args, **kwargs) -> None:
     CoreWidget.__init__(self, *args, **kwargs)
+    self._clickMachine = None
     self.setMouseTracking(True)
     self.movingActivated.connect(self.activateMoving)
     self.movingActivated.connect(lambda: self.handleMovingChanged(True))
@@ -92,6 +90,35 @@ class AbstractButton(CoreWidget):
     self.update()
     CoreWidget.mouseMoveEvent(self, event)
 
+  def _createClickMachine(self) -> NoReturn:
+    """Creator-function for the click machine"""
+    self._clickMachine = ClickMachine(self, self.clickButtons)
+
+  def _getClickMachine(self) -> ClickMachine:
+    """Getter-function for the click machine"""
+    if self._clickMachine is None:
+      self._createClickMachine()
+      return self._getClickMachine()
+    if isinstance(self._clickMachine, ClickMachine):
+      return self._clickMachine
+    msg = """Expected click machine to be of type %s, but received %s!"""
+    raise TypeError(msg % (ClickMachine, type(self._clickMachine)))
+
+  def mousePressEvent(self, event: QMouseEvent) -> NoReturn:
+    """Implementation of mouse press event"""
+    self._getClickMachine().handle(event.button(), ClickMachine.PRESS)
+    CoreWidget.mousePressEvent(self, event)
+
+  def mouseReleaseEvent(self, event: QMouseEvent) -> NoReturn:
+    """Implementation of mouse release event"""
+    self._getClickMachine().handle(event.button(), ClickMachine.RELEASE)
+    CoreWidget.mouseReleaseEvent(self, event)
+
+  def mouseDoubleClickEvent(self, event: QMouseEvent) -> NoReturn:
+    """Implementation of mouse double click event"""
+    self._getClickMachine().handle(event.button(), ClickMachine.DOUBLE)
+    CoreWidget.mouseDoubleClickEvent(self, event)
+
   @abstractmethod
   def paintEvent(self, event: QPaintEvent) -> NoReturn:
     """Subclasses must implement paint event handling"""
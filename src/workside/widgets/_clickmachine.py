@@ -0,0 +1,172 @@
+"""ClickMachine classifies the mouse events received by a widget into
+clicks, double clicks and press-holds for each mouse button."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import time
+from typing import NoReturn, Callable
+
+from PySide6.QtCore import QTimer, Qt
+
+from workside.settings import Settings, WheelTimer
+
+IDLE, DOWN, HELD, UP = range(4)
+PRESS, RELEASE, DOUBLE, TIMEOUT = range(4)
+
+
+def _now() -> float:
+  """Returns the current time in milliseconds"""
+  return time.monotonic() * 1000
+
+
+class _ButtonSlot:
+  """State of one mouse button in a ClickMachine"""
+
+  __slots__ = ('state', 'pressedAt', 'singleLockUntil', 'doubleLockUntil',
+               'timer', 'pressHold', 'click', 'doubleClick')
+
+  def __init__(self, pressHold: Callable, click: Callable,
+               doubleClick: Callable) -> None:
+    self.state = IDLE
+    self.pressedAt = 0.
+    self.singleLockUntil = 0.
+    self.doubleLockUntil = 0.
+    self.timer = None
+    self.pressHold = pressHold
+    self.click = click
+    self.doubleClick = doubleClick
+
+
+class ClickMachine:
+  """ClickMachine classifies the mouse events received by a widget into
+  clicks, double clicks and press-holds for each mouse button. It is a
+  plain Python object holding one small state record per button and at
+  most one timer per button, which is created on first use.
+
+  Each event is dispatched through a table on the state of the button and
+  the type of event. A press starts the press-hold timer. A release within
+  Settings.releaseDeadLineTime of the press starts the click delay, after
+  which the click is emitted unless a double click arrived first. Presses
+  are ignored for Settings.singleClickLockoutTime after a click and double
+  clicks for Settings.doubleClickLockoutTime after a single click.
+
+  The widget must provide the signals named by the buttons given, for
+  example 'leftPressHold', 'leftClick' and 'leftDoubleClick' for the name
+  'left'.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  PRESS, RELEASE, DOUBLE, TIMEOUT = PRESS, RELEASE, DOUBLE, TIMEOUT
+
+  def __init__(self, widget: object,
+               buttons: list[tuple[Qt.MouseButton, str]]) -> None:
+    self._slots = {}
+    for (button, name) in buttons:
+      self._slots[button] = _ButtonSlot(
+        getattr(widget, '%sPressHold' % name).emit,
+        getattr(widget, '%sClick' % name).emit,
+        getattr(widget, '%sDoubleClick' % name).emit, )
+
+  def _createTimer(self, slot: _ButtonSlot) -> NoReturn:
+    """Creator-function for the timer of the slot"""
+    if Settings.timerWheel:
+      _timer = WheelTimer()
+    else:
+      _timer = QTimer()
+    _timer.setTimerType(Qt.TimerType.PreciseTimer)
+    _timer.setSingleShot(True)
+    _timer.timeout.connect(lambda: self._dispatch(slot, TIMEOUT))
+    slot.timer = _timer
+
+  def _startTimer(self, slot: _ButtonSlot, interval: int) -> NoReturn:
+    """Starts the timer of the slot"""
+    if slot.timer is None:
+      self._createTimer(slot)
+    slot.timer.start(interval)
+
+  def _stopTimer(self, slot: _ButtonSlot) -> NoReturn:
+    """Stops the timer of the slot"""
+    if slot.timer is not None:
+      slot.timer.stop()
+
+  def getTimers(self) -> list[QTimer | WheelTimer]:
+    """Getter-function for the timer of every button, creating them if
+    required"""
+    for slot in self._slots.values():
+      if slot.timer is None:
+        self._createTimer(slot)
+    return [slot.timer for slot in self._slots.values()]
+
+  def _press(self, slot: _ButtonSlot) -> NoReturn:
+    """The button is pressed"""
+    now = _now()
+    if now < slot.singleLockUntil:
+      return
+    slot.state = DOWN
+    slot.pressedAt = now
+    self._startTimer(slot, Settings.pressHoldTime)
+
+  def _release(self, slot: _ButtonSlot) -> NoReturn:
+    """The button is released before the press-hold"""
+    now = _now()
+    if now - slot.pressedAt > Settings.releaseDeadLineTime:
+      slot.state = IDLE
+      return self._stopTimer(slot)
+    slot.state = UP
+    slot.singleLockUntil = now + Settings.singleClickLockoutTime
+    self._startTimer(slot, Settings.releaseClickDelayTime)
+
+  def _hold(self, slot: _ButtonSlot) -> NoReturn:
+    """The button has been held down for the press-hold time"""
+    slot.state = HELD
+    slot.pressHold()
+
+  def _releaseHeld(self, slot: _ButtonSlot) -> NoReturn:
+    """The button is released after the press-hold"""
+    slot.state = IDLE
+
+  def _click(self, slot: _ButtonSlot) -> NoReturn:
+    """No double click arrived during the click delay"""
+    slot.state = IDLE
+    slot.doubleLockUntil = _now() + Settings.doubleClickLockoutTime
+    slot.click()
+
+  def _double(self, slot: _ButtonSlot) -> NoReturn:
+    """The button is double clicked"""
+    now = _now()
+    if now < slot.doubleLockUntil:
+      return
+    self._stopTimer(slot)
+    slot.state = IDLE
+    slot.singleLockUntil = now + Settings.singleClickLockoutTime
+    slot.doubleClick()
+
+  _table = {
+    (IDLE, PRESS): _press,
+    (UP, PRESS): _press,
+    (DOWN, RELEASE): _release,
+    (HELD, RELEASE): _releaseHeld,
+    (DOWN, TIMEOUT): _hold,
+    (UP, TIMEOUT): _click,
+    (IDLE, DOUBLE): _double,
+    (DOWN, DOUBLE): _double,
+    (UP, DOUBLE): _double,
+  }
+
+  def _dispatch(self, slot: _ButtonSlot, event: int) -> NoReturn:
+    """Dispatches the event on the state of the slot"""
+    handler = self._table.get((slot.state, event))
+    if handler is not None:
+      handler(self, slot)
+
+  def handle(self, button: Qt.MouseButton, event: int) -> NoReturn:
+    """Handles the event of the given type on the button. Buttons not
+    given to the machine are ignored."""
+    slot = self._slots.get(button)
+    if slot is not None:
+      self._dispatch(slot, event)
+
+  def getState(self, button: Qt.MouseButton) -> int:
+    """Getter-function for the state of the button"""
+    return self._slots[button].state
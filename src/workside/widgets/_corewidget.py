@@ -4,35 +4,82 @@ functionality."""
 #  Copyright (c) 2023 Asger Jon Vistisen
 from __future__ import annotations
 
-from PySide6.QtCore import QRectF, QRect, QPointF, QSizeF, QSize, Signal
-from PySide6.QtGui import QResizeEvent
+from collections import OrderedDict
+from typing import NoReturn, Any
+
+from PySide6.QtCore import QRectF, QRect, QPointF, QSizeF, QSize, Signal, \
+  QPoint, Qt, QMetaMethod
+from PySide6.QtGui import QResizeEvent, QPaintEvent, QPainter, QPixmap, \
+  QRegion
 from PySide6.QtWidgets import QWidget
-from icecream import ic
 
 from workside.functional import parseParent
 from workside.settings import Settings
 from workside.styles import BaseStyle
-
-ic.configureOutput(includeContext=True)
+from workside.widgets import RepaintScheduler, Instrumentation
 
 
 class CoreWidget(QWidget):
   """CoreWidget subclasses QWidget providing common and general
-  functionality."""
+  functionality.
+
+  Subclasses may opt in to caching their rendering by setting the class
+  attribute '_pixmapCaching' to True and implementing 'paintState'. The
+  default paint event then draws a QPixmap rendered once for each
+  combination of widget size, device pixel ratio, state key and style
+  key. At most Settings.pixmapCacheStates renderings are kept, dropping
+  the least recently drawn. The cache is cleared when the widget is
+  resized or given a new style. A subclass setting '_pixmapCaching'
+  without implementing 'paintState' raises TypeError when defined.
+
+  The paint, resize and mouse event handlers of CoreWidget and its
+  subclasses are timed by the Instrumentation while it is enabled."""
+
+  _pixmapCaching = False
+  _flags = 0
+  _flagListeners = 0
+  _repaintPending = False
 
   resized = Signal()
   newSize = Signal(QSize)
+  flagsChanged = Signal(int, int)
+
+  def __init_subclass__(cls, **kwargs) -> None:
+    """Instruments the event handlers of the subclass, if enabled, and
+    checks that subclasses opting in to pixmap caching paint their
+    state"""
+    super().__init_subclass__(**kwargs)
+    if cls._pixmapCaching and cls.paintState is CoreWidget.paintState:
+      msg = """%s caches pixmaps without implementing paintState!"""
+      raise TypeError(msg % cls.__name__)
+    Instrumentation.instance().instrumentClass(cls)
 
   def __init__(self, *args, **kwargs) -> None:
     parent = parseParent(*args, **kwargs)
     QWidget.__init__(self, parent)
     self._parent = parent
     self._style = None
+    self._pixmaps = None
 
   def update(self, *args, **kwargs) -> None:
-    """Reimplementation emitting signals when update request is received
-    and when it is completed"""
-    QWidget.update(self, *args, **kwargs)
+    """Reimplementation passing the update request to the RepaintScheduler
+    if Settings.repaintScheduler is set. The area to update may be given
+    as a QRect, a QRectF, a QRegion or as x, y, width and height."""
+    if not Settings.repaintScheduler:
+      return QWidget.update(self, *args, **kwargs)
+    if not args:
+      if self._repaintPending:
+        return
+      region = None
+    elif isinstance(args[0], QRegion):
+      region = args[0]
+    elif isinstance(args[0], QRectF):
+      region = QRegion(args[0].toAlignedRect())
+    elif isinstance(args[0], QRect):
+      region = QRegion(args[0])
+    else:
+      region = QRegion(*args)
+    RepaintScheduler.instance().request(self, region)
 
   def _setParent(self, parent: CoreWidget) -> None:
     """Setter-function for the parent widget. When using this method the
@@ -67,6 +114,7 @@ class CoreWidget(QWidget):
     """Setter-function for the style"""
     if isinstance(style, BaseStyle):
       self._style = style
+      self.clearPixmapCache()
     else:
       e = """Expected parent to be of type BaseStyle, but received %s!"""
       raise TypeError(e % type(self._parent))
@@ -99,6 +147,103 @@ class CoreWidget(QWidget):
 
   def resizeEvent(self, event: QResizeEvent) -> None:
     """Connects to signal"""
+    if event.oldSize() != event.size():
+      self.clearPixmapCache()
     self.resized.emit()
     self.newSize.emit(event.size())
     QWidget.resizeEvent(self, event)
+
+  def connectNotify(self, signal: QMetaMethod) -> NoReturn:
+    """Counts the connections to the flagsChanged signal, such that flags
+    are changed without emitting while nothing listens."""
+    if signal.name() == b'flagsChanged':
+      self._flagListeners += 1
+    QWidget.connectNotify(self, signal)
+
+  def disconnectNotify(self, signal: QMetaMethod) -> NoReturn:
+    """Counts the connections to the flagsChanged signal"""
+    if signal.name() == b'flagsChanged':
+      self._flagListeners = max(self._flagListeners - 1, 0)
+    QWidget.disconnectNotify(self, signal)
+
+  def getFlags(self) -> int:
+    """Getter-function for the bitfield of the flags applied to the class
+    by the flag decorator"""
+    return self._flags
+
+  def hasAnyFlags(self, mask: int) -> bool:
+    """Returns True if any flag in the mask is set"""
+    return True if self._flags & mask else False
+
+  def hasAllFlags(self, mask: int) -> bool:
+    """Returns True if every flag in the mask is set"""
+    return self._flags & mask == mask
+
+  def getStateKey(self) -> int:
+    """Getter-function for the key of the current state. By default, this
+    is the bitfield of the flags applied to the class. Subclasses
+    rendering only some of their flags should reimplement this method."""
+    return self._flags
+
+  def getStyleKey(self) -> Any:
+    """Getter-function for the key of the styles used to paint. Subclasses
+    painting with styles other than their own should reimplement this
+    method to include the versions of those."""
+    return self.getStyle().getVersion()
+
+  def clearPixmapCache(self) -> NoReturn:
+    """Removes every cached rendering"""
+    self._pixmaps = None
+
+  def _getPixmaps(self) -> OrderedDict:
+    """Getter-function for the cached renderings from the least to the
+    most recently drawn"""
+    if self._pixmaps is None:
+      self._pixmaps = OrderedDict()
+    return self._pixmaps
+
+  def _createPixmap(self, size: QSize, ratio: float) -> QPixmap:
+    """Creator-function for the rendering of the current state"""
+    pixmap = QPixmap(size * ratio)
+    pixmap.setDevicePixelRatio(ratio)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter()
+    painter.begin(pixmap)
+    self.paintState(painter, QRect(QPoint(0, 0), size))
+    painter.end()
+    return pixmap
+
+  def getPixmap(self) -> QPixmap:
+    """Getter-function for the rendering of the current state. At most
+    Settings.pixmapCacheStates renderings are kept, dropping the least
+    recently used."""
+    size, ratio = self.size(), self.devicePixelRatioF()
+    key = (size.width(), size.height(), ratio, self.getStateKey(),
+           self.getStyleKey())
+    pixmaps = self._getPixmaps()
+    pixmap = pixmaps.get(key)
+    if pixmap is not None:
+      pixmaps.move_to_end(key)
+      return pixmap
+    while len(pixmaps) >= Settings.pixmapCacheStates:
+      pixmaps.popitem(last=False)
+    pixmap = pixmaps[key] = self._createPixmap(size, ratio)
+    return pixmap
+
+  def paintState(self, painter: QPainter, viewRect: QRect) -> NoReturn:
+    """Paints the current state on the given painter. Subclasses opting in
+    to pixmap caching implement this method, and the default paints
+    nothing."""
+
+  def paintEvent(self, event: QPaintEvent) -> NoReturn:
+    """Draws the cached rendering if the subclass opts in to pixmap
+    caching"""
+    if not self._pixmapCaching:
+      return QWidget.paintEvent(self, event)
+    painter = QPainter()
+    painter.begin(self)
+    painter.drawPixmap(0, 0, self.getPixmap())
+    painter.end()
+
+
+Instrumentation.instance().setRoot(CoreWidget)
@@ -7,16 +7,15 @@ from __future__ import annotations
 from random import randint
 from typing import NoReturn, Never
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QRect
 from PySide6.QtGui import QPaintEvent, QPainter
-from icecream import ic
+from PySide6.QtWidgets import QSizePolicy
 from worktoy.waitaminute import ReadOnlyError
 
 from workside.styles import baseButtonStyle, textButtonStyle, \
   hoverButtonStyle
-from workside.widgets import CoreWidget, AbstractButton
-
-ic.configureOutput(includeContext=True)
+from workside.widgets import CoreWidget, AbstractButton, \
+  AbstractButtonStyle
 
 
 class DebugButton(AbstractButton):
@@ -25,6 +24,10 @@ class DebugButton(AbstractButton):
   #  Copyright (c) 2023 Asger Jon Vistisen
   #  MIT Licence"""
 
+  _pixmapCaching = True
+
+  buttonStyle = AbstractButtonStyle(baseButtonStyle, hover=hoverButtonStyle)
+
   def __new__(cls, *args, **kwargs) -> DebugButton:
     """LOL"""
     out = super().__new__(cls)
@@ -34,8 +37,8 @@ class DebugButton(AbstractButton):
   def __init__(self, *args, **kwargs) -> None:
     self._text = None
     AbstractButton.__init__(self, *args, **kwargs)
-    _policy = self.contract()
-    self.setSizePolicy(_policy)
+    _policy = QSizePolicy.Policy.Maximum
+    self.setSizePolicy(_policy, _policy)
     self.leftPressHold.connect(lambda: print(
       'AbstractButton: Left PressHold!'))
     self.leftClick.connect(lambda: print(
@@ -89,6 +92,7 @@ class DebugButton(AbstractButton):
     """Setter-function for the text"""
     if isinstance(text, str):
       self._text = text
+      self.clearPixmapCache()
     else:
       msg = """Expected text to be of type %s, but received: %s!"""
       raise TypeError(msg % (str, type(text)))
@@ -99,17 +103,25 @@ class DebugButton(AbstractButton):
     self.setMinimumSize(boundingRect.size().toSize())
     return CoreWidget.update(self)
 
-  def paintEvent(self, event: QPaintEvent) -> NoReturn:
-    """Implementation of paint event"""
-    painter = QPainter()
-    painter.begin(self)
-    style = baseButtonStyle if self.hover else hoverButtonStyle
-    style @ painter
-    viewRect = painter.viewport()
+  def getStateKey(self) -> int:
+    """Reimplementation keeping only the flag affecting the rendering"""
+    return self._flags & self.flagMasks['hover']
+
+  def getStyleKey(self) -> tuple:
+    """Reimplementation including the versions of the button styles"""
+    styles = (baseButtonStyle, hoverButtonStyle, textButtonStyle)
+    return tuple(style.getVersion() for style in styles)
+
+  def paintState(self, painter: QPainter, viewRect: QRect) -> NoReturn:
+    """Paints the current state on the painter"""
+    self.buttonStyle @ painter
     painter.drawRect(viewRect)
     textButtonStyle @ painter
     painter.drawText(viewRect, Qt.AlignmentFlag.AlignCenter, self._getText())
-    painter.end()
+
+  def paintEvent(self, event: QPaintEvent) -> NoReturn:
+    """Implementation of paint event drawing the cached rendering"""
+    CoreWidget.paintEvent(self, event)
 
   def _noDel(self) -> Never:
     """Illegal deleter"""
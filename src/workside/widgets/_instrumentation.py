@@ -0,0 +1,224 @@
+"""Instrumentation records the time CoreWidgets spend handling paint,
+resize and mouse events into histograms for each class."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import atexit
+import functools
+import os
+import sys
+import time
+from array import array
+from typing import NoReturn, Callable
+
+from workside.settings import Settings
+
+
+PAINT, RESIZE, MOUSE = range(3)
+KINDS = ('paint', 'resize', 'mouse')
+BUCKETS = 32
+
+_handlers = {
+  'paintEvent': PAINT,
+  'resizeEvent': RESIZE,
+  'mousePressEvent': MOUSE,
+  'mouseReleaseEvent': MOUSE,
+  'mouseDoubleClickEvent': MOUSE,
+  'mouseMoveEvent': MOUSE,
+}
+
+
+class _ClassRecord:
+  """Histograms of the event durations of one class. The counts are held
+  in one array of BUCKETS entries per kind of event, where bucket i holds
+  the durations below 2**i microseconds. The totals and maxima are held
+  in a second array of two entries per kind."""
+
+  __slots__ = ('name', 'counts', 'totals')
+
+  def __init__(self, name: str) -> None:
+    self.name = name
+    self.counts = array('Q', bytes(8 * BUCKETS * len(KINDS)))
+    self.totals = array('d', bytes(8 * 2 * len(KINDS)))
+
+  def record(self, kind: int, ns: int) -> NoReturn:
+    """Records the duration in nanoseconds"""
+    self.counts[kind * BUCKETS + min((ns // 1000).bit_length(),
+                                     BUCKETS - 1)] += 1
+    totals = self.totals
+    totals[2 * kind] += ns
+    if ns > totals[2 * kind + 1]:
+      totals[2 * kind + 1] = ns
+
+  def getCount(self, kind: int) -> int:
+    """Getter-function for the number of events of the kind"""
+    return sum(self.counts[kind * BUCKETS:(kind + 1) * BUCKETS])
+
+  def getQuantile(self, kind: int, quantile: float) -> float:
+    """Getter-function for the upper bound in milliseconds of the bucket
+    holding the given quantile of the durations of the kind"""
+    buckets = self.counts[kind * BUCKETS:(kind + 1) * BUCKETS]
+    target, seen = quantile * sum(buckets), 0
+    for (i, count) in enumerate(buckets):
+      seen += count
+      if count and seen >= target:
+        return min(2 ** i / 1000, self.totals[2 * kind + 1] / 1e6)
+    return 0.
+
+
+class Instrumentation:
+  """Instrumentation records the time CoreWidgets spend handling paint,
+  resize and mouse events into histograms for each class. While disabled,
+  the event handlers are the undecorated methods of the classes, such that
+  instrumentation costs nothing. Enabling it replaces the handlers defined
+  by CoreWidget and its subclasses with timing wrappers, and subclasses
+  created while it is enabled are wrapped as they are defined. Handlers
+  calling the handler of a parent class are recorded once, by the
+  outermost wrapper, against the class of the widget.
+
+  Instrumentation is enabled at import if the environment variable named
+  by Settings.instrumentationEnv is set to anything but '' or '0', in
+  which case the report is written to stderr at exit. This allows
+  instrumenting benchmarks and headless runs without changing code.
+  Use 'instance' to get the instrumentation of the application.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  _instance = None
+
+  @classmethod
+  def instance(cls) -> Instrumentation:
+    """Returns the instrumentation of the application, creating it if
+    required"""
+    if cls._instance is None:
+      cls._instance = cls()
+    return cls._instance
+
+  def __init__(self, ) -> None:
+    self._enabled = False
+    self._root = None
+    self._records = {}
+    self._originals = {}
+    self._active = None
+
+  def isEnabled(self) -> bool:
+    """Flag indicating whether the handlers are instrumented"""
+    return self._enabled
+
+  def setRoot(self, root: type) -> NoReturn:
+    """Sets the root class whose handlers and those of its subclasses are
+    instrumented. CoreWidget sets itself as the root when defined, and
+    enables instrumentation if the environment variable asks for it."""
+    self._root = root
+    value = os.environ.get(Settings.instrumentationEnv, '')
+    if value not in ('', '0') and not self._enabled:
+      self.enable()
+      atexit.register(lambda: print(self.formatReport(), file=sys.stderr))
+
+  def _getRecord(self, cls: type) -> _ClassRecord:
+    """Getter-function for the record of the class"""
+    record = self._records.get(cls)
+    if record is None:
+      record = self._records[cls] = _ClassRecord(cls.__name__)
+    return record
+
+  def _wrap(self, method: Callable, kind: int) -> Callable:
+    """Creates the timing wrapper of the event handler"""
+
+    @functools.wraps(method)
+    def wrapper(widget: object, *args, **kwargs) -> object:
+      """Times the event handler"""
+      active = self._active
+      if active is widget:
+        return method(widget, *args, **kwargs)
+      self._active = widget
+      start = time.perf_counter_ns()
+      try:
+        return method(widget, *args, **kwargs)
+      finally:
+        self._active = active
+        self._getRecord(type(widget)).record(
+          kind, time.perf_counter_ns() - start)
+
+    wrapper.__instrumented__ = method
+    return wrapper
+
+  def instrumentClass(self, cls: type) -> NoReturn:
+    """Wraps the event handlers defined by the class. The root class is
+    given wrappers for every handler, such that widgets inheriting the
+    handlers from Qt are recorded too."""
+    if not self._enabled:
+      return
+    for (name, kind) in _handlers.items():
+      method = cls.__dict__.get(name)
+      if method is None and cls is not self._root:
+        continue
+      if hasattr(method, '__instrumented__'):
+        continue
+      self._originals[(cls, name)] = method
+      if method is None:
+        method = getattr(cls, name)
+      setattr(cls, name, self._wrap(method, kind))
+
+  def _getClasses(self, ) -> list[type]:
+    """Getter-function for the root class and its subclasses"""
+    classes, pending = [], [self._root]
+    while pending:
+      cls = pending.pop()
+      if cls not in classes:
+        classes.append(cls)
+        pending.extend(cls.__subclasses__())
+    return classes
+
+  def enable(self, ) -> NoReturn:
+    """Instruments the root class and its subclasses"""
+    if self._enabled:
+      return
+    self._enabled = True
+    if self._root is not None:
+      for cls in self._getClasses():
+        self.instrumentClass(cls)
+
+  def disable(self, ) -> NoReturn:
+    """Restores the undecorated event handlers. The recorded histograms
+    are kept."""
+    self._enabled = False
+    for ((cls, name), method) in self._originals.items():
+      if method is None:
+        delattr(cls, name)
+      else:
+        setattr(cls, name, method)
+    self._originals = {}
+
+  def reset(self, ) -> NoReturn:
+    """Removes the recorded histograms"""
+    self._records = {}
+
+  def getReport(self, limit: int = None) -> list[dict]:
+    """Getter-function for the recorded statistics sorted by the total
+    time spent, with one entry for each class and kind of event. The
+    times are given in milliseconds, and p99 is the upper bound of the
+    histogram bucket holding the 99th percentile."""
+    rows = []
+    for record in self._records.values():
+      for (kind, name) in enumerate(KINDS):
+        count = record.getCount(kind)
+        if not count:
+          continue
+        total = record.totals[2 * kind] / 1e6
+        rows.append(dict(
+          cls=record.name, kind=name, count=count, total=total,
+          mean=total / count, p99=record.getQuantile(kind, 0.99),
+          max=record.totals[2 * kind + 1] / 1e6))
+    rows.sort(key=lambda row: row['total'], reverse=True)
+    return rows if limit is None else rows[:limit]
+
+  def formatReport(self, limit: int = None) -> str:
+    """Returns the report as a table of text"""
+    lines = ['%-24s %-6s %8s %10s %9s %9s %9s' % (
+      'class', 'event', 'count', 'total ms', 'mean ms', 'p99 ms', 'max ms')]
+    for row in self.getReport(limit):
+      lines.append('%(cls)-24.24s %(kind)-6s %(count)8d %(total)10.2f '
+                   '%(mean)9.3f %(p99)9.3f %(max)9.3f' % row)
+    return '\n'.join(lines)
@@ -3,23 +3,20 @@
 #  Copyright (c) 2023 Asger Jon Vistisen
 from __future__ import annotations
 
-import string
-from random import choices
-
-from PySide6.QtCore import Qt, QRectF, QMargins
-from PySide6.QtGui import QPaintEvent, QPainter, QFontMetrics, QFont, QColor
-from icecream import ic
+from PySide6.QtCore import Qt, QRectF, QMargins, QPointF, QSize
+from PySide6.QtGui import QPaintEvent, QPainter, QFontMetricsF, QFont, \
+  QColor, QStaticText, QTransform
 from worktoy.core import maybe
 
 from workside.styles import BaseStyle
 from workside.widgets import CoreWidget
 from workside.settings import Settings
 
-ic.configureOutput(includeContext=True)
-
 
 class Label(CoreWidget):
-  """Label provides an alternative to QLabel
+  """Label provides an alternative to QLabel. The truncated text is
+  kept in a QStaticText laid out when the text, the style or the width
+  changes, such that repainting an unchanged label measures nothing.
   #  Copyright (c) 2023 Asger Jon Vistisen
   #  MIT Licence"""
 
@@ -36,8 +33,11 @@ class Label(CoreWidget):
   def __init__(self, *args, **kwargs) -> None:
     CoreWidget.__init__(self, *args, **kwargs)
     self._words = None
+    self._text = None
+    self._textVersion = 0
+    self._staticText = None
+    self._layoutKey = None
     self._styleSettings = None
-    self._fontMetrics = None
     self._font = None
     self._margins = None
 
@@ -63,59 +63,58 @@ class Label(CoreWidget):
       raise TypeError
 
   def _getFont(self) -> QFont:
-    """Getter-function for the font"""
+    """Getter-function for the font. This is the font of the style shared
+    through the FontCache."""
     if self._style is None:
       self._createStyle()
       return self._getFont()
-    font = self.getStyle().getFont()
-    self._createFontMetrics(font)
-    return font
+    return self.getStyle().getFont()
 
   def setFont(self, font: QFont) -> None:
     """Setter-function for the font"""
     self._createFont(font)
-    self._createFontMetrics(font)
 
-  def _createFontMetrics(self, font: QFont = None) -> None:
-    """Creator-function for the font metrics"""
-    if font is None:
-      font = self._getFont()
-    if isinstance(font, QFont):
-      self._fontMetrics = QFontMetrics(font)
-
-  def _getFontMetrics(self, ) -> QFontMetrics:
-    """Getter-function for the font metrics"""
-    if self._fontMetrics is None:
-      self._createFontMetrics()
-      return self._getFontMetrics()
-    if isinstance(self._fontMetrics, QFontMetrics):
-      return self._fontMetrics
+  def _getFontMetrics(self, ) -> QFontMetricsF:
+    """Getter-function for the font metrics. These are the metrics of the
+    style shared through the FontCache."""
+    fontMetrics = self.getStyle().getFontMetrics()
+    if isinstance(fontMetrics, QFontMetricsF):
+      return fontMetrics
     raise TypeError
 
   def _getBoundingRect(self, text: str = None) -> QRectF:
     """Getter-function for the QRectF that would be required to bound the
-    given text by the given font."""
-    letters = [*string.ascii_lowercase, *string.ascii_uppercase]
-    text = maybe(text, ''.join(choices(letters, k=self._getMaxLength())))
+    given text by the given font. If no text is given, the rectangle
+    bounds the number of average characters given by the maximum length.
+    Measurements of given text are memoized by the FontCache."""
+    if text is None:
+      fontMetrics = self._getFontMetrics()
+      width = fontMetrics.averageCharWidth() * self._getMaxLength()
+      return QRectF(0, 0, width, fontMetrics.height())
     if isinstance(text, str):
-      return self._getFontMetrics().boundingRect(text).toRectF()
+      return self.getStyle().getBoundingRect(text)
     raise TypeError
 
   def setStyle(self, style: BaseStyle) -> None:
-    """Reimplementation of the style setter such as to create the font
-    metrics immediately"""
+    """Reimplementation of the style setter such as to set the font
+    immediately"""
     self.setFont(style.getFont())
     CoreWidget.setStyle(self, style)
+    self._layoutKey = None
+    if self._words:
+      self.setMinimumSize(self._getTextSize())
 
   def setText(self, text: str) -> None:
     """Setter-function for the text"""
     for word in text.split(' '):
       self._getWords().append(word)
-    self.setMinimumSize(self._getBoundingRect(text).size().toSize())
+    self._textVersion += 1
+    self._text = None
+    self.setMinimumSize(self._getTextSize())
     self.update()
 
-  def getText(self, ) -> str:
-    """Getter-function for the text"""
+  def _createText(self) -> None:
+    """Creator-function for the text truncated to the maximum length"""
     words = []
     for word in reversed(self._getWords()):
       if len(words) + len(word) + 1 > self._getMaxLength():
@@ -123,12 +122,51 @@ class Label(CoreWidget):
         break
       else:
         words.append(word)
-    text = ' '.join(reversed(words))
-    fontMetrics = self._getFontMetrics()
-    boundingRect = fontMetrics.boundingRect(text) + self._getMargins()
-    boundingSize = boundingRect.size()
-    self.setMinimumSize(boundingSize)
-    return text
+    self._text = ' '.join(reversed(words))
+
+  def getText(self, ) -> str:
+    """Getter-function for the text"""
+    if self._text is None:
+      self._createText()
+    return self._text
+
+  def _getTextSize(self) -> QSize:
+    """Getter-function for the size required by the text and margins"""
+    boundingRect = self._getBoundingRect(self.getText())
+    return (boundingRect + self._getMargins()).size().toSize()
+
+  def _getLayoutKey(self) -> tuple:
+    """Getter-function for the values on which the static text depends"""
+    style = self.getStyle()
+    return self._textVersion, style, style.getVersion(), self.width()
+
+  def _createStaticText(self) -> None:
+    """Creator-function for the static text. The text is elided on the
+    left when wider than the space inside the margins. This is the only
+    place the text is measured."""
+    style = self.getStyle()
+    text = self.getText()
+    margins = self._getMargins()
+    available = self.width() - margins.left() - margins.right()
+    if 0 < available < style.getTextWidth(text):
+      fontMetrics = self._getFontMetrics()
+      elideMode = Qt.TextElideMode.ElideLeft
+      text = fontMetrics.elidedText(text, elideMode, available)
+    staticText = QStaticText(text)
+    staticText.setTextFormat(Qt.TextFormat.PlainText)
+    staticText.prepare(QTransform(), style.getFont())
+    self._staticText = staticText
+    self._layoutKey = self._getLayoutKey()
+
+  def _getStaticText(self) -> QStaticText:
+    """Getter-function for the static text, which is recreated only when
+    the text, the style or the width has changed."""
+    if self._layoutKey != self._getLayoutKey():
+      self._createStaticText()
+    if isinstance(self._staticText, QStaticText):
+      return self._staticText
+    msg = """Expected static text to be of type %s, but received %s!"""
+    raise TypeError(msg % (QStaticText, type(self._staticText)))
 
   def _getWords(self, ) -> list[str]:
     """Getter-function for the list of strings to be used construct the
@@ -143,25 +181,22 @@ class Label(CoreWidget):
   def show(self) -> None:
     """Reimplementation inserting a measure of the bounding rectangle
     setting the size"""
-    self.setMinimumSize(self._getBoundingRect().size())
+    self.setMinimumSize(self._getBoundingRect().size().toSize())
     CoreWidget.show(self)
 
   def paintEvent(self, event: QPaintEvent) -> None:
-    """Implementation of paint event"""
+    """Implementation of paint event. The static text is prepared ahead
+    of time, such that painting performs no text measurement."""
     CoreWidget.paintEvent(self, event)
-    alignFlag = Qt.AlignmentFlag.AlignCenter
+    staticText = self._getStaticText()
     painter = QPainter()
     painter.begin(self)
     self.getStyle() @ painter
-    text = self.getText()
     viewRectF = painter.viewport().toRectF()
-    viewCenter = viewRectF.center()
-    textRectF = viewRectF - self._getMargins()
-    textRectF.moveCenter(viewCenter)
-    boundingRect = QRectF(painter.boundingRect(textRectF, alignFlag, text))
-    boundingRect.moveCenter(viewCenter)
+    boundingRect = QRectF(QPointF(0, 0), staticText.size())
+    boundingRect.moveCenter(viewRectF.center())
     painter.fillRect(viewRectF, QColor(255, 0, 0, 63))
     painter.eraseRect(boundingRect, )
     painter.fillRect(boundingRect, QColor(223, 223, 223, 255))
-    painter.drawText(boundingRect, alignFlag, text)
+    painter.drawStaticText(boundingRect.topLeft(), staticText)
     painter.end()
@@ -1,4 +1,4 @@
-"""ListWidget subclasses QListWidget creating a list of items in a
+"""ListWidget subclasses QListView creating a list of items in a
 scrollable area."""
 #  Copyright (c) 2023 Asger Jon Vistisen
 #  MIT Licence
@@ -7,73 +7,244 @@ from __future__ import annotations
 import time
 from typing import NoReturn
 
-from PySide6.QtCore import Slot
+from PySide6.QtCore import Slot, Signal, QModelIndex
 from PySide6.QtGui import QPaintEvent
-from PySide6.QtWidgets import QListWidget, QListWidgetItem, QGridLayout
-from icecream import ic
+from PySide6.QtWidgets import QListView, QGridLayout
 from worktoy.core import maybe
 
-from workside.widgets import CoreWidget
+from workside.functional import parseParent
+from workside.logstore import LogSink, LogIndex, SegmentStore
+from workside.settings import Settings
+from workside.widgets import LogModel, LogFilterModel
 
-ic.configureOutput(includeContext=True)
 
+class ListWidget(QListView):
+  """ListWidget subclasses QListView creating a list of items in a
+  scrollable area. The items are held by a LogModel such that only the
+  visible rows are rendered and the memory used is bounded by the
+  capacity of the model. If Settings.logSpill is set, every message is
+  also kept in a SegmentStore from which older messages are paged in
+  when the user scrolls past the bottom, including those of earlier
+  sessions. The store is written by the sink on its worker thread.
 
-class ListWidget(QListWidget):
-  """ListWidget subclasses QListWidget creating a list of items in a
-  scrollable area.
+  Every message is indexed by the sink persisting it. Setting a filter
+  shows only the matching messages through a LogFilterModel, which is
+  replaced by the LogModel again when the filter is cleared.
   #  Copyright (c) 2023 Asger Jon Vistisen
   #  MIT Licence"""
 
+  hoveredText = Signal(str)
+  clickedText = Signal(str)
+  doubleClickedText = Signal(str)
+  savedContents = Signal(str)
+  saveFailed = Signal(str)
+
   def __init__(self, *args, **kwargs) -> None:
-    parent = CoreWidget.parseParent(*args, **kwargs)
-    QListWidget.__init__(self, parent)
+    parent = parseParent(*args, **kwargs)
+    QListView.__init__(self, parent)
     self.setMouseTracking(True)
-    self._logs = []
+    self.setUniformItemSizes(True)
+    self._model = None
+    self._store = None
+    self._filterModel = None
+    self._index = None
+    self._sink = None
+    self._created = time.strftime('%Y%m%d-%H%M%S')
     self._baseLayout = None
     self._saveFileDialog = None
     self._loadFileDialog = None
     self._name = None
     self._hoverItem = None
     self._clickedItem = None
-    self._doubleClicked = None
+    self._doubleClickedItem = None
+    self.setModel(self._getModel())
+    self.entered.connect(self._handleEntered)
+    self.clicked.connect(self._handleClicked)
+    self.doubleClicked.connect(self._handleDoubleClicked)
+    self.verticalScrollBar().actionTriggered.connect(self._handleScroll)
+
+  def _createStore(self) -> NoReturn:
+    """Creator-function for the store keeping the history"""
+    directory = LogSink.getDefaultDirectory()
+    self._store = SegmentStore(self._getName(), directory)
+
+  def _getStore(self) -> SegmentStore:
+    """Getter-function for the store keeping the history"""
+    if self._store is None:
+      self._createStore()
+      return self._getStore()
+    if isinstance(self._store, SegmentStore):
+      return self._store
+    raise TypeError
+
+  def _createModel(self) -> NoReturn:
+    """Creator-function for the model"""
+    store = self._getStore() if Settings.logSpill else None
+    self._model = LogModel(parent=self, store=store)
+
+  def _getModel(self) -> LogModel:
+    """Getter-function for the model"""
+    if self._model is None:
+      self._createModel()
+      return self._getModel()
+    if isinstance(self._model, LogModel):
+      return self._model
+    raise TypeError
+
+  def _createFilterModel(self) -> NoReturn:
+    """Creator-function for the filter model"""
+    self._filterModel = LogFilterModel(self._getIndex(), self)
+    self._filterModel.setSourceModel(self._getModel())
+
+  def _getFilterModel(self) -> LogFilterModel:
+    """Getter-function for the filter model"""
+    if self._filterModel is None:
+      self._createFilterModel()
+      return self._getFilterModel()
+    if isinstance(self._filterModel, LogFilterModel):
+      return self._filterModel
+    raise TypeError
+
+  def _createIndex(self) -> NoReturn:
+    """Creator-function for the index of the logs. The index is created
+    with the sink before the first message is inserted, such that it
+    numbers the messages as the model does."""
+    self._index = LogIndex(self._getModel().getTotal())
+
+  def _getIndex(self) -> LogIndex:
+    """Getter-function for the index of the logs"""
+    if self._index is None:
+      self._createIndex()
+      return self._getIndex()
+    if isinstance(self._index, LogIndex):
+      return self._index
+    raise TypeError
+
+  def _createSink(self) -> NoReturn:
+    """Creator-function for the sink persisting the logs"""
+    name = '%s-%s' % (self._getName(), self._created)
+    store = self._getModel().getStore()
+    self._sink = LogSink(name, index=self._getIndex(), store=store)
 
-  def _getHoverItem(self) -> QListWidgetItem:
+  def _getSink(self) -> LogSink:
+    """Getter-function for the sink persisting the logs"""
+    if self._sink is None:
+      self._createSink()
+      return self._getSink()
+    if isinstance(self._sink, LogSink):
+      return self._sink
+    raise TypeError
+
+  def _getHoverItem(self) -> str:
     """Getter-function for the hovered item"""
-    if isinstance(self._hoverItem, QListWidgetItem):
+    if isinstance(self._hoverItem, str):
       return self._hoverItem
 
-  def _setHoverItem(self, item: QListWidgetItem) -> NoReturn:
+  def _setHoverItem(self, item: str) -> NoReturn:
     """Setter-function for the hovered item"""
-    if isinstance(item, QListWidgetItem):
+    if isinstance(item, str):
       self._hoverItem = item
 
-  def _getClickedItem(self) -> QListWidgetItem:
+  def _getClickedItem(self) -> str:
     """Getter-function for the clicked item"""
-    if isinstance(self._clickedItem, QListWidgetItem):
+    if isinstance(self._clickedItem, str):
       return self._clickedItem
 
-  def _setClickedItem(self, item: QListWidgetItem) -> NoReturn:
+  def _setClickedItem(self, item: str) -> NoReturn:
     """Setter-function for the clicked item"""
-    if isinstance(item, QListWidgetItem):
+    if isinstance(item, str):
       self._clickedItem = item
 
-  def _getDoubleClickedItem(self) -> QListWidgetItem:
+  def _getDoubleClickedItem(self) -> str:
     """Getter-function for the double-clicked item"""
-    if isinstance(self._doubleClickedItem, QListWidgetItem):
+    if isinstance(self._doubleClickedItem, str):
       return self._doubleClickedItem
 
-  def _setDoubleClickedItem(self, item: QListWidgetItem) -> NoReturn:
+  def _setDoubleClickedItem(self, item: str) -> NoReturn:
     """Setter-function for the double-clicked item"""
-    if isinstance(item, QListWidgetItem):
+    if isinstance(item, str):
       self._doubleClickedItem = item
 
+  @Slot(QModelIndex)
+  def _handleEntered(self, index: QModelIndex) -> NoReturn:
+    """Emits the text of the hovered item"""
+    self._setHoverItem(index.data())
+    self.hoveredText.emit(self._getHoverItem())
+
+  @Slot(QModelIndex)
+  def _handleClicked(self, index: QModelIndex) -> NoReturn:
+    """Emits the text of the clicked item"""
+    self._setClickedItem(index.data())
+    self.clickedText.emit(self._getClickedItem())
+
+  @Slot(QModelIndex)
+  def _handleDoubleClicked(self, index: QModelIndex) -> NoReturn:
+    """Emits the text of the double-clicked item"""
+    self._setDoubleClickedItem(index.data())
+    self.doubleClickedText.emit(self._getDoubleClickedItem())
+
+  @Slot(int)
+  def _handleScroll(self, _: int) -> NoReturn:
+    """Pages in older messages when the user scrolls past the bottom. The
+    scroll bar triggers actions only on input from the user, such that
+    scrolling by the view itself never pages. The sink is flushed first,
+    such that the store holds the messages paged in."""
+    scrollBar = self.verticalScrollBar()
+    if scrollBar.sliderPosition() < scrollBar.maximum():
+      return
+    if self._sink is not None:
+      self._sink.flush(Settings.logSpillFlushTimeout)
+    model = self._getModel()
+    model.armFetch()
+    model.fetchMore()
+
   @Slot(str)
   def insertText(self, label: str) -> NoReturn:
-    """Inserts the given text"""
-    self._logs.append(label)
-    item = QListWidgetItem(label)
-    QListWidget.insertItem(self, 0, item)
-    self.scrollToItem(item)
+    """Inserts the given text. The view follows the newest item only if
+    it is already scrolled to the top."""
+    scrollBar = self.verticalScrollBar()
+    atTop = scrollBar.value() == scrollBar.minimum()
+    self._getSink().put(label)
+    self._getModel().append(label)
+    if atTop:
+      self.scrollToTop()
+
+  @Slot(list)
+  def insertTexts(self, labels: list[str]) -> NoReturn:
+    """Inserts the given texts in a single operation"""
+    scrollBar = self.verticalScrollBar()
+    atTop = scrollBar.value() == scrollBar.minimum()
+    self._getSink().putAll(labels)
+    self._getModel().extend(labels)
+    if atTop:
+      self.scrollToTop()
+
+  def getCapacity(self) -> int:
+    """Getter-function for the maximum number of items held in memory"""
+    return self._getModel().getCapacity()
+
+  def setCapacity(self, capacity: int) -> NoReturn:
+    """Setter-function for the maximum number of items held in memory.
+    The newest items that fit are kept."""
+    self._getModel().setCapacity(capacity)
+
+  def getFilter(self) -> str:
+    """Getter-function for the filter"""
+    if self._filterModel is None:
+      return ''
+    return self._getFilterModel().getQuery()
+
+  @Slot(str)
+  def setFilter(self, query: str) -> NoReturn:
+    """Setter-function for the filter. Only messages containing every word
+    in the query are shown, with the last word matched as a prefix."""
+    if query.strip():
+      self._getFilterModel().setQuery(query)
+      if self.model() is not self._filterModel:
+        self.setModel(self._filterModel)
+    elif self._filterModel is not None:
+      self.setModel(self._getModel())
+      self._filterModel.setQuery('')
 
   def _createBaseLayout(self) -> NoReturn:
     """Creator-function for the base layout"""
@@ -105,20 +276,22 @@ class ListWidget(QListWidget):
 
   @Slot(str)
   def saveContents(self, fileName: str) -> NoReturn:
-    """Saves the logs to disk"""
-    with open(fileName, 'w') as f:
-      header = self._getHeader()
-      data = '%s\n%s' % (header, '\n'.join(self._logs))
-      f.write(data)
+    """Saves the logs to disk. The file is written by the sink on its
+    worker thread as plain text from the segments already persisted,
+    and the savedContents signal is emitted with the file name once
+    written. If the file could not be written, the saveFailed signal is
+    emitted with a description of the error instead."""
+    self._getSink().snapshot(fileName, self._getHeader(),
+                             self.savedContents.emit, self._emitSaveFailed)
+
+  def _emitSaveFailed(self, error: OSError) -> NoReturn:
+    """Emits the saveFailed signal describing the error. This is called
+    from the worker thread of the sink."""
+    self.saveFailed.emit('Unable to save logs: %s' % error)
 
   def _getLogs(self) -> list[str]:
-    """Getter-function for the logs"""
-    if self._logs is None:
-      self._logs = []
-      return self._getLogs()
-    if isinstance(self._logs, list):
-      return self._logs
-    raise TypeError
+    """Getter-function for the logs from the oldest to the newest"""
+    return [*self._getModel()]
 
   def paintEvent(self, event: QPaintEvent) -> NoReturn:
     """Implementation printing the size"""
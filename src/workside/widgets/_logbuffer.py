@@ -0,0 +1,121 @@
+"""LogBuffer collects log messages from any thread until the next frame
+flushes them into the LogModel in a single batch."""
+#  Copyright (c) 2023 Asger Jon Vistisen
+#  MIT Licence
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import NoReturn
+
+
+class LogBuffer:
+  """LogBuffer collects log messages from any thread until the next frame
+  flushes them into the LogModel in a single batch. Appending relies on
+  deque.append and deque.extend being atomic, such that writers never
+  take a lock. Only the GUI thread may call 'drain'.
+
+  The buffer keeps counters of the batch sizes and latencies which are
+  available as a dictionary from 'getStats'. The number of messages ever
+  enqueued is available from 'getPutCount' without counting on the
+  writing threads, as it is the number drained plus the number pending.
+  #  Copyright (c) 2023 Asger Jon Vistisen
+  #  MIT Licence"""
+
+  def __init__(self, ) -> None:
+    self._queue = deque()
+    self._firstPut = None
+    self._drainCount = 0
+    self._flushCount = 0
+    self._rowCount = 0
+    self._lastBatchSize = 0
+    self._maxBatchSize = 0
+    self._lastWait = 0.
+    self._maxWait = 0.
+    self._totalWait = 0.
+    self._lastDuration = 0.
+    self._maxDuration = 0.
+    self._totalDuration = 0.
+
+  def put(self, message: str) -> NoReturn:
+    """Enqueues the message"""
+    if self._firstPut is None:
+      self._firstPut = time.perf_counter()
+    self._queue.append(message)
+
+  def putAll(self, messages: list[str]) -> NoReturn:
+    """Enqueues the messages"""
+    if self._firstPut is None:
+      self._firstPut = time.perf_counter()
+    self._queue.extend(messages)
+
+  def __len__(self) -> int:
+    """The number of pending messages"""
+    return len(self._queue)
+
+  def __bool__(self) -> bool:
+    """True if any messages are pending"""
+    return True if self._queue else False
+
+  def drain(self) -> list[str]:
+    """Removes and returns the pending messages. Messages enqueued by other
+    threads during the drain are left for the next drain."""
+    queue = self._queue
+    popleft = queue.popleft
+    firstPut, self._firstPut = self._firstPut, None
+    out = [popleft() for _ in range(len(queue))]
+    self._drainCount += len(out)
+    if out and firstPut is not None:
+      wait = time.perf_counter() - firstPut
+      self._lastWait = wait
+      self._maxWait = max(self._maxWait, wait)
+      self._totalWait += wait
+    return out
+
+  def getPutCount(self) -> int:
+    """Getter-function for the number of messages enqueued in total. Only
+    the GUI thread may call this method."""
+    return self._drainCount + len(self._queue)
+
+  def recordFlush(self, batchSize: int, duration: float) -> NoReturn:
+    """Records the size and duration of a completed flush"""
+    self._flushCount += 1
+    self._rowCount += batchSize
+    self._lastBatchSize = batchSize
+    self._maxBatchSize = max(self._maxBatchSize, batchSize)
+    self._lastDuration = duration
+    self._maxDuration = max(self._maxDuration, duration)
+    self._totalDuration += duration
+
+  def resetStats(self) -> NoReturn:
+    """Resets the counters"""
+    self._flushCount = 0
+    self._rowCount = 0
+    self._lastBatchSize = 0
+    self._maxBatchSize = 0
+    self._lastWait = 0.
+    self._maxWait = 0.
+    self._totalWait = 0.
+    self._lastDuration = 0.
+    self._maxDuration = 0.
+    self._totalDuration = 0.
+
+  def getStats(self) -> dict[str, float]:
+    """Getter-function for the counters. Latencies are in milliseconds.
+    The wait is the time from the first message of a batch being enqueued
+    until it is flushed. The duration is the time taken by the flush."""
+    flushes = max(self._flushCount, 1)
+    return dict(
+      pending=len(self._queue),
+      flushCount=self._flushCount,
+      rowCount=self._rowCount,
+      lastBatchSize=self._lastBatchSize,
+      maxBatchSize=self._maxBatchSize,
+      meanBatchSize=self._rowCount / flushes,
+      lastWait=self._lastWait * 1000,
+      maxWait=self._maxWait * 1000,
+      meanWait=self._totalWait / flushes * 1000,
+      lastDuration=self._lastDuration * 1000,
+      maxDuration=self._maxDuration * 1000,
+      meanDuration=self._totalDuration / flushes * 1000,
+    )
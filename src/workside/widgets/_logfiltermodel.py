@@ -0,0 +1,197 @@
+"""LogFilterModel subclasses QAbstractProxyModel showing the rows of a
+LogModel matching a query."""
+#  Copyright (c) 2023 Asger Jon Vistisen
+#  MIT Licence
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any, NoReturn
+
+from PySide6.QtCore import QAbstractProxyModel, QModelIndex, Qt, \
+  QPersistentModelIndex, QObject, Slot
+
+from workside.logstore import LogIndex, parseQuery, matchesQuery
+from workside.settings import Settings
+from workside.widgets import LogModel
+
+Index = QModelIndex | QPersistentModelIndex
+
+
+class LogFilterModel(QAbstractProxyModel):
+  """LogFilterModel subclasses QAbstractProxyModel showing the rows of a
+  LogModel matching a query. The query is a list of words each of which
+  must occur in a message for it to match. The last word is matched as a
+  prefix while it is being typed.
+
+  The matching messages are kept as a list of sequence numbers in
+  ascending order. Since the LogModel only inserts at the top and drops
+  from the bottom, new matches are appended and dropped matches removed
+  from the front without renumbering any other row.
+
+  When the query changes, the matches among the messages already indexed
+  are looked up in the LogIndex, while messages not yet reached by the
+  index are matched directly. A prefix matching too many words to be
+  looked up efficiently is matched directly on the messages found by the
+  remaining words. Only messages indexed in this session are filtered,
+  such that history paged in from a SegmentStore is not.
+  #  Copyright (c) 2023 Asger Jon Vistisen
+  #  MIT Licence"""
+
+  def __init__(self, index: LogIndex, *args, **kwargs) -> None:
+    QAbstractProxyModel.__init__(self, *args, **kwargs)
+    self._index = index
+    self._query = ''
+    self._words = []
+    self._prefix = None
+    self._matches = []
+
+  def getQuery(self) -> str:
+    """Getter-function for the query"""
+    return self._query
+
+  def setQuery(self, query: str) -> NoReturn:
+    """Setter-function for the query"""
+    self._query = query
+    self._words, self._prefix = parseQuery(query)
+    self.refilter()
+
+  def _getLogModel(self) -> LogModel:
+    """Getter-function for the source model"""
+    model = self.sourceModel()
+    if isinstance(model, LogModel):
+      return model
+    msg = """Expected source model to be of type %s, but received %s!"""
+    raise TypeError(msg % (LogModel, type(model)))
+
+  def setSourceModel(self, model: LogModel) -> NoReturn:
+    """Reimplementation connecting the signals of the LogModel"""
+    oldModel = self.sourceModel()
+    if isinstance(oldModel, LogModel):
+      oldModel.rowsInserted.disconnect(self._handleInserted)
+      oldModel.rowsRemoved.disconnect(self._handleRemoved)
+      oldModel.modelReset.disconnect(self.refilter)
+    QAbstractProxyModel.setSourceModel(self, model)
+    model.rowsInserted.connect(self._handleInserted)
+    model.rowsRemoved.connect(self._handleRemoved)
+    model.modelReset.connect(self.refilter)
+    self.refilter()
+
+  def _search(self, since: int, until: int) -> list[int]:
+    """Returns the sequence numbers of the matching messages from 'since'
+    until 'until'"""
+    words, prefix = self._words, self._prefix
+    if not words and prefix is None:
+      return [*range(since, until)]
+    model = self._getLogModel()
+    total = model.getTotal()
+    indexed = min(len(self._index), until)
+    if prefix is not None:
+      limit = Settings.logIndexPrefixLimit
+      if self._index.expand(prefix, limit) is None:
+        prefix = None
+    found = []
+    if indexed > since:
+      found = self._index.search(words, prefix, since)
+      if found is None:
+        found = [*range(since, indexed)]
+      del found[bisect_left(found, indexed):]
+      if prefix is None and self._prefix is not None:
+        getMessage = model.getMessage
+        found = [seq for seq in found if matchesQuery(
+          getMessage(total - 1 - seq), (), self._prefix)]
+    return found + self._matchDirectly(max(since, indexed), until)
+
+  def _matchDirectly(self, since: int, until: int) -> list[int]:
+    """Returns the sequence numbers of the matching messages from 'since'
+    until 'until' without using the index"""
+    words, prefix = self._words, self._prefix
+    if not words and prefix is None:
+      return [*range(since, until)]
+    model = self._getLogModel()
+    getMessage, total = model.getMessage, model.getTotal()
+    return [seq for seq in range(since, until)
+            if matchesQuery(getMessage(total - 1 - seq), words, prefix)]
+
+  @Slot()
+  def refilter(self) -> NoReturn:
+    """Finds the matching messages from scratch"""
+    model = self._getLogModel()
+    self.beginResetModel()
+    since = max(model.getOldest(), self._index.getStart())
+    self._matches = self._search(since, model.getTotal())
+    self.endResetModel()
+
+  @Slot(QModelIndex, int, int)
+  def _handleInserted(self, parent: Index, first: int, last: int) -> None:
+    """Appends the new messages that match. Rows paged in at the bottom
+    are not filtered."""
+    if first:
+      return
+    total = self._getLogModel().getTotal()
+    found = self._matchDirectly(total - (last - first + 1), total)
+    if found:
+      self.beginInsertRows(QModelIndex(), 0, len(found) - 1)
+      self._matches.extend(found)
+      self.endInsertRows()
+
+  @Slot(QModelIndex, int, int)
+  def _handleRemoved(self, parent: Index, first: int, last: int) -> None:
+    """Removes the matches that are no longer held by the source"""
+    dropped = bisect_left(self._matches, self._getLogModel().getOldest())
+    if dropped:
+      count = len(self._matches)
+      self.beginRemoveRows(QModelIndex(), count - dropped, count - 1)
+      del self._matches[:dropped]
+      self.endRemoveRows()
+
+  def _sourceRow(self, row: int) -> int:
+    """Returns the source row of the given row"""
+    seq = self._matches[len(self._matches) - 1 - row]
+    return self._getLogModel().getTotal() - 1 - seq
+
+  def rowCount(self, parent: Index = QModelIndex()) -> int:
+    """Implementation of row count"""
+    return 0 if parent.isValid() else len(self._matches)
+
+  def columnCount(self, parent: Index = QModelIndex()) -> int:
+    """Implementation of column count"""
+    return 0 if parent.isValid() else 1
+
+  def index(self, row: int, column: int = 0,
+            parent: Index = QModelIndex()) -> QModelIndex:
+    """Implementation of index"""
+    if parent.isValid() or column or not 0 <= row < len(self._matches):
+      return QModelIndex()
+    return self.createIndex(row, column)
+
+  def parent(self, *args) -> QModelIndex | QObject:
+    """Implementation of parent. The rows have no parent, while calling
+    without arguments returns the parent object."""
+    if args:
+      return QModelIndex()
+    return QAbstractProxyModel.parent(self)
+
+  def mapToSource(self, proxyIndex: Index) -> QModelIndex:
+    """Implementation of mapping to the source"""
+    if not proxyIndex.isValid():
+      return QModelIndex()
+    model = self._getLogModel()
+    return model.index(self._sourceRow(proxyIndex.row()), 0)
+
+  def mapFromSource(self, sourceIndex: Index) -> QModelIndex:
+    """Implementation of mapping from the source"""
+    if not sourceIndex.isValid():
+      return QModelIndex()
+    total = self._getLogModel().getTotal()
+    seq = total - 1 - sourceIndex.row()
+    i = bisect_left(self._matches, seq)
+    if i < len(self._matches) and self._matches[i] == seq:
+      return self.createIndex(len(self._matches) - 1 - i, 0)
+    return QModelIndex()
+
+  def data(self, index: Index, role: int = Qt.ItemDataRole.DisplayRole
+           ) -> Any:
+    """Implementation of data"""
+    if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+      return self._getLogModel().getMessage(self._sourceRow(index.row()))
+    return None
@@ -0,0 +1,238 @@
+"""LogModel subclasses QAbstractListModel holding log messages in a ring
+buffer of fixed capacity."""
+#  Copyright (c) 2023 Asger Jon Vistisen
+#  MIT Licence
+from __future__ import annotations
+
+from typing import Any, Iterator, NoReturn
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, \
+  QPersistentModelIndex
+from worktoy.core import maybe
+
+from workside.logstore import SegmentStore
+from workside.settings import Settings
+
+Index = QModelIndex | QPersistentModelIndex
+
+
+class LogModel(QAbstractListModel):
+  """LogModel subclasses QAbstractListModel holding log messages in a ring
+  buffer of fixed capacity. The newest message is at row 0. Appending a
+  message costs O(1) regardless of the number of messages held, and when
+  the buffer is full, the oldest message is dropped.
+
+  Every message appended is numbered in sequence starting from zero. The
+  message at row 0 has the sequence number one less than the total
+  count, which is not reset when messages are dropped or cleared.
+
+  If a SegmentStore is given, the numbering continues from the messages
+  already in the store. The model only reads from the store, which is
+  written by whoever persists the messages, such as a LogSink on its
+  worker thread, and paging stops at the messages written so far. Older
+  messages are paged in through 'fetchMore' only once 'armFetch' is
+  called, which the view does when the user scrolls past the bottom.
+  Views also call 'fetchMore' on their own, for example while rows are
+  removed, which would otherwise nest an insertion in the removal and
+  start paging without the user asking. The rows paged in are read from
+  the memory-mapped store only when shown.
+
+  While older messages are paged in, the rows dropped from the ring
+  remain in the model. As the store is written asynchronously, they are
+  kept in a pending list until the store holds them.
+  #  Copyright (c) 2023 Asger Jon Vistisen
+  #  MIT Licence"""
+
+  def __init__(self, capacity: int = None, *args,
+               store: SegmentStore = None, **kwargs) -> None:
+    QAbstractListModel.__init__(self, *args, **kwargs)
+    self._capacity = maybe(capacity, Settings.logCapacity)
+    if not isinstance(self._capacity, int):
+      msg = """Expected capacity to be of type %s, but received %s!"""
+      raise TypeError(msg % (int, type(self._capacity)))
+    if self._capacity < 1:
+      raise ValueError('Capacity must be positive!')
+    self._buffer = [None] * self._capacity
+    self._head = 0
+    self._count = 0
+    if store is not None and not isinstance(store, SegmentStore):
+      msg = """Expected store to be of type %s, but received %s!"""
+      raise TypeError(msg % (SegmentStore, type(store)))
+    self._store = store
+    self._total = 0 if store is None else len(store)
+    self._floor = self._total
+    self._pending = []
+    self._pendingStart = 0
+    self._fetchArmed = False
+    self._changing = False
+
+  def getTotal(self) -> int:
+    """Getter-function for the number of messages ever appended"""
+    return self._total
+
+  def getOldest(self) -> int:
+    """Getter-function for the sequence number of the oldest message
+    shown"""
+    return self._floor
+
+  def getStore(self) -> SegmentStore | None:
+    """Getter-function for the store"""
+    return self._store
+
+  def getCapacity(self) -> int:
+    """Getter-function for the capacity"""
+    return self._capacity
+
+  def setCapacity(self, capacity: int) -> NoReturn:
+    """Setter-function for the capacity. The newest messages that fit
+    in the new capacity are kept."""
+    if not isinstance(capacity, int):
+      msg = """Expected capacity to be of type %s, but received %s!"""
+      raise TypeError(msg % (int, type(capacity)))
+    if capacity < 1:
+      raise ValueError('Capacity must be positive!')
+    self.beginResetModel()
+    kept = list(self)[-capacity:]
+    self._capacity = capacity
+    self._buffer = kept + [None] * (capacity - len(kept))
+    self._count = len(kept)
+    self._head = self._count % capacity
+    self._floor = self._total - self._count
+    self._pending = []
+    self.endResetModel()
+
+  def rowCount(self, parent: Index = QModelIndex()) -> int:
+    """Implementation of row count"""
+    return 0 if parent.isValid() else self._total - self._floor
+
+  def getMessage(self, row: int) -> str:
+    """Getter-function for the message at the given row"""
+    if 0 <= row < self._count:
+      return self._buffer[(self._head - 1 - row) % self._capacity]
+    if self._count <= row < self._total - self._floor:
+      seq = self._total - 1 - row
+      i = seq - self._pendingStart
+      if 0 <= i < len(self._pending):
+        return self._pending[i]
+      return self._store.get(seq)
+    raise IndexError(row)
+
+  def _keepPending(self, dropped: int, excess: list[str]) -> NoReturn:
+    """Keeps the oldest messages dropped from the ring and the excess
+    messages of a batch exceeding the capacity until the store holds them,
+    discarding those it holds already"""
+    written = len(self._store)
+    if written > self._pendingStart:
+      del self._pending[:written - self._pendingStart]
+      self._pendingStart = written
+    if not self._pending:
+      self._pendingStart = self._total - self._count
+    start = self._head - self._count
+    for i in range(start, start + dropped):
+      self._pending.append(self._buffer[i % self._capacity])
+    self._pending.extend(excess)
+
+  def data(self, index: Index, role: int = Qt.ItemDataRole.DisplayRole
+           ) -> Any:
+    """Implementation of data"""
+    if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+      return self.getMessage(index.row())
+    return None
+
+  def append(self, message: str) -> NoReturn:
+    """Appends the message as the newest row, dropping the oldest row
+    if the buffer is full."""
+    self.extend([message])
+
+  def extend(self, messages: list[str]) -> NoReturn:
+    """Appends the messages as the newest rows such that the last message
+    ends at row 0. The rows are inserted in a single operation, dropping
+    the oldest rows in a single operation first if required. Rows paged
+    in from the store are kept, such that the view does not jump while
+    the user scrolls through the history."""
+    if not messages:
+      return
+    self._changing = True
+    total = self._total + len(messages)
+    paged = self._floor < self._total - self._count
+    inserted = len(messages) if paged else min(len(messages),
+                                               self._capacity)
+    excess = messages[:-self._capacity]
+    if excess:
+      messages = messages[-self._capacity:]
+    n = len(messages)
+    overflow = self._count + n - self._capacity
+    if paged:
+      self._keepPending(max(overflow, 0), excess)
+      self._count -= max(overflow, 0)
+    elif overflow > 0:
+      first = self._count - overflow
+      self.beginRemoveRows(QModelIndex(), first, self._count - 1)
+      self._count -= overflow
+      self._floor += overflow
+      self.endRemoveRows()
+    self.beginInsertRows(QModelIndex(), 0, inserted - 1)
+    buffer, capacity, head = self._buffer, self._capacity, self._head
+    end = head + n
+    if end <= capacity:
+      buffer[head:end] = messages
+    else:
+      split = capacity - head
+      buffer[head:] = messages[:split]
+      buffer[:end - capacity] = messages[split:]
+    self._head = end % capacity
+    self._count += n
+    self._total = total
+    if not paged:
+      self._floor = total - self._count
+    self.endInsertRows()
+    self._changing = False
+
+  def armFetch(self) -> NoReturn:
+    """Allows the next call to 'fetchMore' to page in older messages. To
+    be called only when the user scrolls past the bottom."""
+    self._fetchArmed = True
+
+  def canFetchMore(self, parent: Index = QModelIndex()) -> bool:
+    """Implementation of checking if older messages are available from the
+    store. This is False unless a fetch is armed and no rows are being
+    inserted or removed."""
+    if parent.isValid() or self._store is None:
+      return False
+    if self._changing or not self._fetchArmed:
+      return False
+    return 0 < self._floor <= len(self._store)
+
+  def fetchMore(self, parent: Index = QModelIndex()) -> NoReturn:
+    """Implementation of paging in older messages from the store. The rows
+    are added at the bottom and read from the store only when shown. The
+    armed fetch is used up."""
+    if not self.canFetchMore(parent):
+      return
+    self._fetchArmed = False
+    page = min(Settings.logSpillPage, self._floor)
+    rows = self.rowCount()
+    self.beginInsertRows(QModelIndex(), rows, rows + page - 1)
+    self._floor -= page
+    self.endInsertRows()
+
+  def clear(self) -> NoReturn:
+    """Removes all messages. Messages in the store may still be paged in
+    again."""
+    self.beginResetModel()
+    self._buffer = [None] * self._capacity
+    self._head = 0
+    self._count = 0
+    self._floor = self._total
+    self._pending = []
+    self.endResetModel()
+
+  def __len__(self) -> int:
+    """The number of messages held in memory"""
+    return self._count
+
+  def __iter__(self) -> Iterator[str]:
+    """Iterates from the oldest to the newest message held in memory"""
+    start = self._head - self._count
+    for i in range(start, self._head):
+      yield self._buffer[i % self._capacity]
@@ -5,18 +5,18 @@ debugging, call the 'tellMe' method on this widget."""
 from __future__ import annotations
 
 import os
+import time
 from typing import NoReturn
 
-from PySide6.QtCore import Signal, Slot
+from PySide6.QtCore import Signal, Slot, QTimer
 from PySide6.QtGui import QFont
-from PySide6.QtWidgets import QGridLayout, QFileDialog, QLabel
-from icecream import ic
+from PySide6.QtWidgets import QGridLayout, QFileDialog, QLabel, QLineEdit
 
-from workside.widgets import CoreWidget
+from workside.functional import frameInterval
+from workside.settings import Settings
+from workside.widgets import CoreWidget, LogBuffer
 from workside.widgets import ListWidget
-from workside.styles import Family
-
-ic.configureOutput(includeContext=True)
+from workside.styles import Family, FontCache, fontCache
 
 
 class LogWidget(CoreWidget):
@@ -30,6 +30,7 @@ class LogWidget(CoreWidget):
   doubleClickedLog = Signal(str)
 
   overWritingSaveFile = Signal(str)
+  savingLogsFailed = Signal(str)
   receivedLog = Signal(str)
 
   def __init__(self, *args, **kwargs) -> None:
@@ -38,27 +39,44 @@ class LogWidget(CoreWidget):
     self._fileName = None
     self._headerFont = None
     self._headerLabel = None
+    self._filterEdit = None
     self._saveFileDialog = None
+    self._logBuffer = LogBuffer()
+    self._flushTimer = None
+    self._batching = False
     CoreWidget.__init__(self, *args, **kwargs)
     self.setMouseTracking(True)
+    self.setBatching(Settings.logBatching)
     # self.setSizePolicy(QSizePolicy.Policy.MinimumExpanding,
     #                    QSizePolicy.Policy.MinimumExpanding, )
 
   def setupWidgets(self) -> NoReturn:
     """Sets up the widgets"""
     self._baseLayout = QGridLayout()
-    self._baseLayout.addWidget(self._getListWidget(), 1, 0)
     self._baseLayout.addWidget(self._getHeaderLabel(), 0, 0)
+    self._baseLayout.addWidget(self._getFilterEdit(), 1, 0)
+    self._baseLayout.addWidget(self._getListWidget(), 2, 0)
     self.setLayout(self._baseLayout)
 
   def setupActions(self) -> NoReturn:
     """Sets up the actions"""
-    self._getListWidget().itemEntered.connect(
+    self._getListWidget().hoveredText.connect(
       self.hoveredLog.emit)
-    self._getListWidget().itemClicked.connect(
+    self._getListWidget().clickedText.connect(
       self.clickedLog.emit)
-    self._getListWidget().itemDoubleClicked.connect(
+    self._getListWidget().doubleClickedText.connect(
       self.doubleClickedLog.emit)
+    self._getFilterEdit().textChanged.connect(
+      self._getListWidget().setFilter)
+    self._getListWidget().saveFailed.connect(self._handleSaveFailed)
+
+  def getCapacity(self) -> int:
+    """Getter-function for the maximum number of logs held"""
+    return self._getListWidget().getCapacity()
+
+  def setCapacity(self, capacity: int) -> NoReturn:
+    """Setter-function for the maximum number of logs held"""
+    self._getListWidget().setCapacity(capacity)
 
   @Slot()
   def initiateSaveLogs(self) -> NoReturn:
@@ -66,23 +84,31 @@ class LogWidget(CoreWidget):
     fileName = self._getFileName()
     if not isinstance(fileName, str):
       raise TypeError
-    if not os.path.exists(fileName):
-      self.overWritingSaveFile.emit()
-    dirName = os.path.basename(fileName)
+    if os.path.exists(fileName):
+      self.overWritingSaveFile.emit(fileName)
+    dirName = os.path.dirname(os.path.abspath(fileName))
     if not os.path.exists(dirName):
       raise NotADirectoryError
-    return self.saveLogs(fileName)
+    return self.saveLogs()
 
   @Slot()
   def saveLogs(self, ) -> NoReturn:
-    """Performs the saving operation on the fileName received."""
+    """Performs the saving operation on the fileName received. Pending
+    messages are flushed first such that they are included. The file is
+    written in the background."""
+    self.flush()
     self._getListWidget().saveContents(self._getFileName())
 
+  @Slot(str)
+  def _handleSaveFailed(self, msg: str) -> NoReturn:
+    """Tells the user that the logs could not be saved"""
+    self.tellMe(msg)
+    self.savingLogsFailed.emit(msg)
+
   def _createFont(self) -> NoReturn:
     """Creator-function for the header font"""
-    self._headerFont = QFont()
-    self._headerFont @ Family.modern
-    self._headerFont.setPointSize(24)
+    key = FontCache.createKey(Family.MODERN, QFont.Weight.Normal, 24)
+    self._headerFont = fontCache.getFont(key)
 
   def _getFont(self) -> QFont:
     """Getter-function for the font"""
@@ -108,6 +134,21 @@ class LogWidget(CoreWidget):
       return self._headerLabel
     raise TypeError
 
+  def _createFilterEdit(self) -> NoReturn:
+    """Creator-function for the filter line edit"""
+    self._filterEdit = QLineEdit()
+    self._filterEdit.setPlaceholderText('Filter')
+    self._filterEdit.setClearButtonEnabled(True)
+
+  def _getFilterEdit(self) -> QLineEdit:
+    """Getter-function for the filter line edit"""
+    if self._filterEdit is None:
+      self._createFilterEdit()
+      return self._getFilterEdit()
+    if isinstance(self._filterEdit, QLineEdit):
+      return self._filterEdit
+    raise TypeError
+
   def _createListWidget(self) -> NoReturn:
     """Creator-function for the list widget"""
     self._listWidget = ListWidget()
@@ -174,7 +215,67 @@ class LogWidget(CoreWidget):
       return self._fileName
     raise TypeError
 
+  def _createFlushTimer(self) -> NoReturn:
+    """Creator-function for the timer flushing the log buffer once per
+    frame"""
+    self._flushTimer = QTimer(self)
+    self._flushTimer.setInterval(frameInterval(self))
+    self._flushTimer.timeout.connect(self.flush)
+
+  def _getFlushTimer(self) -> QTimer:
+    """Getter-function for the flush timer"""
+    if self._flushTimer is None:
+      self._createFlushTimer()
+      return self._getFlushTimer()
+    if isinstance(self._flushTimer, QTimer):
+      return self._flushTimer
+    raise TypeError
+
+  def isBatching(self) -> bool:
+    """Getter-function for the batching mode"""
+    return self._batching
+
+  def setBatching(self, batching: bool) -> NoReturn:
+    """Setter-function for the batching mode. When batching, messages are
+    collected by the log buffer and flushed into the list once per frame.
+    This must be called from the GUI thread."""
+    self._batching = True if batching else False
+    if self._batching:
+      self._getFlushTimer().start()
+    else:
+      self._getFlushTimer().stop()
+      self.flush()
+
+  def getLogBuffer(self) -> LogBuffer:
+    """Getter-function for the log buffer"""
+    return self._logBuffer
+
+  def getFlushStats(self) -> dict[str, float]:
+    """Getter-function for the batch size and flush latency counters"""
+    return self._logBuffer.getStats()
+
+  @Slot()
+  def flush(self) -> NoReturn:
+    """Inserts every pending message in a single operation"""
+    if not self._logBuffer:
+      return
+    start = time.perf_counter()
+    msgs = self._logBuffer.drain()
+    self._getListWidget().insertTexts(msgs)
+    self._logBuffer.recordFlush(len(msgs), time.perf_counter() - start)
+
   def tellMe(self, msg: str) -> NoReturn:
-    """Logs the message received"""
+    """Logs the message received. When batching, this may be called from
+    any thread."""
+    if self._batching:
+      return self._logBuffer.put(msg)
     self._getListWidget().insertText(msg)
     self.update()
+
+  @Slot(list)
+  def tellMeAll(self, msgs: list[str]) -> NoReturn:
+    """Logs each message in the list received"""
+    if self._batching:
+      return self._logBuffer.putAll(msgs)
+    self._getListWidget().insertTexts(msgs)
+    self.update()
@@ -3,12 +3,8 @@
 #  MIT Licence
 from __future__ import annotations
 
-from icecream import ic
-
 from workside.widgets import CoreWidget
 
-ic.configureOutput(includeContext=True)
-
 
 class PushButton(CoreWidget):
   """PushButton implements push button functionality
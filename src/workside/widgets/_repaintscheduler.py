@@ -0,0 +1,196 @@
+"""RepaintScheduler coalesces the update requests of CoreWidgets into one
+update per top-level window per frame."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import time
+from array import array
+from typing import NoReturn
+
+from PySide6.QtCore import QObject, QTimer, Qt, Signal, Slot, QPoint, \
+  QEvent, QCoreApplication
+from PySide6.QtGui import QRegion
+from PySide6.QtWidgets import QWidget
+
+from workside.functional import frameInterval
+from workside.settings import Settings
+
+
+class RepaintScheduler(QObject):
+  """RepaintScheduler coalesces the update requests of CoreWidgets into
+  one update per top-level window per frame. Each request records the
+  dirty region of the widget, such that repeated requests within a frame
+  cost a dictionary lookup. At the next frame tick, paced by the refresh
+  rate of the screen, the regions are mapped to their windows and merged,
+  and each window is updated once. A merged region covering at least
+  Settings.repaintMergeRatio of its bounding rectangle is replaced by the
+  rectangle, as clipping to many small rectangles costs more than
+  painting the gaps between them.
+
+  The windows are painted by Qt when it delivers their next update
+  request, together with any updates made outside of the scheduler. The
+  scheduler watches for that event with an event filter installed until
+  then and times its handling, such that the paint time of a frame is
+  that of the paint events actually sent.
+
+  Qt already merges the updates of a window made within one pass of the
+  event loop, so the scheduler pays off when requests arrive spread over
+  many passes within a frame, as when lines arrive from a socket, which
+  would otherwise paint on every pass. When every request of a frame is
+  made in one pass, both paint the same and the scheduler adds the cost
+  of recording the requests.
+
+  Once every window of a frame is painted, 'frameFinished' is emitted with
+  the statistics of the frame, which are also available from
+  'getLastFrame':
+    widgets: the number of distinct visible widgets dirtied
+    windows: the number of windows updated
+    area: the area in pixels of the merged regions
+    paintTime: the time taken to paint in milliseconds
+  The paint times of the most recent Settings.repaintHistory frames are
+  kept in a ring buffer available from 'getPaintTimes'.
+  Use 'instance' to get the scheduler of the application.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  frameFinished = Signal(dict)
+
+  _instance = None
+
+  @classmethod
+  def instance(cls) -> RepaintScheduler:
+    """Returns the scheduler of the application, creating it if
+    required"""
+    if cls._instance is None:
+      cls._instance = cls()
+    return cls._instance
+
+  def __init__(self, *args, **kwargs) -> None:
+    QObject.__init__(self, *args, **kwargs)
+    self._dirty = {}
+    self._pending = False
+    self._frames = 0
+    self._lastFrame = None
+    self._frame = None
+    self._awaiting = set()
+    self._paintTimes = array('d', bytes(8 * Settings.repaintHistory))
+    self._timer = QTimer(self)
+    self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+    self._timer.setSingleShot(True)
+    self._timer.timeout.connect(self.flush)
+
+  def request(self, widget: QWidget, region: QRegion = None) -> NoReturn:
+    """Records the region of the widget as dirty. The region is given in
+    the coordinates of the widget, and the whole widget is dirty if no
+    region is given. A widget that is wholly dirty is marked as pending,
+    such that it may skip further requests until the next frame."""
+    if region is None:
+      widget._repaintPending = True
+    dirty = self._dirty
+    if widget in dirty:
+      existing = dirty[widget]
+      if existing is not None:
+        dirty[widget] = None if region is None else existing + region
+      return
+    dirty[widget] = region
+    if not self._pending:
+      self._pending = True
+      self._timer.start(frameInterval(widget))
+
+  def getFrameCount(self) -> int:
+    """Getter-function for the number of frames finished"""
+    return self._frames
+
+  def getPaintTimes(self, since: int = 0) -> list[float]:
+    """Getter-function for the paint times in milliseconds of the frames
+    painted after the given frame count, as far as they are kept"""
+    times, frames = self._paintTimes, self._frames
+    since = max(since, frames - len(times), 0)
+    return [times[i % len(times)] for i in range(since, frames)]
+
+  def getLastFrame(self) -> dict | None:
+    """Getter-function for the statistics of the last frame"""
+    return self._lastFrame
+
+  @Slot()
+  def flush(self, ) -> NoReturn:
+    """Updates the merged dirty region of every window. A frame whose
+    windows have not all painted yet is finished first."""
+    self._timer.stop()
+    self._pending = False
+    dirty, self._dirty = self._dirty, {}
+    if not dirty:
+      return
+    if self._frame is not None:
+      self._finishFrame()
+    regions, widgets = {}, 0
+    for (widget, region) in dirty.items():
+      try:
+        widget._repaintPending = False
+        if not widget.isVisible():
+          continue
+        window = widget.window()
+        if region is None:
+          region = QRegion(widget.rect())
+        if window is not widget:
+          region = region.translated(widget.mapTo(window, QPoint(0, 0)))
+      except RuntimeError:
+        continue
+      widgets += 1
+      merged = regions.get(window)
+      regions[window] = region if merged is None else merged + region
+    frame = dict(widgets=widgets, windows=0, area=0, paintTime=0.)
+    for (window, region) in regions.items():
+      dirtyArea = sum(rect.width() * rect.height() for rect in region)
+      bounds = region.boundingRect()
+      boundsArea = bounds.width() * bounds.height()
+      if dirtyArea >= boundsArea * Settings.repaintMergeRatio:
+        region, dirtyArea = QRegion(bounds), boundsArea
+      try:
+        window.update(region)
+        window.installEventFilter(self)
+      except RuntimeError:
+        continue
+      self._awaiting.add(window)
+      frame['windows'] += 1
+      frame['area'] += dirtyArea
+    self._frame = frame
+    if not self._awaiting:
+      self._finishFrame()
+
+  def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+    """Times the handling of the update request of a window updated in
+    the current frame, which sends the paint events of the window. The
+    frame is finished once every window has painted."""
+    if event.type() != QEvent.Type.UpdateRequest:
+      return False
+    if watched not in self._awaiting:
+      return False
+    self._awaiting.discard(watched)
+    watched.removeEventFilter(self)
+    start = time.perf_counter()
+    #  Sending the event again rather than calling 'event' passes it
+    #  through the other event filters of the window.
+    QCoreApplication.sendEvent(watched, event)
+    self._frame['paintTime'] += (time.perf_counter() - start) * 1000
+    if not self._awaiting:
+      self._finishFrame()
+    return True
+
+  def _finishFrame(self) -> NoReturn:
+    """Records the statistics of the current frame and emits them. Windows
+    that have not painted, for example as they were hidden, are no longer
+    watched."""
+    for window in self._awaiting:
+      try:
+        window.removeEventFilter(self)
+      except RuntimeError:
+        continue
+    self._awaiting = set()
+    frame, self._frame = self._frame, None
+    paintTime = frame['paintTime']
+    self._paintTimes[self._frames % len(self._paintTimes)] = paintTime
+    self._frames += 1
+    self._lastFrame = frame
+    self.frameFinished.emit(frame)
@@ -7,15 +7,12 @@ from typing import NoReturn
 
 from PySide6.QtGui import QPaintEvent, QPainter
 from PySide6.QtWidgets import QSizePolicy
-from icecream import ic
 from worktoy.stringtools import stringList
 
 from workside.settings import Settings
 from workside.styles import debugStyle
 from workside.widgets import CoreWidget
 
-ic.configureOutput(includeContext=True)
-
 
 class Spacer(CoreWidget):
   """Spacer is a subclass of CoreWidget which pushes other widgets around
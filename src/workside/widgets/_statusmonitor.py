@@ -0,0 +1,154 @@
+"""StatusMonitor samples the operational counters of the application at a
+low rate for display in the status bar."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import time
+from typing import NoReturn
+
+from PySide6.QtCore import QObject, QTimer, Qt, Signal, Slot, QEvent
+from PySide6.QtWidgets import QWidget
+
+from workside.functional import residentMemory
+from workside.settings import Settings
+from workside.widgets import RepaintScheduler, LogBuffer
+
+
+class StatusMonitor(QObject):
+  """StatusMonitor samples the operational counters of the application
+  every Settings.statusInterval milliseconds and emits the readings with
+  'sampled'. Every counter read has a single writer and the monitor only
+  reads it, such that neither side takes a lock:
+    fps: frames painted per second in the monitored windows
+    paintMean: mean paint time of the frames of the RepaintScheduler in
+      milliseconds
+    paintP99: 99th percentile of the paint times in milliseconds
+    ingestRate: log lines enqueued per second in the monitored buffers
+    queueDepth: log lines waiting in the buffers for the GUI thread
+    rss: resident memory of the process in bytes
+  Rates are computed from the difference between consecutive samples.
+  The frames of a window are counted by an event filter on the window
+  from the update requests that paint it, such that every paint counts
+  whether requested through the RepaintScheduler or not. The monitor
+  lives in the GUI thread.
+  #  MIT Licence
+  #  Copyright (c) 2023 Asger Jon Vistisen"""
+
+  sampled = Signal(dict)
+  sampledText = Signal(str)
+
+  def __init__(self, *args, **kwargs) -> None:
+    QObject.__init__(self, *args, **kwargs)
+    self._logBuffers = []
+    self._windows = []
+    self._paintCount = 0
+    self._lastPaints = 0
+    self._lastTime = None
+    self._lastFrames = 0
+    self._lastPuts = 0
+    self._lastSample = None
+    self._timer = QTimer(self)
+    self._timer.setTimerType(Qt.TimerType.CoarseTimer)
+    self._timer.setInterval(Settings.statusInterval)
+    self._timer.timeout.connect(self._tick)
+
+  def addLogBuffer(self, logBuffer: LogBuffer) -> NoReturn:
+    """Includes the log buffer in the ingestion counters"""
+    if not isinstance(logBuffer, LogBuffer):
+      msg = """Expected log buffer to be of type %s, but received %s!"""
+      raise TypeError(msg % (LogBuffer, type(logBuffer)))
+    if logBuffer not in self._logBuffers:
+      self._logBuffers.append(logBuffer)
+      self._lastPuts += logBuffer.getPutCount()
+
+  def removeLogBuffer(self, logBuffer: LogBuffer) -> NoReturn:
+    """Removes the log buffer from the ingestion counters"""
+    if logBuffer in self._logBuffers:
+      self._logBuffers.remove(logBuffer)
+      self._lastPuts -= logBuffer.getPutCount()
+
+  def addWindow(self, window: QWidget) -> NoReturn:
+    """Includes the top-level window in the frame counter"""
+    if not isinstance(window, QWidget):
+      msg = """Expected window to be of type %s, but received %s!"""
+      raise TypeError(msg % (QWidget, type(window)))
+    if window not in self._windows:
+      self._windows.append(window)
+      window.installEventFilter(self)
+
+  def removeWindow(self, window: QWidget) -> NoReturn:
+    """Removes the window from the frame counter"""
+    if window in self._windows:
+      self._windows.remove(window)
+      window.removeEventFilter(self)
+
+  def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+    """Counts the update requests painting the monitored windows"""
+    if event.type() == QEvent.Type.UpdateRequest:
+      self._paintCount += 1
+    return False
+
+  def start(self) -> NoReturn:
+    """Starts sampling"""
+    self._lastTime = None
+    self.sample()
+    self._timer.start()
+
+  def stop(self) -> NoReturn:
+    """Stops sampling"""
+    self._timer.stop()
+
+  def isActive(self) -> bool:
+    """Flag indicating whether the monitor is sampling"""
+    return self._timer.isActive()
+
+  def getLastSample(self) -> dict | None:
+    """Getter-function for the most recent readings"""
+    return self._lastSample
+
+  def sample(self) -> dict:
+    """Reads the counters and returns the readings. The rates are zero on
+    the first sample."""
+    now = time.monotonic()
+    scheduler = RepaintScheduler.instance()
+    frames = scheduler.getFrameCount()
+    paints = self._paintCount
+    paintTimes = sorted(scheduler.getPaintTimes(self._lastFrames))
+    puts = sum(buffer.getPutCount() for buffer in self._logBuffers)
+    elapsed = None if self._lastTime is None else now - self._lastTime
+    if elapsed:
+      fps = (paints - self._lastPaints) / elapsed
+      ingestRate = max(puts - self._lastPuts, 0) / elapsed
+    else:
+      fps, ingestRate = 0., 0.
+    if paintTimes:
+      paintMean = sum(paintTimes) / len(paintTimes)
+      paintP99 = paintTimes[min(int(len(paintTimes) * 0.99),
+                                len(paintTimes) - 1)]
+    else:
+      paintMean, paintP99 = 0., 0.
+    self._lastTime, self._lastFrames, self._lastPuts = now, frames, puts
+    self._lastPaints = paints
+    self._lastSample = dict(
+      fps=fps, paintMean=paintMean, paintP99=paintP99,
+      ingestRate=ingestRate,
+      queueDepth=sum(len(buffer) for buffer in self._logBuffers),
+      rss=residentMemory())
+    return self._lastSample
+
+  @staticmethod
+  def formatSample(sample: dict) -> str:
+    """Returns the readings as a line of text for the status bar"""
+    return ('%.0f fps  paint %.2f ms (p99 %.2f ms)  %.0f lines/s  '
+            'queue %d  rss %.1f MB' % (
+              sample['fps'], sample['paintMean'], sample['paintP99'],
+              sample['ingestRate'], sample['queueDepth'],
+              sample['rss'] / (1 << 20)))
+
+  @Slot()
+  def _tick(self) -> NoReturn:
+    """Samples the counters and emits the readings"""
+    sample = self.sample()
+    self.sampled.emit(sample)
+    self.sampledText.emit(self.formatSample(sample))
@@ -1,113 +1,109 @@
-"""AbstractStyleStates is a class providing decorators for the getter
-functions
-used by subclasses of BaseStyle. These decorators are instances of
-StyleStates subclasses."""
+"""AbstractStyleStates is a descriptor resolving the BaseStyle used by a
+widget from the flags of the widget. The style of every combination of
+flags is resolved ahead of time, such that the style of the current state
+is found by a single lookup."""
 #  MIT Licence
 #  Copyright (c) 2023 Asger Jon Vistisen
 from __future__ import annotations
 
-from abc import abstractmethod
-from typing import Any
+from typing import NoReturn
 
-from icecream import ic
-from worktoy.stringtools import monoSpace
-from worktoy.typetools import CallMeMaybe
 from worktoy.waitaminute import UnexpectedStateError
 
+from workside.styles import BaseStyle
 from workside.widgets import CoreWidget
 
-ic.configureOutput(includeContext=True)
-
 
 class AbstractStyleStates:
-  """AbstractStyleStates is a class providing decorators for the getter
-  functions
-  used by subclasses of BaseStyle. These decorators are instances of
-  StyleStates subclasses.
-
-  Each subclass should match one subclass of CoreWidgets. Each such
-  subclass should be able to recognize the current states of the given
-  widget class. Thus, the state analyzer must be a class method.
+  """AbstractStyleStates is a descriptor resolving the BaseStyle used by a
+  widget from the flags of the widget. The flag decorator allocates each
+  flag a bit in the integer '_flags' of the instance. When the owning
+  class is created, the descriptor builds a table of 2^n styles, one for
+  each combination of the n flags of the class, and accessing the
+  descriptor on an instance returns the entry at its '_flags'.
+
+  The style of a combination is the default style, unless one or more
+  states match the combination, in which case the last matching state
+  added wins. A state matches when every one of its flags is set.
+
+    class Button(AbstractButton):
+      buttonStyle = AbstractButtonStyle(baseButtonStyle)
+      buttonStyle.addState(hoverButtonStyle, 'hover')
+
+  Each subclass should match one subclass of CoreWidget. Tables are kept
+  for each owning class, such that subclasses adding further flags
+  resolve correctly.
   #  Copyright (c) 2023 Asger Jon Vistisen
   #  MIT Licence"""
 
-  _primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47]
-
-  @classmethod
-  def getPrimes(cls) -> list[int]:
-    """Getter function for the list of primes"""
-    return cls._primes
-
-  @staticmethod
-  def stateKey(*flags) -> int:
-    """Returns the prime key representation of the given flags"""
-    key = 1
-    for (p, f) in zip(AbstractStyleStates._primes, flags):
-      key *= p if f else 1
-    return key
-
-  @staticmethod
-  def getInstanceFlags(self: object, ) -> list[int]:
-    """Here 'self' is the instance of the button."""
-
-    if not isinstance(self, CoreWidget):
-      msg = """Expected instance to be an instance of CoreWidget or one of 
-      its subclasses, but received: %s!""" % type(self)
-      raise TypeError(monoSpace(msg))
-
-    cls = getattr(self, '__class__', None)
-    if cls is None:
-      raise KeyError('Unable to find \'__class__\' on %s!' % self)
-
-    flagGetters = getattr(cls, 'flagGetters', None)
-    if flagGetters is None:
-      return []
-
-    return [f(self) for f in flagGetters]
-
   @staticmethod
-  def namedFlagsKey(cls: type, *names) -> int:
-    """Creates the number of """
-    flagGetters = getattr(cls, 'flagGetters', None)
-    flagNames = getattr(cls, 'flagNames', None)
-    nameList = [name for name in names]
-    key = 1
-    primes = AbstractStyleStates.getPrimes()
-    for (name, p) in zip(flagNames, primes):
-      if name in nameList:
-        key *= p
-    return key
-
-  def __init__(self, *args, **kwargs) -> None:
-    self._func = None
-    self._wrappers = {}
-
-  def __call__(self, *args, **kwargs) -> Any:
-    """Receives and absorbs the function and replaces it with itself."""
-    if self._func is None:
-      if isinstance(args[0], CallMeMaybe):
-        return self._setFunction(args[0])
-      raise TypeError
-    return self._stateWrapper(*args, **kwargs)
-
-  def _setFunction(self, func: CallMeMaybe) -> AbstractStyleStates:
-    """Setter-function for the underlying function"""
-    if self._func is not None:
-      raise UnexpectedStateError()
-    self._func = func
+  def getMask(cls: type, *names) -> int:
+    """Returns the bitmask of the named flags of the class"""
+    flagMasks = getattr(cls, 'flagMasks', {})
+    mask = 0
+    for name in names:
+      if name not in flagMasks:
+        raise KeyError('Flag %s not recognized on %s!' % (name, cls))
+      mask |= flagMasks[name]
+    return mask
+
+  def __init__(self, default: BaseStyle, **kwargs) -> None:
+    if not isinstance(default, BaseStyle):
+      msg = """Expected default to be of type %s, but received %s!"""
+      raise TypeError(msg % (BaseStyle, type(default)))
+    self._default = default
+    self._states = []
+    self._tables = {}
+    for (name, style) in kwargs.items():
+      self.addState(style, name)
+
+  def __set_name__(self, owner: type, name: str) -> NoReturn:
+    """Builds the table of the owning class if it already has flags"""
+    if getattr(owner, 'flagNames', None):
+      self._createTable(owner)
+
+  def addState(self, style: BaseStyle, *names) -> AbstractStyleStates:
+    """Adds the style used when every named flag is set. States added
+    later take precedence."""
+    if not isinstance(style, BaseStyle):
+      msg = """Expected style to be of type %s, but received %s!"""
+      raise TypeError(msg % (BaseStyle, type(style)))
+    if not names:
+      raise UnexpectedStateError('A state requires at least one flag!')
+    self._states.append((names, style))
+    self._tables.clear()
     return self
 
-  def _wrapper(self, instance: object, *args, **kwargs) -> Any:
-    """Wrapper function"""
-    if self._func is None:
-      raise UnexpectedStateError()
-    key = AbstractStyleStates.getInstanceFlags(instance)
-    wrapper = self._wrappers.get(key, self._func)
-    return wrapper(instance, *args, **kwargs)
-
-  @abstractmethod
-  def _stateWrapper(self, instance: object, *args, **kwargs) -> Any:
-    """This is the state sensitive wrapper. """
+  def _createTable(self, cls: type) -> list[BaseStyle]:
+    """Creator-function for the table of the class"""
+    flagNames = getattr(cls, 'flagNames', [])
+    states = [(self.getMask(cls, *names), style)
+              for (names, style) in self._states]
+    table = []
+    for flags in range(1 << len(flagNames)):
+      resolved = self._default
+      for (mask, style) in states:
+        if flags & mask == mask:
+          resolved = style
+      table.append(resolved)
+    self._tables[cls] = table
+    return table
+
+  def resolve(self, instance: CoreWidget) -> BaseStyle:
+    """Returns the style of the current state of the instance"""
+    table = self._tables.get(instance.__class__)
+    if table is None:
+      table = self._createTable(instance.__class__)
+    return table[getattr(instance, '_flags', 0)]
+
+  def __get__(self, instance: CoreWidget, owner: type) -> object:
+    """Returns the style of the current state of the instance"""
+    if instance is None:
+      return self
+    table = self._tables.get(owner)
+    if table is None:
+      table = self._createTable(owner)
+    return table[instance._flags]
 
 
 class AbstractButtonStyle(AbstractStyleStates):
@@ -3,9 +3,17 @@
 #  MIT Licence
 from __future__ import annotations
 
-from icecream import ic
+from typing import TYPE_CHECKING
 
-ic.configureOutput(includeContext=True)
-from ._basewindow import BaseWindow
-from ._layoutwindow import LayoutWindow
-from ._mainwindow import MainWindow
+from moreworktoy import lazyExports
+
+if TYPE_CHECKING:
+  from ._basewindow import BaseWindow
+  from ._layoutwindow import LayoutWindow
+  from ._mainwindow import MainWindow
+
+__getattr__, __dir__ = lazyExports(__name__, {
+  'BaseWindow': '._basewindow',
+  'LayoutWindow': '._layoutwindow',
+  'MainWindow': '._mainwindow',
+})
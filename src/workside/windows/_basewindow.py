@@ -4,9 +4,19 @@
 
 from __future__ import annotations
 
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QAction, QKeyEvent, QKeySequence
-from PySide6.QtWidgets import QMainWindow, QLabel, QSizePolicy, QWidget
+import html
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import Qt, Signal, Slot
+from PySide6.QtGui import QAction, QKeyEvent, QKeySequence, QCloseEvent
+from PySide6.QtWidgets import QMainWindow, QLabel, QSizePolicy, QWidget, \
+  QMessageBox
+
+from workside.settings import Settings
+from workside.widgets import Instrumentation, StatusMonitor
+
+if TYPE_CHECKING:
+  from workside.profiling import ProfileToolkit
 
 
 class BaseWindow(QMainWindow):
@@ -23,13 +33,17 @@ class BaseWindow(QMainWindow):
 
   def __init__(self, parent: QWidget = None) -> None:
     QMainWindow.__init__(self, parent)
+    self._instrumentationDialog = None
+    self._statusMonitor = None
+    self._profileToolkit = None
+    self._profileDialog = None
     self.setMouseTracking(True)
-    statusBar = QLabel()
+    self._statusLabel = QLabel()
     policy = QSizePolicy()
     policy.setVerticalPolicy(QSizePolicy.Policy.Maximum)
     policy.setHorizontalPolicy(QSizePolicy.Policy.Expanding)
-    statusBar.setSizePolicy(policy)
-    self.statusBar().addWidget(statusBar)
+    self._statusLabel.setSizePolicy(policy)
+    self.statusBar().addWidget(self._statusLabel)
 
     # Create menus
     fileMenu = self.menuBar().addMenu("&File")
@@ -96,9 +110,30 @@ class BaseWindow(QMainWindow):
     helpMenu.addAction(self.debugAction12)
 
   def show(self) -> None:
-    """Sets up debuggers"""
+    """Sets up debuggers and starts the status monitor"""
     self.setupDebuggers()
     QMainWindow.show(self)
+    if Settings.statusMonitor and not self.getStatusMonitor().isActive():
+      self.getStatusMonitor().start()
+
+  def _createStatusMonitor(self) -> None:
+    """Creator-function for the monitor showing the operational counters
+    in the status bar"""
+    self._statusMonitor = StatusMonitor(self)
+    self._statusMonitor.addWindow(self)
+    self._statusMonitor.sampledText.connect(self._statusLabel.setText)
+
+  def getStatusMonitor(self) -> StatusMonitor:
+    """Getter-function for the monitor showing the operational counters
+    in the status bar. Windows ingesting logs should add their log
+    buffers to the monitor."""
+    if self._statusMonitor is None:
+      self._createStatusMonitor()
+      return self.getStatusMonitor()
+    if isinstance(self._statusMonitor, StatusMonitor):
+      return self._statusMonitor
+    msg = """Expected monitor to be of type %s, but received %s!"""
+    raise TypeError(msg % (StatusMonitor, type(self._statusMonitor)))
 
   def setupDebuggers(self) -> None:
     """Setting up the actions"""
@@ -177,19 +212,122 @@ class BaseWindow(QMainWindow):
     """Debugger 02"""
 
   def debugFunc03(self) -> None:
-    """Debugger 03"""
+    """Shows the widgets spending the most time handling events. The
+    first use enables the instrumentation of the widgets."""
+    instrumentation = Instrumentation.instance()
+    if not instrumentation.isEnabled():
+      instrumentation.enable()
+      text = 'Instrumentation enabled. Press F3 again for the report.'
+    else:
+      report = instrumentation.formatReport(
+        Settings.instrumentationReportRows)
+      text = '<pre>%s</pre>' % report
+    dialog = self._getInstrumentationDialog()
+    dialog.setText(text)
+    dialog.show()
+    dialog.raise_()
+
+  def _createInstrumentationDialog(self) -> None:
+    """Creator-function for the dialog showing the instrumentation
+    report"""
+    self._instrumentationDialog = QMessageBox(self)
+    self._instrumentationDialog.setWindowTitle('Event timing')
+    self._instrumentationDialog.setModal(False)
+    self._instrumentationDialog.setTextFormat(Qt.TextFormat.AutoText)
+    resetButton = self._instrumentationDialog.addButton(
+      'Reset', QMessageBox.ButtonRole.ResetRole)
+    resetButton.clicked.connect(Instrumentation.instance().reset)
+    disableButton = self._instrumentationDialog.addButton(
+      'Disable', QMessageBox.ButtonRole.DestructiveRole)
+    disableButton.clicked.connect(Instrumentation.instance().disable)
+    self._instrumentationDialog.addButton(QMessageBox.StandardButton.Close)
+
+  def _getInstrumentationDialog(self) -> QMessageBox:
+    """Getter-function for the dialog showing the instrumentation
+    report"""
+    if self._instrumentationDialog is None:
+      self._createInstrumentationDialog()
+      return self._getInstrumentationDialog()
+    if isinstance(self._instrumentationDialog, QMessageBox):
+      return self._instrumentationDialog
+    msg = """Expected dialog to be of type %s, but received %s!"""
+    raise TypeError(msg % (QMessageBox, type(self._instrumentationDialog)))
 
   def debugFunc04(self) -> None:
-    """Debugger 04"""
+    """Starts or stops cProfile on the GUI thread"""
+    self.getProfileToolkit().toggleProfiler()
 
   def debugFunc05(self) -> None:
-    """Debugger 05"""
+    """Starts tracemalloc or compares a new snapshot to the previous"""
+    self.getProfileToolkit().snapshotAllocations()
 
   def debugFunc06(self) -> None:
-    """Debugger 06"""
+    """Toggles the switch interval and the garbage collection timing"""
+    self.getProfileToolkit().toggleRuntimeStats()
 
   def debugFunc07(self) -> None:
-    """Debugger 07"""
+    """Stops tracemalloc"""
+    if self.getProfileToolkit().isTracing():
+      self.getProfileToolkit().stopTracing()
+
+  def _createProfileToolkit(self) -> None:
+    """Creator-function for the profiling tools of the debug actions. The
+    tools are imported on first use to keep them out of the startup."""
+    from workside.profiling import ProfileToolkit
+    self._profileToolkit = ProfileToolkit(None, self)
+    self._profileToolkit.reportReady.connect(self._showProfileReport)
+    self._profileToolkit.message.connect(self._showStatusMessage)
+
+  def getProfileToolkit(self) -> ProfileToolkit:
+    """Getter-function for the profiling tools of the debug actions. The
+    output directory may be changed with its 'setDirectory'."""
+    if self._profileToolkit is None:
+      self._createProfileToolkit()
+      return self.getProfileToolkit()
+    from workside.profiling import ProfileToolkit
+    if isinstance(self._profileToolkit, ProfileToolkit):
+      return self._profileToolkit
+    msg = """Expected toolkit to be of type %s, but received %s!"""
+    raise TypeError(msg % (ProfileToolkit, type(self._profileToolkit)))
+
+  def _createProfileDialog(self) -> None:
+    """Creator-function for the dialog showing the profiling reports"""
+    self._profileDialog = QMessageBox(self)
+    self._profileDialog.setModal(False)
+    self._profileDialog.addButton(QMessageBox.StandardButton.Close)
+
+  def _getProfileDialog(self) -> QMessageBox:
+    """Getter-function for the dialog showing the profiling reports"""
+    if self._profileDialog is None:
+      self._createProfileDialog()
+      return self._getProfileDialog()
+    if isinstance(self._profileDialog, QMessageBox):
+      return self._profileDialog
+    msg = """Expected dialog to be of type %s, but received %s!"""
+    raise TypeError(msg % (QMessageBox, type(self._profileDialog)))
+
+  @Slot(str, str)
+  def _showProfileReport(self, title: str, text: str) -> None:
+    """Shows the report received from the profiling tools"""
+    dialog = self._getProfileDialog()
+    dialog.setWindowTitle(title)
+    dialog.setText('<pre>%s</pre>' % html.escape(text))
+    dialog.show()
+    dialog.raise_()
+
+  @Slot(str)
+  def _showStatusMessage(self, message: str) -> None:
+    """Shows the message in the status bar for a few seconds"""
+    self.statusBar().showMessage(message, 3000)
+
+  def closeEvent(self, event: QCloseEvent) -> None:
+    """Stops the profiling tools before closing. The worker thread is
+    daemonic, so the files still queued would be lost if the application
+    exited now, and closing waits up to Settings.profileShutdownTimeout
+    seconds for them to be written."""
+    if self._profileToolkit is not None:
+      self._profileToolkit.shutdown(True, Settings.profileShutdownTimeout)
+    QMainWindow.closeEvent(self, event)
 
   def debugFunc08(self) -> None:
     """Debugger 08"""
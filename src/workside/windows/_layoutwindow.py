@@ -8,7 +8,6 @@ from __future__ import annotations
 from PySide6.QtGui import QKeyEvent, QTextCursor, QPaintEvent
 from PySide6.QtWidgets import QGridLayout
 from PySide6.QtWidgets import QWidget
-from icecream import ic
 
 from workside.styles import headerStyle, labelStyle
 from workside.widgets import CoreWidget, LayoutBackground, GridLayout
@@ -20,8 +19,6 @@ wordEnd = QTextCursor.MoveOperation.EndOfWord
 move = QTextCursor.MoveMode.MoveAnchor
 mark = QTextCursor.MoveMode.KeepAnchor
 
-ic.configureOutput(includeContext=True)
-
 
 class LayoutWindow(BaseWindow):
   """LayoutWindow subclasses BaseWindow providing the visual widgets in the
@@ -3,12 +3,8 @@
 #  Copyright (c) 2023 Asger Jon Vistisen
 from __future__ import annotations
 
-from icecream import ic
-
 from workside.windows import LayoutWindow
 
-ic.configureOutput(includeContext=True)
-
 
 class MainWindow(LayoutWindow):
   """MainWindow
@@ -27,8 +23,6 @@ class MainWindow(LayoutWindow):
     LayoutWindow.show(self)
     for widget in self._getBaseLayout():
       widget.update()
-      print(widget)
-    self._getBaseLayout().parentWidget().repaint()
 
   def setupActions(self) -> None:
     """Sets up the actions"""
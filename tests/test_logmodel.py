@@ -0,0 +1,44 @@
+"""Tests of the LogModel paging in messages from a SegmentStore."""
+#  Copyright (c) 2023 Asger Jon Vistisen
+#  MIT Licence
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip('PySide6')
+pytest.importorskip('worktoy')
+
+from workside.logstore import SegmentStore
+from workside.widgets import LogModel
+
+
+@pytest.fixture
+def store(tmp_path) -> SegmentStore:
+  """A store holding 100 messages"""
+  store = SegmentStore('test', str(tmp_path))
+  store.extend(['old %d' % i for i in range(100)])
+  yield store
+  store.close()
+
+
+def _messages(model: LogModel) -> list[str]:
+  """Returns the messages of every row from the oldest to the newest"""
+  return [model.getMessage(row) for row in range(model.rowCount())][::-1]
+
+
+@pytest.mark.parametrize('batch', [1, 3, 10])
+def testPagedRowsSurviveLaggingStore(store: SegmentStore,
+                                     batch: int) -> None:
+  """Rows dropped from the ring while paged are shown before the store
+  holds them"""
+  model = LogModel(4, store=store)
+  model.armFetch()
+  model.fetchMore()
+  assert model.getOldest() < 100
+  new = ['new %d' % i for i in range(9)]
+  for i in range(0, len(new), batch):
+    model.extend(new[i:i + batch])
+  assert _messages(model)[-len(new):] == new
+  store.extend(new[:5])
+  model.extend(['last'])
+  assert _messages(model)[-len(new) - 1:] == new + ['last']
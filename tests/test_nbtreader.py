@@ -0,0 +1,42 @@
+"""Tests of the lazy NBT reader on malformed data and path queries."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import struct
+
+import pytest
+
+from minelive.nbt import NbtError, readNbt
+
+
+def _encodeNamedString(name: bytes, value: bytes) -> bytes:
+  """Returns a root compound holding one string tag of the raw bytes"""
+  return b''.join([
+    b'\x0a\x00\x00',
+    b'\x08', struct.pack('>H', len(name)), name,
+    struct.pack('>H', len(value)), value,
+    b'\x00',
+  ])
+
+
+def testInvalidStringRaisesNbtError() -> None:
+  """Bytes that are not modified UTF-8 raise NbtError"""
+  root = readNbt(_encodeNamedString(b'Name', b'\xff\xfe'))
+  with pytest.raises(NbtError):
+    root['Name']
+
+
+def testModifiedUtf8Null() -> None:
+  """The two byte null of modified UTF-8 is decoded"""
+  root = readNbt(_encodeNamedString(b'Name', b'a\xc0\x80b'))
+  assert root['Name'] == 'a\0b'
+
+
+def testQueryDoesNotIndexStrings() -> None:
+  """Indexing a string tag is a missing path"""
+  root = readNbt(_encodeNamedString(b'Name', b'hello'))
+  assert root.query('Name') == 'hello'
+  assert root.query('Name[0]', None) is None
+  with pytest.raises(KeyError):
+    root.query('Name[0]')
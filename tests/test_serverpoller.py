@@ -0,0 +1,70 @@
+"""Tests of the ServerPoller against local FakeMinecraftServer instances."""
+#  MIT Licence
+#  Copyright (c) 2023 Asger Jon Vistisen
+from __future__ import annotations
+
+import asyncio
+
+from minelive.query import FakeMinecraftServer, ServerPoller, flattenText
+from minelive.query import _serverpoller
+
+
+def testFlattenTextIgnoresMalformedExtra() -> None:
+  """Extra components other than a list are ignored"""
+  assert flattenText({'text': 'x', 'extra': 5}) == 'x'
+  assert flattenText({'text': 'x', 'extra': ['y', {'text': 'z'}]}) == 'xyz'
+
+
+async def _pollNextToHealthy(status: dict) -> ServerPoller:
+  """Polls a server answering the status next to a healthy one until both
+  have answered twice and returns the poller"""
+  healthy = FakeMinecraftServer('Healthy', players=['alice'])
+  malformed = FakeMinecraftServer()
+  malformed.setStatus(status)
+  poller = ServerPoller()
+  poller.addServer('healthy', '127.0.0.1', await healthy.start(),
+                   minInterval=10, maxInterval=10)
+  poller.addServer('malformed', '127.0.0.1', await malformed.start(),
+                   minInterval=10, maxInterval=10)
+  task = asyncio.create_task(poller.run())
+  try:
+    async with asyncio.timeout(5.):
+      while min(healthy.getStatusCount(), malformed.getStatusCount()) < 2:
+        await asyncio.sleep(.01)
+  finally:
+    poller.stop()
+    await task
+    await healthy.stop()
+    await malformed.stop()
+  return poller
+
+
+def testMalformedStatusDoesNotStopPoller() -> None:
+  """A server answering a malformed status does not stop the others"""
+  status = {'description': {'text': 'x', 'extra': 5}, 'version': 5,
+            'players': {'online': [], 'sample': [5, {'name': 1}]}}
+  poller = asyncio.run(_pollNextToHealthy(status))
+  snapshots = poller.getTable().getSnapshots()
+  assert snapshots['healthy'].online
+  assert snapshots['healthy'].players == ('alice',)
+  assert snapshots['malformed'].online
+  assert snapshots['malformed'].motd == 'x'
+
+
+def testDecodingErrorFailsOnlyThatServer(monkeypatch) -> None:
+  """An error decoding a reply backs off that server alone"""
+  original = _serverpoller.flattenText
+
+  def flattenText(component: object) -> str:
+    """Fails to decode the description of the malformed server"""
+    if component == 'bad':
+      raise TypeError('bad reply')
+    return original(component)
+
+  monkeypatch.setattr(_serverpoller, 'flattenText', flattenText)
+  poller = asyncio.run(_pollNextToHealthy({'description': 'bad'}))
+  snapshots = poller.getTable().getSnapshots()
+  assert snapshots['healthy'].online
+  assert not snapshots['malformed'].online
+  assert snapshots['malformed'].error == 'bad reply'
+  assert poller.getFailCount() >= 1